@@ -0,0 +1,206 @@
+"""
+Asyncio Weather Fetching
+========================
+Non-blocking counterparts of fetch_temperature / fetch_temperatures.
+Requests run on worker threads through the shared pooled session while a
+semaphore bounds how many are in flight and the shared Open-Meteo rate
+limiter (src/data/rate_limit.py) paces them; retries back off with
+asyncio.sleep so other coroutines keep running meanwhile.
+
+Every blocking call (HTTP requests, cache lookups, result writes) runs on
+a dedicated thread pool (see get_executor) rather than the event loop's
+default executor, whose min(32, cpu + 4) threads would otherwise cap the
+real concurrency below the semaphore's.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.data.data_manager import is_valid_coordinate, get_cached_entry, record_visit, save_result
+from src.data.http_client import get_session
+from src.data.rate_limit import OPEN_METEO, await_slot
+from src.data.resilience import CircuitOpenError, acall_guarded
+from src.data.weather_api import (
+    IN_FLIGHT,
+    MAX_LOCATIONS_PER_REQUEST,
+    REQUEST_TIMEOUT,
+    in_flight_key,
+    forecast_url,
+    get_coalescer,
+    _backoff,
+    _parse_current_temperature,
+    _partition_cached,
+    _batch_params,
+    _fill_batch,
+    _save_batch,
+)
+
+DEFAULT_CONCURRENCY = 16    # Maximum requests in flight per semaphore
+IO_WORKERS = 4              # Extra pool threads for cache and storage calls
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor(concurrency=DEFAULT_CONCURRENCY):
+    """
+    Returns the thread pool that runs blocking calls for the async engine,
+    replacing it with a larger one if it has fewer than
+    concurrency + IO_WORKERS threads. Calls already queued on a replaced
+    pool still run.
+    """
+    global _EXECUTOR
+    workers = concurrency + IO_WORKERS
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None or _EXECUTOR._max_workers < workers:
+            if _EXECUTOR is not None:
+                _EXECUTOR.shutdown(wait=False)
+            _EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="afetch")
+        return _EXECUTOR
+
+
+async def _run_blocking(func, *args, **kwargs):
+    """Runs func(*args, **kwargs) on the engine's thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(0), functools.partial(func, *args, **kwargs))
+
+
+async def _aget_forecast(params, semaphore, retries=3, backoff_factor=1, timeout=REQUEST_TIMEOUT, base_url=None):
+    """
+    Async GET against the Open-Meteo forecast endpoint with a per-attempt
+    timeout and non-blocking exponential backoff. Returns the decoded
+    JSON, or None on failure.
+    """
+    session = get_session()
+    url = forecast_url(base_url)
+
+    async def attempt_once():
+        async with semaphore:
+            response = await asyncio.wait_for(
+                _run_blocking(session.get, url, params=params, timeout=timeout),
+                timeout=timeout,
+            )
+        response.raise_for_status()
+        return response
+
+    for attempt in range(retries):
+        try:
+            # Wait for a rate-limit slot before taking a concurrency slot
+            await await_slot(OPEN_METEO)
+            response = await acall_guarded(OPEN_METEO, attempt_once)
+            return response.json()
+
+        except CircuitOpenError as e:
+            print(f"Error fetching weather data: {e}")
+            return None
+        except (requests.exceptions.RequestException, asyncio.TimeoutError) as e:
+            if attempt < retries - 1:
+                sleep_time = _backoff(e, attempt, backoff_factor)
+                print(f"Attempt {attempt + 1} failed: {e!r}. Retrying in {sleep_time}s...")
+                await asyncio.sleep(sleep_time)
+            else:
+                print(f"Error fetching weather data after {retries} attempts: {e!r}")
+                return None
+    return None
+
+
+async def afetch_temperature(lat, lng, search_method="unknown", use_cache=True, retries=3, backoff_factor=1,
+                             timeout=REQUEST_TIMEOUT, semaphore=None, cache_radius_km=None, base_url=None):
+    """
+    Async version of fetch_temperature. Concurrent misses for the same
+    cell (from coroutines or threads) share one request, and with a
+    RequestCoalescer installed misses are batched with other callers'.
+
+    Parameters
+    ----------
+    semaphore : asyncio.Semaphore or None
+        Shared limiter for requests in flight. Pass the same semaphore to
+        many concurrent calls to bound total concurrency; for more than
+        DEFAULT_CONCURRENCY, also call get_executor(n) once so the thread
+        pool can run that many requests.
+    """
+    if not is_valid_coordinate(lat, lng):
+        print(f"Error: Invalid coordinates ({lat}, {lng}). Must be -90 <= lat <= 90 and -180 <= lng <= 180.")
+        return None
+
+    if use_cache:
+        cached = await _run_blocking(get_cached_entry, lat, lng, radius_km=cache_radius_km)
+        if cached is not None:
+            print(f"Cache hit for ({lat}, {lng}): {cached.temp}°C")
+            await _run_blocking(record_visit, lat, lng, cached.temp, search_method, cached.measurement_id,
+                                cached.source)
+            return cached.temp
+
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(DEFAULT_CONCURRENCY)
+        get_executor(DEFAULT_CONCURRENCY)
+
+    async def fetch_and_save():
+        coalescer = get_coalescer()
+        if coalescer is not None:
+            temp = await asyncio.wrap_future(coalescer.submit(lat, lng, base_url))
+        else:
+            params = {
+                "latitude": lat,
+                "longitude": lng,
+                "current": "temperature_2m",
+            }
+            data = await _aget_forecast(params, semaphore, retries=retries, backoff_factor=backoff_factor,
+                                        timeout=timeout, base_url=base_url)
+            temp = _parse_current_temperature(data)
+        if temp is None:
+            return None, None
+
+        measurement_id = await _run_blocking(save_result, lat, lng, temp, search_method)
+        print(f"Fetched and cached ({lat}, {lng}): {temp}°C")
+        return temp, measurement_id
+
+    if not use_cache:
+        return (await fetch_and_save())[0]
+    # Shares the in-flight table with fetch_temperature, across threads and loops
+    (temp, measurement_id), leader = await IN_FLIGHT.ado(in_flight_key(lat, lng), fetch_and_save)
+    if not leader and temp is not None:
+        print(f"Shared in-flight fetch for ({lat}, {lng}): {temp}°C")
+        await _run_blocking(record_visit, lat, lng, temp, search_method, measurement_id)
+    return temp
+
+
+async def afetch_temperatures(points, search_method="unknown", use_cache=True, chunk_size=MAX_LOCATIONS_PER_REQUEST,
+                              concurrency=DEFAULT_CONCURRENCY, retries=3, backoff_factor=1, timeout=REQUEST_TIMEOUT,
+                              cache_radius_km=None, base_url=None):
+    """
+    Async version of fetch_temperatures.
+
+    Uncached points are split into chunks of at most `chunk_size`
+    locations and up to `concurrency` chunk requests run at once (the
+    thread pool is grown to match). Use chunk_size=1 to issue one
+    concurrent request per point.
+
+    Returns
+    -------
+    temps : list[float or None]
+        Temperatures aligned with `points`.
+    """
+    get_executor(concurrency)
+    points, temps, hits, misses = await _run_blocking(_partition_cached, points, use_cache, cache_radius_km)
+    n_hits = sum(t is not None for t in temps)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    chunks = [misses[start:start + chunk_size] for start in range(0, len(misses), chunk_size)]
+    responses = await asyncio.gather(*(
+        _aget_forecast(_batch_params(points, chunk), semaphore, retries=retries,
+                       backoff_factor=backoff_factor, timeout=timeout, base_url=base_url)
+        for chunk in chunks
+    ))
+    for chunk, data in zip(chunks, responses):
+        _fill_batch(temps, chunk, data)
+
+    await _run_blocking(_save_batch, points, temps, hits, search_method)
+
+    print(f"Fetched {len(points)} points: {n_hits} cache hits, "
+          f"{len(misses)} fetched in {len(chunks)} concurrent requests.")
+    return temps
@@ -0,0 +1,55 @@
+import math
+
+# ==============================================================================
+# CACHE EXPIRY POLICIES:
+# A cached temperature is only reused while it is still "current". Each
+# policy maps the present time to the oldest observation time that is
+# still considered fresh.
+# ==============================================================================
+
+# Open-Meteo refreshes its "current" conditions every 15 minutes
+MODEL_UPDATE_INTERVAL = 15 * 60
+
+
+class NoExpiry:
+    """Cached observations never expire (the original behaviour)."""
+
+    def oldest_fresh_time(self, now):
+        return -math.inf
+
+    def __repr__(self):
+        return "NoExpiry()"
+
+
+class FixedTTL:
+    """Observations are fresh for a fixed number of seconds."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def oldest_fresh_time(self, now):
+        return now - self.seconds
+
+    def __repr__(self):
+        return f"FixedTTL({self.seconds})"
+
+
+class ModelUpdateSlots:
+    """
+    Observations are fresh until the next model update slot begins.
+
+    Slots start every `interval_seconds` (aligned to the Unix epoch, plus
+    `offset_seconds`), so anything recorded in the current slot is reused
+    and everything older is refetched.
+    """
+
+    def __init__(self, interval_seconds=MODEL_UPDATE_INTERVAL, offset_seconds=0):
+        self.interval_seconds = interval_seconds
+        self.offset_seconds = offset_seconds
+
+    def oldest_fresh_time(self, now):
+        shifted = now - self.offset_seconds
+        return shifted - (shifted % self.interval_seconds) + self.offset_seconds
+
+    def __repr__(self):
+        return f"ModelUpdateSlots({self.interval_seconds}, offset_seconds={self.offset_seconds})"
@@ -0,0 +1,151 @@
+"""
+Request Coalescing
+==================
+Turns many independent single-point fetches into a few multi-location
+Open-Meteo requests. While a RequestCoalescer is installed, every cache
+miss of fetch_temperature / afetch_temperature (from any thread or event
+loop) is queued instead of requested; a dispatcher thread flushes the
+queue as one request once `max_delay` has passed since the first queued
+point or `max_batch` points are waiting, then fans the temperatures back
+out to the waiting callers. The search loops themselves stay sequential.
+
+Usage:
+    with coalescing(max_delay=0.005):
+        await asyncio.gather(*(bo.arun_search() for bo in searches))
+
+Cache lookups, single-flight deduplication and the visit/measurement
+logging still happen per caller; only the HTTP call is shared. Requests
+use the coalescer's retry settings rather than the callers'.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from src.data import weather_api
+from src.data.storage import quantize
+from src.data.weather_api import MAX_LOCATIONS_PER_REQUEST, _get_forecast, _parse_current_temperature
+
+DEFAULT_MAX_DELAY = 0.005   # Seconds a point may wait for company
+DEFAULT_MAX_IN_FLIGHT = 4   # Batches sent concurrently
+
+
+class RequestCoalescer:
+    """
+    Queues single-point requests and sends them in multi-location batches.
+
+    Parameters
+    ----------
+    max_batch : int
+        Points per request; a full batch is sent at once.
+    max_delay : float
+        Seconds to wait for more points after the first one is queued.
+    max_in_flight : int
+        Batches sent concurrently (more are queued meanwhile).
+    retries, backoff_factor : int, float
+        Retry settings for each batch request.
+    """
+
+    def __init__(self, max_batch=MAX_LOCATIONS_PER_REQUEST, max_delay=DEFAULT_MAX_DELAY,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT, retries=3, backoff_factor=1):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.stats = {"points": 0, "requests": 0}
+        self._pending = []      # (lat, lng, base_url, future)
+        self._first_at = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._sender = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="coalescer")
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, lat, lng, base_url=None):
+        """
+        Queues (lat, lng) and returns a concurrent.futures.Future of its
+        temperature (None if the request failed).
+        """
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RequestCoalescer is closed")
+            self._pending.append((lat, lng, base_url, future))
+            if self._first_at is None:
+                self._first_at = time.monotonic()
+            self._cond.notify()
+        return future
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = self._first_at + self.max_delay
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch]
+                self._pending = self._pending[self.max_batch:]
+                self._first_at = time.monotonic() if self._pending else None
+            self._sender.submit(self._send, batch)
+
+    def _send(self, batch):
+        groups = {}
+        for item in batch:
+            groups.setdefault(item[2], []).append(item)
+        for base_url, items in groups.items():
+            try:
+                temps = self._fetch(items, base_url)
+            except Exception as e:
+                for *_, future in items:
+                    future.set_exception(e)
+                continue
+            for (lat, lng, _, future) in items:
+                future.set_result(temps.get((quantize(lat), quantize(lng))))
+
+    def _fetch(self, items, base_url):
+        """Requests each distinct cell of `items` once; returns {cell: temp}."""
+        cells = {}
+        for lat, lng, _, _ in items:
+            cells.setdefault((quantize(lat), quantize(lng)), (lat, lng))
+        points = list(cells.values())
+        params = {
+            "latitude": ",".join(str(lat) for lat, _ in points),
+            "longitude": ",".join(str(lng) for _, lng in points),
+            "current": "temperature_2m",
+        }
+        data = _get_forecast(params, retries=self.retries, backoff_factor=self.backoff_factor, base_url=base_url)
+        with self._cond:
+            self.stats["points"] += len(items)
+            self.stats["requests"] += 1
+        if data is None:
+            return {}
+        # A single location comes back as an object, several as a list
+        locations = data if isinstance(data, list) else [data]
+        return {cell: _parse_current_temperature(location) for cell, location in zip(cells, locations)}
+
+    def close(self):
+        """Sends whatever is still queued, then stops the dispatcher."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._dispatcher.join()
+        self._sender.shutdown(wait=True)
+
+
+@contextmanager
+def coalescing(max_batch=MAX_LOCATIONS_PER_REQUEST, max_delay=DEFAULT_MAX_DELAY, **kwargs):
+    """Coalesces all Open-Meteo fetches inside the block (see RequestCoalescer)."""
+    coalescer = RequestCoalescer(max_batch=max_batch, max_delay=max_delay, **kwargs)
+    previous = weather_api.set_coalescer(coalescer)
+    try:
+        yield coalescer
+    finally:
+        weather_api.set_coalescer(previous)
+        coalescer.close()
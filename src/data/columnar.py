@@ -0,0 +1,251 @@
+"""
+Columnar Results Format
+=======================
+Keeps a binary, column-oriented copy of the results log next to it
+(results.csv -> results.columns.npy + results.columns.json) so analysis
+code can memory-map every observation in one call instead of re-parsing
+the CSV text.
+
+The copy is a NumPy structured array with one record per row:
+  - timestamp : float64, wall-clock seconds since the epoch (naive
+                timestamps are kept as written, i.e. not shifted to UTC)
+  - lat, lng, temp : float64
+  - method    : int16 code into the "methods" list of the JSON sidecar
+
+Syncing is incremental: the sidecar records how many bytes of the CSV have
+been converted, and only rows appended since then are parsed and appended
+to the .npy file in place (its header is padded so the row count can grow
+without moving the data), so a sync costs O(new rows). Readers that
+only need the latest session (e.g. playback) locate it by scanning the
+memory-mapped timestamps backwards instead of loading the whole log.
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.data import data_manager
+from src.data.file_lock import file_lock
+
+COLUMNAR_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("lat", "f8"),
+    ("lng", "f8"),
+    ("temp", "f8"),
+    ("method", "i2"),
+])
+
+
+def columnar_paths(results_path):
+    """Returns the (.npy, .json) sidecar paths for a results CSV."""
+    stem = os.path.splitext(results_path)[0]
+    return stem + ".columns.npy", stem + ".columns.json"
+
+
+def _wall_clock_seconds(value):
+    """Parses an ISO timestamp to wall-clock epoch seconds (NaN if invalid)."""
+    try:
+        ts = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return np.nan
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _read_meta(meta_path):
+    if not os.path.isfile(meta_path):
+        return None
+    with open(meta_path, "r") as f:
+        return json.load(f)
+
+
+def _parse_rows(lines, header, methods):
+    """Converts CSV lines to records, skipping malformed rows."""
+    codes = {m: i for i, m in enumerate(methods)}
+    records = []
+    for values in csv.reader(lines):
+        row = dict(zip(header, values))
+        try:
+            lat, lng, temp = float(row["lat"]), float(row["lng"]), float(row["temp"])
+        except (ValueError, KeyError, TypeError):
+            continue
+        method = row.get("search_method") or "unknown"
+        if method not in codes:
+            codes[method] = len(methods)
+            methods.append(method)
+        records.append((_wall_clock_seconds(row.get("timestamp")), lat, lng, temp, codes[method]))
+    return np.array(records, dtype=COLUMNAR_DTYPE)
+
+
+def _npy_header(rows):
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(header, {
+        "descr": np.lib.format.dtype_to_descr(COLUMNAR_DTYPE),
+        "fortran_order": False,
+        "shape": (rows,),
+    })
+    return header.getvalue()
+
+
+def _append_records(npy_path, rows, new):
+    """
+    Appends records to the .npy file after its first `rows` records and
+    updates the row count in its header, in place. Returns False (leaving
+    the file untouched) if the file's layout does not allow it.
+    """
+    with open(npy_path, "r+b") as f:
+        try:
+            if np.lib.format.read_magic(f) != (1, 0):
+                return False
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        except ValueError:
+            return False
+        header = _npy_header(rows + len(new))
+        if dtype != COLUMNAR_DTYPE or fortran_order or shape[0] < rows or f.tell() != len(header):
+            return False
+
+        # Drop anything past `rows` (e.g. from an interrupted sync), append, then publish the new count
+        f.truncate(len(header) + rows * COLUMNAR_DTYPE.itemsize)
+        f.seek(0, os.SEEK_END)
+        f.write(new.tobytes())
+        f.flush()
+        f.seek(0)
+        f.write(header)
+    return True
+
+
+def sync_columnar(results_path=None):
+    """
+    Brings the columnar copy up to date with the results CSV.
+
+    Returns
+    -------
+    int
+        Number of rows added to the columnar copy.
+    """
+    results_path = results_path or data_manager.RESULTS_FILE
+    data_manager.flush_results()
+    if not os.path.isfile(results_path):
+        return 0
+
+    npy_path, meta_path = columnar_paths(results_path)
+    with file_lock(npy_path):
+        meta = _read_meta(meta_path)
+        stat = os.stat(results_path)
+        size = stat.st_size
+        if (meta is None or not os.path.isfile(npy_path) or size < meta["source_offset"]
+                or meta.get("source_inode") != stat.st_ino):
+            # First sync, or the log was replaced (e.g. rewritten by a storage migration): convert from the start
+            meta = {"source_offset": 0, "header": None, "methods": [], "source_inode": stat.st_ino}
+        if size == meta["source_offset"]:
+            return 0
+
+        with file_lock(results_path, shared=True), open(results_path, "rb") as f:
+            f.seek(meta["source_offset"])
+            data = f.read()
+
+        end = data.rfind(b"\n") + 1
+        lines = data[:end].decode("utf-8").splitlines()
+        if meta["header"] is None and lines:
+            meta["header"] = next(csv.reader(lines[:1]))
+            lines = lines[1:]
+
+        new = _parse_rows(lines, meta["header"], meta["methods"])
+        added = len(new)
+        rows = meta.get("rows")
+        if meta["source_offset"] == 0 or rows is None or not _append_records(npy_path, rows, new):
+            if meta["source_offset"] > 0:
+                new = np.concatenate([np.load(npy_path)[:rows], new])
+            # Replace atomically so concurrent memory-mapped readers keep a valid file
+            tmp_npy = npy_path + ".tmp.npy"
+            np.save(tmp_npy, new)
+            os.replace(tmp_npy, npy_path)
+            rows = 0
+        meta["source_offset"] += end
+        meta["rows"] = rows + len(new)
+
+        tmp_meta = meta_path + ".tmp"
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+    return added
+
+
+def load_columnar(results_path=None, mmap=True):
+    """
+    Syncs and loads the columnar copy of the results log.
+
+    Returns
+    -------
+    data : np.ndarray
+        Structured array with COLUMNAR_DTYPE (read-only memory map if mmap).
+    methods : list[str]
+        search_method names indexed by data["method"].
+    """
+    results_path = results_path or data_manager.RESULTS_FILE
+    sync_columnar(results_path)
+    npy_path, meta_path = columnar_paths(results_path)
+    meta = _read_meta(meta_path)
+    if meta is None or not os.path.isfile(npy_path):
+        return np.empty(0, dtype=COLUMNAR_DTYPE), []
+    # Shared lock: a sync appending in place rewrites the header
+    with file_lock(npy_path, shared=True):
+        data = np.load(npy_path, mmap_mode="r" if mmap else None)
+    return data[:meta.get("rows")], meta["methods"]
+
+
+def last_session_start(timestamps, gap_seconds, block=4096):
+    """
+    Index of the first row of the last session, where a new session starts
+    after a gap of more than `gap_seconds` between consecutive rows.
+
+    Scans backwards from the end in blocks, so only the tail of a
+    memory-mapped column is paged in.
+    """
+    hi = len(timestamps)
+    while hi > 1:
+        lo = max(0, hi - block - 1)
+        breaks = np.flatnonzero(np.diff(np.asarray(timestamps[lo:hi])) > gap_seconds)
+        if len(breaks):
+            return lo + int(breaks[-1]) + 1
+        hi = lo + 1
+    return 0
+
+
+def load_results_frame(results_path=None, session_gap=None):
+    """
+    Loads the results log as a pandas DataFrame with the standard columns
+    (timestamp as datetime64, search_method as a categorical).
+
+    Parameters
+    ----------
+    results_path : str, optional
+        Defaults to data_manager.RESULTS_FILE.
+    session_gap : float, optional
+        If given, only the last session is loaded: the rows after the last
+        gap of more than this many seconds.
+    """
+    data, methods = load_columnar(results_path)
+    if session_gap is not None:
+        data = data[last_session_start(data["timestamp"], session_gap):]
+    return pd.DataFrame({
+        "timestamp": pd.to_datetime(np.asarray(data["timestamp"]), unit="s").round("us"),
+        "lat": np.asarray(data["lat"]),
+        "lng": np.asarray(data["lng"]),
+        "temp": np.asarray(data["temp"]),
+        "search_method": pd.Categorical.from_codes(np.asarray(data["method"]), categories=methods),
+    })
+
+
+def format_timestamp(seconds):
+    """Converts wall-clock seconds back to the ISO string used in the log."""
+    if np.isnan(seconds):
+        return ""
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None).isoformat()
@@ -1,7 +1,15 @@
-import csv
 import os
+import threading
+import time
+import uuid
+from collections import namedtuple
+from contextlib import contextmanager
 from datetime import datetime
 
+from src.data.cache_policy import FixedTTL, ModelUpdateSlots
+from src.data.spatial_index import SphericalBucketIndex, degrees_to_km
+from src.data.storage import BufferedResultWriter, CSVBackend, SQLiteBackend, new_measurement_id
+
 # ==============================================================================
 # COORDINATE STRATEGY AGREEMENT:
 # We use decimal (latitude, longitude).
@@ -18,64 +26,435 @@ def is_valid_coordinate(lat, lng):
 
 RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results.csv")
 
+# Set RESULTS_DB to a file path to store results in SQLite instead of CSV
+RESULTS_DB = os.getenv("RESULTS_DB")
+
+_STORAGE = None
+_WRITER = None
+_RUN_ID = None
+
+def set_storage(backend):
+    """
+    Selects the storage backend used by save_result / load_results.
+    Passing None restores the default (SQLite if RESULTS_DB is set,
+    otherwise the CSV file at RESULTS_FILE).
+    """
+    global _STORAGE, _INTERNAL_CACHE
+    flush_results()
+    _STORAGE = backend
+    _INTERNAL_CACHE = None
+
+def get_storage():
+    """
+    Returns the active storage backend.
+    """
+    global _STORAGE
+    if _STORAGE is not None:
+        return _STORAGE
+    if RESULTS_DB:
+        _STORAGE = SQLiteBackend(RESULTS_DB)
+        return _STORAGE
+    # Resolved on every call so RESULTS_FILE can be changed at runtime
+    return CSVBackend(RESULTS_FILE)
+
+@contextmanager
+def buffered_results(max_rows=500, max_delay=5.0, fsync=False):
+    """
+    Buffers everything saved inside the block and writes it in batches
+    (see BufferedResultWriter); pending rows are flushed on exit. Nested
+    blocks share the outermost buffer.
+
+    Usage:
+        with buffered_results():
+            for ...:
+                save_result(...)
+    """
+    global _WRITER
+    if _WRITER is not None:
+        yield _WRITER
+        return
+
+    writer = BufferedResultWriter(get_storage(), max_rows=max_rows, max_delay=max_delay, fsync=fsync)
+    _WRITER = writer
+    try:
+        yield writer
+    finally:
+        if _WRITER is writer:
+            _WRITER = None
+        writer.close()
+
+def flush_results():
+    """
+    Writes any buffered results to storage.
+    """
+    if _WRITER is not None:
+        _WRITER.flush()
+
+def start_run():
+    """
+    Starts a new run and returns its id. Every result saved afterwards is
+    tagged with this id (stored by backends that support it).
+    """
+    global _RUN_ID
+    _RUN_ID = datetime.now().strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:8]
+    return _RUN_ID
+
+def get_run_id():
+    """
+    Returns the current run id, starting a run if none is active.
+    """
+    if _RUN_ID is None:
+        return start_run()
+    return _RUN_ID
+
 def save_result(lat, lng, temp, search_method):
     """
-    Saves a single measurement to the shared results file.
+    Saves a single measurement to the shared results file and returns its
+    measurement id.
+    """
+    return save_results([(lat, lng, temp, search_method)])[0]
+
+
+def record_visit(lat, lng, temp, search_method, measurement_id, source="cache"):
+    """
+    Logs that a search visited (lat, lng) without measuring it: a cache
+    hit reusing an existing measurement, or (source="snapshot",
+    measurement_id=None) a value interpolated from the snapshot. Only the
+    visit log grows.
+    """
+    save_results([(lat, lng, temp, search_method, measurement_id, source)])
+
+
+def save_results(rows):
     """
-    timestamp = datetime.now().isoformat()
-    
-    file_exists = os.path.isfile(RESULTS_FILE)
-    
-    with open(RESULTS_FILE, mode='a', newline='') as f:
-        writer = csv.writer(f)
-        # Write header if file is new
-        if not file_exists:
-            writer.writerow(["timestamp", "lat", "lng", "temp", "search_method"])
-        
-        writer.writerow([timestamp, lat, lng, temp, search_method])
+    Saves many observations in one append, in order.
+
+    rows: Iterable of (lat, lng, temp, search_method) tuples for new
+          measurements, or (lat, lng, temp, search_method, measurement_id)
+          tuples for visits that reuse an existing measurement, optionally
+          followed by the visit's source (see VISIT_SOURCES; "cache" by
+          default). Snapshot visits have no measurement id.
+
+    Every row is added to the visit log (results.csv). Only new
+    measurements are added to the measurement table behind the cache.
+    Returns the measurement id of each row (None for snapshot visits).
+    """
+    rows = list(rows)
+    now = datetime.now()
+    timestamp = now.isoformat()
+    observed_at = now.timestamp()
+    run_id = get_run_id()
+
+    visits = []
+    measurements = []
+    for row in rows:
+        lat, lng, temp, search_method = row[:4]
+        if len(row) == 4:
+            source = "api"
+            measurement_id = new_measurement_id()
+            measurements.append({"id": measurement_id, "timestamp": timestamp,
+                                 "lat": lat, "lng": lng, "temp": temp})
+        else:
+            measurement_id = row[4]
+            source = row[5] if len(row) > 5 else "cache"
+        visits.append({"timestamp": timestamp, "lat": lat, "lng": lng, "temp": temp,
+                       "search_method": search_method, "run_id": run_id,
+                       "measurement_id": measurement_id, "source": source})
+
+    # Buffered while inside buffered_results(), written straight through otherwise
+    target = _WRITER if _WRITER is not None else get_storage()
+    if measurements:
+        target.append_measurements(measurements)
+    target.append(visits)
 
     # Update in-memory cache directly without reading file
-    global _INTERNAL_CACHE
-    if _INTERNAL_CACHE is not None:
-        key = (round(lat, 4), round(lng, 4))
-        _INTERNAL_CACHE[key] = float(temp)
+    cache = _current_cache()
+    if cache is not None:
+        for m in measurements:
+            cache.add(float(m["lat"]), float(m["lng"]), float(m["temp"]), observed_at, m["id"])
+    return [visit["measurement_id"] for visit in visits]
 
 
 _INTERNAL_CACHE = None
+_CACHE_SOURCE = None
+_CACHE_OFFSET = 0       # How far into the measurement store the cache has read
+# Serializes loading and refreshing the cache (the index has its own lock)
+_CACHE_LOCK = threading.RLock()
+
+# Cached temperatures are only reused until the next forecast model update
+CACHE_POLICY = ModelUpdateSlots()
+
+# Set CACHE_MAX_ENTRIES to bound the in-memory cache (least recently used
+# entries are evicted); unbounded by default
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "0")) or None
+
+_CACHE_STATS = {"hits": 0, "misses": 0, "stale": 0, "snapshot": 0}
+# Lookups run on many threads (sync batches, the async engine's pool)
+_STATS_LOCK = threading.Lock()
+
+# Gridded snapshot consulted when there is no fresh cached observation
+# (see src/data/snapshot.py)
+_SNAPSHOT = None
+
+# Snapshots are expensive to prefetch and meant to be reused across sweeps,
+# so they expire on their own clock rather than under CACHE_POLICY
+SNAPSHOT_POLICY = FixedTTL(float(os.getenv("SNAPSHOT_MAX_AGE_HOURS", "6")) * 3600)
+
+# Where a visited temperature came from: a new API measurement, an earlier
+# measurement in the cache, or an interpolation of the snapshot
+VISIT_SOURCES = ("api", "cache", "snapshot")
+
+CacheEntry = namedtuple("CacheEntry",
+                        ["temp", "distance_km", "observed_at", "age_seconds", "fresh", "measurement_id", "source"])
+
+def set_cache_policy(policy):
+    """
+    Selects the expiry policy used by get_cached_result
+    (see src/data/cache_policy.py).
+    """
+    global CACHE_POLICY
+    CACHE_POLICY = policy
+
+def set_snapshot(snapshot):
+    """
+    Lets get_cached_entry answer from a TemperatureSnapshot when the cache
+    has no fresh observation nearby. None disables it. Returns the
+    previously set snapshot.
+    """
+    global _SNAPSHOT
+    previous, _SNAPSHOT = _SNAPSHOT, snapshot
+    return previous
+
+def set_snapshot_policy(policy):
+    """
+    Selects the expiry policy of the snapshot (see src/data/cache_policy.py),
+    independent of the per-point CACHE_POLICY.
+    """
+    global SNAPSHOT_POLICY
+    SNAPSHOT_POLICY = policy
+
+def set_cache_limit(max_entries):
+    """
+    Bounds the in-memory cache to `max_entries` observations (None for no
+    bound), evicting the least recently used ones if it is already larger.
+    """
+    global CACHE_MAX_ENTRIES
+    CACHE_MAX_ENTRIES = max_entries
+    if _INTERNAL_CACHE is not None:
+        _INTERNAL_CACHE.max_entries = max_entries
+        if max_entries is not None:
+            _INTERNAL_CACHE.evict(max_entries)
+
+def cache_stats():
+    """
+    Returns cache counters: lookups answered with a fresh entry (hits),
+    with nothing (misses) or only an expired entry (stale), misses and
+    stale lookups answered by the snapshot, plus the in-memory entry
+    count, size bound and evictions.
+    """
+    with _STATS_LOCK:
+        stats = dict(_CACHE_STATS)
+    cache = _current_cache()
+    stats.update(cache.stats() if cache is not None else
+                 {"entries": 0, "max_entries": CACHE_MAX_ENTRIES, "evictions": 0})
+    return stats
+
+def reset_cache_stats():
+    """Zeroes the hit / miss / stale counters."""
+    with _STATS_LOCK:
+        for key in _CACHE_STATS:
+            _CACHE_STATS[key] = 0
+
+def _count_lookup(outcome):
+    with _STATS_LOCK:
+        _CACHE_STATS[outcome] += 1
+
+def _parse_timestamp(value):
+    """Converts an ISO timestamp from the results log to Unix seconds."""
+    return datetime.fromisoformat(value).timestamp()
+
+def _storage_source(storage):
+    """Identifies the data a cache was loaded from."""
+    return (type(storage).__name__, os.path.abspath(storage.path))
+
+def _current_cache():
+    """Returns the in-memory cache if it was loaded from the active storage."""
+    if _INTERNAL_CACHE is not None and _CACHE_SOURCE == _storage_source(get_storage()):
+        return _INTERNAL_CACHE
+    return None
 
 def load_results():
     """
-    Loads all shared results into a list of dictionaries.
+    Loads the visit log (every point visited, in order) into a list of
+    dictionaries.
+    """
+    flush_results()
+    return get_storage().load()
+
+def read_results_since(offset=0):
+    """
+    Reads only the visit log rows appended after `offset` (0 reads the
+    whole log), so long-lived readers can poll for new rows cheaply.
+
+    Returns
+    -------
+    rows : list[dict]
+    offset : int
+        Pass this to the next call to continue where this one stopped.
+    """
+    flush_results()
+    return get_storage().read_results_since(offset)
+
+def load_measurements():
+    """
+    Loads the deduplicated measurement table into a list of dictionaries.
+    """
+    flush_results()
+    return get_storage().load_measurements()
+
+def _load_cache():
+    """Returns the spatial cache for the active storage, loading it if needed."""
+    global _INTERNAL_CACHE, _CACHE_SOURCE, _CACHE_OFFSET
+    cache = _current_cache()
+    if cache is not None:
+        return cache
+
+    with _CACHE_LOCK:
+        cache = _current_cache()
+        if cache is not None:
+            # Loaded by another thread meanwhile
+            return cache
+        cache = SphericalBucketIndex(max_entries=CACHE_MAX_ENTRIES)
+        source = _storage_source(get_storage())
+        # Full load once per process (and storage); refresh_cache() adds the rest
+        rows, offset = get_storage().read_measurements_since(0)
+        _add_measurements(cache, rows)
+        if _WRITER is not None and _storage_source(_WRITER.backend) == source:
+            # Saved before the cache existed and not written yet
+            _add_measurements(cache, _WRITER.pending_measurements())
+        # Published only once complete, so other threads never see a partial cache
+        _CACHE_OFFSET = offset
+        _CACHE_SOURCE = source
+        _INTERNAL_CACHE = cache
+    return cache
+
+def _add_measurements(cache, rows):
+    """Adds measurement rows (as read from storage) to the cache."""
+    for row in rows:
+        try:
+            cache.add(float(row['lat']), float(row['lng']), float(row['temp']),
+                      _parse_timestamp(row['timestamp']), row['id'])
+        except (ValueError, KeyError, TypeError):
+            continue
+
+def refresh_cache():
+    """
+    Adds measurements appended to storage since the cache last read it,
+    including those written by other processes. Costs only the new rows.
+    Does not flush buffered results: this process's own measurements are
+    added to the cache when they are saved.
+
+    Returns
+    -------
+    int
+        Number of new measurement rows read.
+    """
+    global _CACHE_OFFSET
+    if _current_cache() is None:
+        return len(_load_cache())
+
+    with _CACHE_LOCK:
+        rows, _CACHE_OFFSET = get_storage().read_measurements_since(_CACHE_OFFSET)
+        _add_measurements(_INTERNAL_CACHE, rows)
+    return len(rows)
+
+def lookup_cache(lat, lng, tolerance=0.0001, radius_km=None, policy=None):
+    """
+    Finds the nearest cached observation and reports how fresh it is.
+
+    Prefers the nearest fresh entry; if there is none, returns the nearest
+    expired one (with fresh=False) so callers can report staleness.
+
+    Returns
+    -------
+    CacheEntry or None
+        (temp, distance_km, observed_at, age_seconds, fresh)
     """
-    if not os.path.isfile(RESULTS_FILE):
-        return []
-        
-    results = []
-    with open(RESULTS_FILE, mode='r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            results.append(row)
-    return results
+    cache = _load_cache()
+    policy = policy or CACHE_POLICY
+    if radius_km is None:
+        radius_km = degrees_to_km(tolerance)
 
-def get_cached_result(lat, lng, tolerance=0.0001):
+    now = time.time()
+    min_time = policy.oldest_fresh_time(now)
+    hit = _nearest(cache, lat, lng, radius_km, min_time)
+    if hit is None and refresh_cache():
+        # Another process may have just measured this point
+        hit = _nearest(cache, lat, lng, radius_km, min_time)
+    fresh = hit is not None
+    if hit is None:
+        hit = _nearest(cache, lat, lng, radius_km)
+    if hit is None:
+        _count_lookup("misses")
+        return None
+    _count_lookup("hits" if fresh else "stale")
+
+    temp, distance_km, observed_at, measurement_id = hit
+    return CacheEntry(temp, distance_km, observed_at, now - observed_at, fresh, measurement_id, "cache")
+
+def _nearest(cache, lat, lng, radius_km, min_time=None):
+    """
+    Reads the nearest cache entry as (temp, distance_km, observed_at,
+    measurement_id), or None. Holds the index lock so that a concurrent
+    add() cannot renumber the entries in between.
+    """
+    with cache.lock:
+        hit = cache.nearest(lat, lng, radius_km, min_time=min_time)
+        if hit is None:
+            return None
+        slot, distance_km = hit
+        temp, observed_at, measurement_id = cache.entry(slot)
+        return temp, distance_km, observed_at, measurement_id
+
+def get_cached_entry(lat, lng, tolerance=0.0001, radius_km=None, policy=None):
+    """
+    Like get_cached_result, but returns the full CacheEntry (including the
+    measurement id and source) for fresh hits, or None.
+    """
+    entry = lookup_cache(lat, lng, tolerance=tolerance, radius_km=radius_km, policy=policy)
+    if entry is not None and entry.fresh:
+        return entry
+
+    snapshot_entry = _lookup_snapshot(lat, lng)
+    if snapshot_entry is not None:
+        _count_lookup("snapshot")
+        return snapshot_entry
+    if entry is not None:
+        print(f"Cache entry for ({lat}, {lng}) is stale ({entry.age_seconds / 3600:.1f}h old), refetching.")
+    return None
+
+def _lookup_snapshot(lat, lng):
+    """Interpolates the snapshot at (lat, lng) if one is set and still fresh under SNAPSHOT_POLICY."""
+    if _SNAPSHOT is None:
+        return None
+    now = time.time()
+    if _SNAPSHOT.fetched_at < SNAPSHOT_POLICY.oldest_fresh_time(now):
+        return None
+    temp = _SNAPSHOT.lookup(lat, lng)
+    if temp is None:
+        return None
+    # Interpolated, not measured: there is no measurement to reference
+    return CacheEntry(temp, 0.0, _SNAPSHOT.fetched_at, now - _SNAPSHOT.fetched_at, True, None, "snapshot")
+
+def get_cached_result(lat, lng, tolerance=0.0001, radius_km=None, policy=None):
     """
     Checks if a result for the given coordinates already exists in the cache.
-    Uses an in-memory cache to avoid disk reads for every single API call.
-    """
-    global _INTERNAL_CACHE
-    if _INTERNAL_CACHE is None:
-        _INTERNAL_CACHE = {}
-        # Load exactly once per process
-        results = load_results()
-        for row in results:
-            try:
-                r_lat = float(row['lat'])
-                r_lng = float(row['lng'])
-                # Using 4 decimal places for hashing close matches
-                key = (round(r_lat, 4), round(r_lng, 4))
-                _INTERNAL_CACHE[key] = float(row['temp'])
-            except (ValueError, KeyError):
-                continue
-
-    q_key = (round(lat, 4), round(lng, 4))
-    return _INTERNAL_CACHE.get(q_key)
+    Uses an in-memory spatial index to avoid disk reads for every single API call.
+
+    Returns the temperature of the nearest fresh cached observation within
+    `radius_km` kilometres, or within `tolerance` degrees of arc when
+    radius_km is None. Returns None if nothing is close enough or the
+    closest entries have expired under the cache policy.
+    """
+    entry = get_cached_entry(lat, lng, tolerance=tolerance, radius_km=radius_km, policy=policy)
+    return None if entry is None else entry.temp
@@ -0,0 +1,48 @@
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# ==============================================================================
+# ADVISORY FILE LOCKS:
+# Several processes (tuning sweeps, baselines) append to the same results
+# files. Writers hold an exclusive lock and readers a shared one on a
+# sidecar "<file>.lock", so nobody reads a half-written row or interleaves
+# two appends. Windows has no shared locks, so readers lock exclusively.
+# ==============================================================================
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """
+    Holds an advisory lock associated with `path` for the duration of the
+    block. Blocks until the lock is available.
+
+    Parameters
+    ----------
+    path : str
+        The file being protected (the lock lives in path + ".lock").
+    shared : bool
+        Take a shared (reader) lock instead of an exclusive one.
+    """
+    lock_path = path + ".lock"
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
@@ -2,26 +2,52 @@ import os
 import googlemaps
 from dotenv import load_dotenv
 
+from src.data.http_client import get_session
+from src.data.rate_limit import GOOGLE_MAPS, wait_for_slot
+
 # Load environment variables from .env file
 load_dotenv()
 
+_ELEVATION_CLIENT = None
+_ELEVATION_SESSION = None   # Session the cached client was built on (None if set explicitly)
+
 def get_elevation_client():
     """
-    Initializes and returns a Google Maps client.
+    Returns a Google Maps client, creating it on first use.
+    The client reuses the shared pooled HTTP session, and is rebuilt if
+    that session has been replaced (set_session / configure_session).
     Requires GOOGLE_MAPS_API_KEY to be set in the environment.
     """
+    global _ELEVATION_CLIENT, _ELEVATION_SESSION
+    session = get_session()
+    if _ELEVATION_CLIENT is not None and _ELEVATION_SESSION in (None, session):
+        return _ELEVATION_CLIENT
+
     api_key = os.getenv("GOOGLE_MAPS_API_KEY")
     if not api_key:
         raise ValueError("GOOGLE_MAPS_API_KEY not found in environment variables. "
                          "Please check your .env file.")
     
-    return googlemaps.Client(key=api_key)
+    _ELEVATION_CLIENT = googlemaps.Client(key=api_key, requests_session=session)
+    _ELEVATION_SESSION = session
+    return _ELEVATION_CLIENT
+
+def set_elevation_client(client):
+    """
+    Replaces the cached Google Maps client (e.g. with a mock in tests); it
+    is kept even if the shared session changes. Passing None forces a new
+    client on the next call.
+    """
+    global _ELEVATION_CLIENT, _ELEVATION_SESSION
+    _ELEVATION_CLIENT = client
+    _ELEVATION_SESSION = None
 
 def fetch_elevation(lat, lng):
     """
     Fetches elevation for a single coordinate.
     """
     gmaps = get_elevation_client()
+    wait_for_slot(GOOGLE_MAPS)
     # elevation function returns a list of results
     result = gmaps.elevation((lat, lng))
     
@@ -35,6 +61,7 @@ def fetch_elevations(locations):
     locations: List of (lat, lng) tuples
     """
     gmaps = get_elevation_client()
+    wait_for_slot(GOOGLE_MAPS)
     results = gmaps.elevation(locations)
     return results
 
@@ -0,0 +1,63 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ==============================================================================
+# SHARED HTTP CLIENT LAYER:
+# One keep-alive requests.Session per process, shared by weather_api and
+# google_maps_api so repeated calls reuse TCP/TLS connections instead of
+# paying DNS + handshake costs on every request.
+# ==============================================================================
+
+POOL_CONNECTIONS = 10   # Number of distinct hosts to keep pools for
+POOL_MAXSIZE = 10       # Maximum open connections kept per host
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def create_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """
+    Builds a requests.Session with a pooled HTTPAdapter mounted for both
+    http and https. Retries are handled by the callers, not the adapter.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Returns the process-wide session, creating it on first use.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = create_session()
+    return _SESSION
+
+
+def set_session(session, close=True):
+    """
+    Replaces the process-wide session (e.g. with a mock in tests).
+    The replaced session is closed unless close is False. Passing None
+    means the next call to get_session() will create a fresh one.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if close and _SESSION is not None and _SESSION is not session:
+            _SESSION.close()
+        _SESSION = session
+
+
+def configure_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """
+    Rebuilds the shared session with the given pool limits and returns it.
+    """
+    session = create_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    set_session(session)
+    return session
@@ -0,0 +1,211 @@
+"""
+Client-Side Rate Limiting
+=========================
+Token buckets that pace outgoing API calls below the provider's quota, so
+we saturate it without provoking 429s and the retry/backoff sleeps that
+follow. One limiter per endpoint ("open-meteo", "google-maps") is shared
+by every thread of a process and, through a small state file guarded by
+file_lock, by every process on the machine (tuning sweeps, baselines).
+
+The bucket is stored as a single "theoretical arrival time" (the GCRA
+form of a token bucket): acquiring a token reserves the next free slot
+under the lock and sleeps until it outside the lock, so waiting callers
+never hold the lock and are served in arrival order.
+
+Limits are opt-in, per endpoint, via environment variables:
+    OPEN_METEO_RATE_LIMIT=10 OPEN_METEO_BURST=10 python -m src.models.random_search
+    GOOGLE_MAPS_RATE_LIMIT=50 python main.py
+or programmatically with configure_rate_limit(endpoint, rate, burst).
+"""
+
+import asyncio
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+
+from src.data.file_lock import file_lock
+
+OPEN_METEO = "open-meteo"
+GOOGLE_MAPS = "google-maps"
+
+# Directory holding the shared state files of env-configured limiters
+RATE_LIMIT_DIR = os.getenv("RATE_LIMIT_DIR", tempfile.gettempdir())
+
+_STATE = struct.Struct("<d")
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most
+    `burst` tokens.
+
+    Parameters
+    ----------
+    rate : float
+        Sustained requests per second.
+    burst : int or None
+        Requests that may go out back to back after an idle period
+        (defaults to one second's worth, at least 1).
+    state_path : str or None
+        File shared by all processes using this limiter. Without one the
+        bucket is shared by threads of this process only.
+    """
+
+    def __init__(self, rate, burst=None, state_path=None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst if burst is not None else rate))
+        self.state_path = state_path
+        self.interval = 1.0 / self.rate
+        self._tolerance = (self.burst - 1) * self.interval
+        self._tat = 0.0     # theoretical arrival time, used without state_path
+        self._lock = threading.Lock()
+
+    # --- state -----------------------------------------------------------
+
+    def _update(self, fn):
+        """Applies fn(tat, now) -> (new_tat, result) atomically and returns result."""
+        with self._lock:
+            if self.state_path is None:
+                self._tat, result = fn(self._tat, time.time())
+                return result
+            with file_lock(self.state_path):
+                fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    raw = os.read(fd, _STATE.size)
+                    tat = _STATE.unpack(raw)[0] if len(raw) == _STATE.size else 0.0
+                    # Wall-clock time, so all processes agree on the schedule
+                    tat, result = fn(tat, time.time())
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.write(fd, _STATE.pack(tat))
+                finally:
+                    os.close(fd)
+                return result
+
+    def _reserve(self, tokens):
+        def fn(tat, now):
+            tat = max(tat, now)
+            wait = max(0.0, tat - self._tolerance - now)
+            return tat + tokens * self.interval, wait
+        return self._update(fn)
+
+    # --- public API ------------------------------------------------------
+
+    def reserve(self, tokens=1):
+        """Reserves `tokens` and returns the seconds to wait before using them."""
+        return self._reserve(tokens)
+
+    def acquire(self, tokens=1):
+        """Blocks until `tokens` are available. Returns the seconds waited."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens=1):
+        """Like acquire, but waits with asyncio.sleep."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def try_acquire(self, tokens=1):
+        """Takes `tokens` only if available right now. Returns True on success."""
+        def fn(tat, now):
+            tat = max(tat, now)
+            if tat - self._tolerance > now:
+                return tat, False
+            return tat + tokens * self.interval, True
+        return self._update(fn)
+
+    def pause(self, seconds):
+        """
+        Holds back every user of the bucket for `seconds`, e.g. after the
+        server answers 429 with a Retry-After header.
+        """
+        def fn(tat, now):
+            return max(tat, now + seconds + self._tolerance), None
+        self._update(fn)
+
+
+def _state_path(endpoint):
+    return os.path.join(RATE_LIMIT_DIR, f"ratelimit-{re.sub(r'[^A-Za-z0-9_.-]', '_', endpoint)}.state")
+
+
+def _from_env(endpoint):
+    prefix = endpoint.upper().replace("-", "_")
+    rate = os.getenv(f"{prefix}_RATE_LIMIT")
+    if not rate:
+        return None
+    burst = os.getenv(f"{prefix}_BURST")
+    return TokenBucket(float(rate), int(burst) if burst else None, state_path=_state_path(endpoint))
+
+
+def get_rate_limiter(endpoint):
+    """
+    Returns the limiter for `endpoint`, or None if it is not rate limited.
+    On first use it is built from <ENDPOINT>_RATE_LIMIT / <ENDPOINT>_BURST.
+    """
+    if endpoint not in _LIMITERS:
+        with _LIMITERS_LOCK:
+            if endpoint not in _LIMITERS:
+                _LIMITERS[endpoint] = _from_env(endpoint)
+    return _LIMITERS[endpoint]
+
+
+def set_rate_limiter(endpoint, limiter):
+    """Replaces the limiter for `endpoint`; None disables rate limiting."""
+    with _LIMITERS_LOCK:
+        _LIMITERS[endpoint] = limiter
+
+
+def configure_rate_limit(endpoint, rate, burst=None, shared=True):
+    """
+    Rate limits `endpoint` to `rate` requests per second with the given
+    burst, shared across processes unless shared is False. Returns the
+    limiter.
+    """
+    limiter = TokenBucket(rate, burst, state_path=_state_path(endpoint) if shared else None)
+    set_rate_limiter(endpoint, limiter)
+    return limiter
+
+
+def wait_for_slot(endpoint):
+    """Blocks until `endpoint` may be called. Returns the seconds waited."""
+    limiter = get_rate_limiter(endpoint)
+    return limiter.acquire() if limiter is not None else 0.0
+
+
+async def await_slot(endpoint):
+    """Async version of wait_for_slot."""
+    limiter = get_rate_limiter(endpoint)
+    return await limiter.aacquire() if limiter is not None else 0.0
+
+
+def retry_after(response, default=1.0):
+    """Seconds the server asked us to wait in a 429 response, or None for other responses."""
+    if response is None or getattr(response, "status_code", None) != 429:
+        return None
+    try:
+        return float(response.headers.get("Retry-After", default))
+    except (TypeError, ValueError):
+        return default
+
+
+def note_throttled(endpoint, response):
+    """
+    Pauses the endpoint's limiter (for every thread and process) if
+    `response` is a 429. Returns the pause in seconds, or None.
+    """
+    seconds = retry_after(response)
+    limiter = get_rate_limiter(endpoint)
+    if seconds is not None and limiter is not None:
+        limiter.pause(seconds)
+    return seconds
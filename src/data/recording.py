@@ -0,0 +1,202 @@
+"""
+Record / Replay of Open-Meteo Traffic
+=====================================
+Session wrappers installed in the shared HTTP client layer, so every
+fetch path (fetch_temperature, the batch and asyncio variants, snapshot
+prefetches) is covered without changes:
+
+  - RecordingSession: performs requests as usual and appends each
+    location's response to a tape (JSON lines, one location per line,
+    keyed by its 4-decimal coordinates).
+  - ReplaySession: serves responses from a tape with no network. Repeated
+    visits of a coordinate are replayed in recorded order, so a past
+    search re-runs bit for bit. Unrecorded points can fall back to the
+    nearest recorded one within `nearest_km`; otherwise they come back as
+    Open-Meteo error objects (parsed as a failed fetch, without retries).
+
+Usage:
+    with recording("search.tape.jsonl"):
+        bayesian_optimization_search(seed=42)
+
+    with replaying("search.tape.jsonl", nearest_km=25):
+        bayesian_optimization_search(seed=42)
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import requests
+
+from src.data.file_lock import file_lock
+from src.data.http_client import create_session, get_session, set_session
+from src.data.spatial_index import SphericalBucketIndex
+from src.data.storage import COORD_SCALE, quantize
+
+
+def _is_forecast_request(params):
+    return bool(params) and "latitude" in params and "longitude" in params
+
+
+def _split_locations(params):
+    """Returns the (lat, lng) pairs of a (possibly multi-location) request."""
+    lats = str(params["latitude"]).split(",")
+    lngs = str(params["longitude"]).split(",")
+    return [(float(lat), float(lng)) for lat, lng in zip(lats, lngs)]
+
+
+def _key(lat, lng):
+    return quantize(lat), quantize(lng)
+
+
+class RecordingSession:
+    """
+    Wraps a requests.Session and records successful forecast responses
+    to the tape at `path` (appending, so several runs or processes can
+    share one tape). Other requests pass straight through.
+    """
+
+    def __init__(self, path, session=None):
+        self.path = path
+        self.session = session if session is not None else create_session()
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, **kwargs):
+        response = self.session.get(url, params=params, **kwargs)
+        if _is_forecast_request(params) and response.status_code == 200:
+            self._record(params, response.json())
+        return response
+
+    def _record(self, params, data):
+        locations = data if isinstance(data, list) else [data]
+        recorded_at = time.time()
+        lines = [json.dumps({"lat": lat, "lng": lng, "recorded_at": recorded_at, "response": location})
+                 for (lat, lng), location in zip(_split_locations(params), locations)]
+        with self._lock, file_lock(self.path), open(self.path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def __getattr__(self, name):
+        # post, mount, headers, ... behave like the wrapped session
+        return getattr(self.session, name)
+
+    def close(self):
+        self.session.close()
+
+
+class ReplayResponse:
+    """Minimal stand-in for requests.Response built from recorded JSON."""
+
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+class ReplaySession:
+    """
+    Serves Open-Meteo requests from the tape at `path` without touching
+    the network.
+
+    Parameters
+    ----------
+    path : str
+        Tape written by RecordingSession.
+    nearest_km : float or None
+        If set, a point that was never recorded is answered with the
+        nearest recorded point within this distance.
+    fallback : requests.Session or None
+        Session for requests other than forecasts (e.g. elevation);
+        without one they raise ConnectionError.
+    """
+
+    def __init__(self, path, nearest_km=None, fallback=None):
+        self.path = path
+        self.nearest_km = nearest_km
+        self.fallback = fallback
+        self.hits = 0
+        self.nearest_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._queues = {}       # (qlat, qlng) -> deque of responses, in recorded order
+        self._index = SphericalBucketIndex()
+        self._keys = []
+        self._load()
+
+    def _load(self):
+        with file_lock(self.path, shared=True), open(self.path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                key = _key(record["lat"], record["lng"])
+                if key not in self._queues:
+                    self._queues[key] = deque()
+                    self._index.add(key[0] / COORD_SCALE, key[1] / COORD_SCALE, float(len(self._keys)))
+                    self._keys.append(key)
+                self._queues[key].append(record["response"])
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _respond(self, lat, lng):
+        key = _key(lat, lng)
+        if key not in self._queues and self.nearest_km:
+            hit = self._index.nearest(lat, lng, self.nearest_km)
+            if hit is not None:
+                self.nearest_hits += 1
+                key = self._keys[int(self._index.values[hit[0]])]
+        if key not in self._queues:
+            self.misses += 1
+            return {"error": True, "reason": f"No recorded response for ({lat}, {lng})"}
+
+        self.hits += 1
+        queue = self._queues[key]
+        # Replays repeated visits in order, then keeps serving the last one
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def get(self, url, params=None, **kwargs):
+        if not _is_forecast_request(params):
+            if self.fallback is None:
+                raise requests.exceptions.ConnectionError(f"Replay mode: no network access for {url}")
+            return self.fallback.get(url, params=params, **kwargs)
+
+        locations = _split_locations(params)
+        with self._lock:
+            payload = [self._respond(lat, lng) for lat, lng in locations]
+        return ReplayResponse(payload if len(payload) > 1 else payload[0])
+
+    def close(self):
+        if self.fallback is not None:
+            self.fallback.close()
+
+
+@contextmanager
+def recording(path):
+    """Records all Open-Meteo traffic inside the block to the tape at `path`."""
+    previous = get_session()
+    session = RecordingSession(path, session=previous)
+    set_session(session, close=False)
+    try:
+        yield session
+    finally:
+        set_session(previous, close=False)
+
+
+@contextmanager
+def replaying(path, nearest_km=None):
+    """Serves all Open-Meteo requests inside the block from the tape at `path`."""
+    previous = get_session()
+    session = ReplaySession(path, nearest_km=nearest_km)
+    set_session(session, close=False)
+    try:
+        yield session
+    finally:
+        set_session(previous, close=False)
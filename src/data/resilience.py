@@ -0,0 +1,369 @@
+"""
+Tail-Latency Controls
+=====================
+Per-endpoint latency histograms, hedged requests and circuit breakers,
+applied to every Open-Meteo attempt through call_guarded/acall_guarded.
+BO is strictly sequential, so one slow call sets the wall-clock of a
+whole iteration; these bound how long a degraded endpoint can stall it.
+
+  - Histograms: every attempt's latency is recorded in log-spaced
+    buckets (always on; see latency_stats()).
+  - Hedging: if a call is still running after the endpoint's p95 (or the
+    configured quantile), an identical duplicate is fired and the first
+    successful response wins. Needs HEDGE_MIN_SAMPLES observations first.
+    A hedge also takes a rate-limit token, and is skipped if none is free.
+  - Circuit breaker: after `failure_threshold` consecutive failures
+    (connection errors, timeouts, 5xx) calls fail fast with
+    CircuitOpenError for `reset_timeout` seconds; then one probe call is
+    let through, and its outcome closes or re-opens the circuit.
+
+Hedging and the breaker are opt-in, per endpoint, via environment
+variables or configure_hedging / configure_circuit_breaker:
+    OPEN_METEO_HEDGE_QUANTILE=0.95
+    OPEN_METEO_BREAKER_THRESHOLD=5 OPEN_METEO_BREAKER_RESET=30
+"""
+
+import asyncio
+import bisect
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from src.data.rate_limit import get_rate_limiter
+
+HEDGE_MIN_SAMPLES = 20      # Observations needed before the quantile is trusted
+HEDGE_MIN_DELAY = 0.05      # Never hedge sooner than this (seconds)
+HEDGE_WORKERS = 8           # Threads running hedged synchronous calls
+
+_STATE_LOCK = threading.Lock()
+_HISTOGRAMS = {}
+_BREAKERS = {}
+_HEDGES = {}                # endpoint -> quantile, or None when disabled
+_COUNTERS = {}
+_EXECUTOR = None
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+
+class LatencyHistogram:
+    """
+    Thread-safe latency histogram with `per_decade` log-spaced buckets
+    between `min_latency` and `max_latency` seconds.
+    """
+
+    def __init__(self, min_latency=1e-3, max_latency=100.0, per_decade=10):
+        decades = math.log10(max_latency / min_latency)
+        n = int(round(decades * per_decade))
+        self.bounds = [min_latency * 10 ** (i / per_decade) for i in range(n + 1)]
+        self.counts = [0] * (len(self.bounds) + 1)    # last bucket: beyond max_latency
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        i = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """
+        Upper bound of the bucket holding the q-quantile (an overestimate
+        by at most one bucket width), or None without observations.
+        """
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = q * self.count
+            seen = 0
+            for i, c in enumerate(self.counts):
+                seen += c
+                if seen >= rank and c:
+                    return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+            return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max if self.count else None,
+        }
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (closed -> open -> half-open).
+
+    Parameters
+    ----------
+    failure_threshold : int
+        Consecutive failures that open the circuit.
+    reset_timeout : float
+        Seconds the circuit stays open before a probe call is allowed.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go ahead now. In half-open state only one probe is let through."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """
+        Records a call abandoned without an answer (cancelled or interrupted).
+        It says nothing about the endpoint, so an abandoned probe reopens the
+        circuit with the next call allowed to probe straight away.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic() - self.reset_timeout
+
+
+def _env_prefix(endpoint):
+    return endpoint.upper().replace("-", "_")
+
+
+def _counters(endpoint):
+    if endpoint not in _COUNTERS:
+        with _STATE_LOCK:
+            _COUNTERS.setdefault(endpoint, {"calls": 0, "hedges": 0, "hedge_wins": 0, "rejected": 0})
+    return _COUNTERS[endpoint]
+
+
+def _count(endpoint, name):
+    """Increments one of `endpoint`'s counters; callers race from executor threads and event loops."""
+    counters = _counters(endpoint)
+    with _STATE_LOCK:
+        counters[name] += 1
+
+
+def get_histogram(endpoint):
+    """Returns the latency histogram of `endpoint`, creating it on first use."""
+    if endpoint not in _HISTOGRAMS:
+        with _STATE_LOCK:
+            _HISTOGRAMS.setdefault(endpoint, LatencyHistogram())
+    return _HISTOGRAMS[endpoint]
+
+
+def get_circuit_breaker(endpoint):
+    """
+    Returns the circuit breaker of `endpoint`, or None if it has none.
+    On first use it is built from <ENDPOINT>_BREAKER_THRESHOLD / _RESET.
+    """
+    if endpoint not in _BREAKERS:
+        prefix = _env_prefix(endpoint)
+        threshold = os.getenv(f"{prefix}_BREAKER_THRESHOLD")
+        breaker = None
+        if threshold:
+            breaker = CircuitBreaker(int(threshold), float(os.getenv(f"{prefix}_BREAKER_RESET", "30")))
+        with _STATE_LOCK:
+            _BREAKERS.setdefault(endpoint, breaker)
+    return _BREAKERS[endpoint]
+
+
+def configure_circuit_breaker(endpoint, failure_threshold=5, reset_timeout=30.0):
+    """Installs a circuit breaker for `endpoint` and returns it."""
+    breaker = CircuitBreaker(failure_threshold, reset_timeout)
+    with _STATE_LOCK:
+        _BREAKERS[endpoint] = breaker
+    return breaker
+
+
+def configure_hedging(endpoint, quantile=0.95):
+    """Hedges calls to `endpoint` after its `quantile` latency; None disables hedging."""
+    with _STATE_LOCK:
+        _HEDGES[endpoint] = quantile
+
+
+def reset(endpoint=None):
+    """Forgets histograms, breakers, hedging settings and counters (of one endpoint or all)."""
+    with _STATE_LOCK:
+        for registry in (_HISTOGRAMS, _BREAKERS, _HEDGES, _COUNTERS):
+            if endpoint is None:
+                registry.clear()
+            else:
+                registry.pop(endpoint, None)
+
+
+def hedge_delay(endpoint):
+    """Seconds after which a call to `endpoint` is hedged, or None for no hedging."""
+    if endpoint not in _HEDGES:
+        quantile = os.getenv(f"{_env_prefix(endpoint)}_HEDGE_QUANTILE")
+        with _STATE_LOCK:
+            _HEDGES.setdefault(endpoint, float(quantile) if quantile else None)
+    quantile = _HEDGES[endpoint]
+    histogram = get_histogram(endpoint)
+    if quantile is None or histogram.count < HEDGE_MIN_SAMPLES:
+        return None
+    return max(HEDGE_MIN_DELAY, histogram.quantile(quantile))
+
+
+def latency_stats(endpoint):
+    """Latency summary, hedge counters and breaker state of `endpoint`."""
+    breaker = get_circuit_breaker(endpoint)
+    stats = dict(get_histogram(endpoint).summary())
+    counters = _counters(endpoint)
+    with _STATE_LOCK:
+        stats.update(counters)
+    stats["circuit"] = breaker.state if breaker is not None else None
+    return stats
+
+
+def is_failure(error):
+    """Whether `error` means the endpoint is degraded (as opposed to, e.g., a bad request or throttling)."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is None or getattr(response, "status_code", 500) >= 500
+    return isinstance(error, (requests.exceptions.RequestException, asyncio.TimeoutError, TimeoutError))
+
+
+def _may_hedge(endpoint):
+    limiter = get_rate_limiter(endpoint)
+    return limiter is None or limiter.try_acquire()
+
+
+def _executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _STATE_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedge")
+    return _EXECUTOR
+
+
+def _hedged(endpoint, fn, args, delay):
+    first = _executor().submit(fn, *args)
+    done, _ = wait([first], timeout=delay)
+    if done or not _may_hedge(endpoint):
+        return first.result()
+
+    _count(endpoint, "hedges")
+    pending = {first, _executor().submit(fn, *args)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is not first:
+                    _count(endpoint, "hedge_wins")
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+async def _ahedged(endpoint, make_call, delay):
+    first = asyncio.ensure_future(make_call())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done or not _may_hedge(endpoint):
+        return await first
+
+    _count(endpoint, "hedges")
+    pending = {first, asyncio.ensure_future(make_call())}
+    error = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                for other in pending:
+                    other.cancel()
+                if task is not first:
+                    _count(endpoint, "hedge_wins")
+                return task.result()
+            error = task.exception()
+    raise error
+
+
+def _admit(endpoint):
+    breaker = get_circuit_breaker(endpoint)
+    if breaker is not None and not breaker.allow():
+        _count(endpoint, "rejected")
+        raise CircuitOpenError(f"Circuit for {endpoint} is open; failing fast")
+    _count(endpoint, "calls")
+    return breaker
+
+
+def _settle(endpoint, breaker, started, error=None):
+    if error is not None and not isinstance(error, Exception):
+        # Cancelled or interrupted: neither a latency sample nor an outcome
+        if breaker is not None:
+            breaker.release()
+        return
+    get_histogram(endpoint).record(time.perf_counter() - started)
+    if breaker is None:
+        return
+    if error is not None and is_failure(error):
+        breaker.record_failure()
+    else:
+        # Any answer, even a 4xx, shows the endpoint is up
+        breaker.record_success()
+
+
+def call_guarded(endpoint, fn, *args):
+    """
+    Calls fn(*args) as one attempt against `endpoint`: fails fast with
+    CircuitOpenError if its circuit is open, hedges it if it runs past
+    the hedge delay, and records its latency and outcome.
+    """
+    breaker = _admit(endpoint)
+    delay = hedge_delay(endpoint)
+    started = time.perf_counter()
+    try:
+        result = fn(*args) if delay is None else _hedged(endpoint, fn, args, delay)
+    except BaseException as e:
+        _settle(endpoint, breaker, started, e)
+        raise
+    _settle(endpoint, breaker, started)
+    return result
+
+
+async def acall_guarded(endpoint, make_call):
+    """Async version of call_guarded; make_call() returns a fresh coroutine per attempt."""
+    breaker = _admit(endpoint)
+    delay = hedge_delay(endpoint)
+    started = time.perf_counter()
+    try:
+        result = await (make_call() if delay is None else _ahedged(endpoint, make_call, delay))
+    except BaseException as e:
+        _settle(endpoint, breaker, started, e)
+        raise
+    _settle(endpoint, breaker, started)
+    return result
@@ -0,0 +1,99 @@
+"""
+Single-Flight Request Deduplication
+===================================
+The cache only learns about a point once its response has arrived, so
+concurrent searches (tuning seeds, several methods on threads or
+coroutines) asking for the same cell at the same time would each go to
+the network. A SingleFlight table lets the first caller for a key do the
+work while everyone else arriving before it finishes waits for, and
+shares, its result (or its exception).
+
+Works across threads and event loops: every in-flight call is a
+concurrent.futures.Future, which threads wait on directly and coroutines
+through asyncio.wrap_future.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Table of in-flight calls keyed by any hashable key.
+
+    Attributes
+    ----------
+    leaders : int
+        Calls that did the work.
+    followers : int
+        Calls that shared another call's result instead.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def __len__(self):
+        return len(self._calls)
+
+    def _join(self, key):
+        """Returns (future, is_leader) for `key`, registering a new call if none is in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.followers += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _finish(self, key, future, result=None, error=None):
+        # Unregister before publishing: callers arriving later find the
+        # result in the cache instead of an already completed call
+        with self._lock:
+            del self._calls[key]
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def do(self, key, fn, *args):
+        """
+        Calls fn(*args) unless a call for `key` is already in flight, in
+        which case waits for that call instead.
+
+        Returns
+        -------
+        result
+            fn's return value (the leader's, for followers).
+        leader : bool
+            Whether this call did the work.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), False
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result, True
+
+    async def ado(self, key, make_call):
+        """Async version of do; make_call() returns the coroutine to await if this call leads."""
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future), False
+        try:
+            result = await make_call()
+        except BaseException as e:
+            # Includes cancellation, so followers never wait forever
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result, True
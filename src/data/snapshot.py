@@ -0,0 +1,171 @@
+"""
+Global Temperature Snapshot
+===========================
+Fills a regular lat/lng grid with current temperatures using
+multi-location Open-Meteo requests, stores it as a compact array on disk
+(snapshot.npz: float32 grid + fetch time) and interpolates it bilinearly.
+
+Inside a use_snapshot() block, the cache consults the snapshot for points
+it has no fresh observation of, so searches answer most queries locally.
+A snapshot stays usable for data_manager.SNAPSHOT_POLICY (six hours by
+default, SNAPSHOT_MAX_AGE_HOURS), independent of the per-point cache
+policy, so one prefetch serves several sweeps. The snapshot also gives a ground-truth field for regret metrics
+(see TemperatureSnapshot.global_max).
+
+Usage:
+    python -m src.data.snapshot --resolution 1.0
+"""
+
+import argparse
+import math
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from src.data import data_manager
+from src.data.weather_api import MAX_LOCATIONS_PER_REQUEST, _batch_params, _fill_batch, _get_forecast
+
+SNAPSHOT_FILE = os.path.join(os.path.dirname(__file__), "snapshot.npz")
+
+
+class TemperatureSnapshot:
+    """
+    Temperatures on a regular grid starting at (-90, -180) with
+    `resolution_deg` spacing (which should divide 360). Latitudes include
+    both poles; longitudes wrap around the antimeridian. Failed grid
+    points are NaN.
+
+    Parameters
+    ----------
+    temps : np.ndarray
+        (n_lat, n_lng) grid of temperatures.
+    resolution_deg : float
+        Grid spacing in degrees.
+    fetched_at : float
+        Unix time the grid was fetched.
+    """
+
+    def __init__(self, temps, resolution_deg, fetched_at):
+        self.temps = np.asarray(temps, dtype=np.float32)
+        self.resolution_deg = float(resolution_deg)
+        self.fetched_at = float(fetched_at)
+
+    @property
+    def lats(self):
+        return np.minimum(-90.0 + self.resolution_deg * np.arange(self.temps.shape[0]), 90.0)
+
+    @property
+    def lngs(self):
+        return -180.0 + self.resolution_deg * np.arange(self.temps.shape[1])
+
+    def lookup(self, lat, lng):
+        """
+        Bilinearly interpolated temperature at (lat, lng), or None if all
+        four surrounding grid points are missing. Missing corners are left
+        out and the remaining weights renormalized.
+        """
+        n_lat, n_lng = self.temps.shape
+        y = min(max((lat + 90.0) / self.resolution_deg, 0.0), n_lat - 1)
+        x = ((lng + 180.0) / self.resolution_deg) % n_lng
+        i, j = min(int(y), n_lat - 2), int(x)
+        dy, dx = y - i, x - j
+        j1 = (j + 1) % n_lng
+
+        corners = np.array([self.temps[i, j], self.temps[i, j1], self.temps[i + 1, j], self.temps[i + 1, j1]],
+                           dtype=np.float64)
+        weights = np.array([(1 - dy) * (1 - dx), (1 - dy) * dx, dy * (1 - dx), dy * dx])
+        valid = ~np.isnan(corners)
+        if not valid.any() or weights[valid].sum() == 0:
+            return None
+        return round(float(np.dot(corners[valid], weights[valid]) / weights[valid].sum()), 2)
+
+    def global_max(self):
+        """Returns (lat, lng, temp) of the hottest grid point."""
+        i, j = np.unravel_index(np.nanargmax(self.temps), self.temps.shape)
+        return float(self.lats[i]), float(self.lngs[j]), float(self.temps[i, j])
+
+    def save(self, path=None):
+        path = path or SNAPSHOT_FILE
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, temps=self.temps, resolution_deg=self.resolution_deg, fetched_at=self.fetched_at)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=None):
+        with np.load(path or SNAPSHOT_FILE) as data:
+            return cls(data["temps"], float(data["resolution_deg"]), float(data["fetched_at"]))
+
+
+def grid_points(resolution_deg):
+    """Returns the (lat, lng) pairs of a global grid in row-major order."""
+    n_lat = int(round(180.0 / resolution_deg)) + 1
+    n_lng = int(round(360.0 / resolution_deg))
+    lats = np.minimum(-90.0 + resolution_deg * np.arange(n_lat), 90.0)
+    lngs = -180.0 + resolution_deg * np.arange(n_lng)
+    return [(round(float(lat), 4), round(float(lng), 4)) for lat in lats for lng in lngs], (n_lat, n_lng)
+
+
+def prefetch_global_snapshot(resolution_deg=1.0, path=None, chunk_size=MAX_LOCATIONS_PER_REQUEST,
+                             retries=3, backoff_factor=1):
+    """
+    Fetches current temperatures on a global grid and saves the snapshot.
+
+    A 1 degree grid is 181 x 360 points, i.e. about 650 requests of 100
+    locations each.
+
+    Returns
+    -------
+    TemperatureSnapshot
+    """
+    points, shape = grid_points(resolution_deg)
+    temps = [None] * len(points)
+    n_chunks = math.ceil(len(points) / chunk_size)
+
+    for k, start in enumerate(range(0, len(points), chunk_size)):
+        chunk = list(range(start, min(start + chunk_size, len(points))))
+        data = _get_forecast(_batch_params(points, chunk), retries=retries, backoff_factor=backoff_factor)
+        _fill_batch(temps, chunk, data)
+        if (k + 1) % 50 == 0 or k + 1 == n_chunks:
+            print(f"Snapshot: {k + 1}/{n_chunks} requests done.")
+
+    grid = np.array([np.nan if t is None else t for t in temps], dtype=np.float32).reshape(shape)
+    # Stamped once complete, so a slow prefetch does not start out aged
+    snapshot = TemperatureSnapshot(grid, resolution_deg, time.time())
+    snapshot.save(path)
+    print(f"Saved {shape[0]}x{shape[1]} snapshot ({int(np.isnan(grid).sum())} missing) "
+          f"to {path or SNAPSHOT_FILE}")
+    return snapshot
+
+
+def load_snapshot(path=None):
+    """Loads the snapshot saved at `path`, or returns None if there is none."""
+    path = path or SNAPSHOT_FILE
+    if not os.path.isfile(path):
+        return None
+    return TemperatureSnapshot.load(path)
+
+
+@contextmanager
+def use_snapshot(path=None):
+    """
+    Loads the snapshot and lets the cache answer from it (while it is
+    fresh under data_manager.SNAPSHOT_POLICY) inside the block; the
+    previous snapshot is restored on exit. Yields the snapshot, or None if
+    missing.
+    """
+    snapshot = load_snapshot(path)
+    previous = data_manager.set_snapshot(snapshot)
+    try:
+        yield snapshot
+    finally:
+        data_manager.set_snapshot(previous)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prefetch a global grid of current temperatures.")
+    parser.add_argument("--resolution", type=float, default=1.0, help="Grid spacing in degrees.")
+    parser.add_argument("--output", default=SNAPSHOT_FILE)
+    args = parser.parse_args()
+    prefetch_global_snapshot(args.resolution, path=args.output)
@@ -0,0 +1,363 @@
+import math
+import threading
+
+import numpy as np
+
+# ==============================================================================
+# SPATIAL CACHE INDEX:
+# Buckets observations into fixed lat/lng cells so "nearest cached point
+# within X km" only inspects the handful of cells overlapping the search
+# radius instead of scanning every observation. Distances are great-circle
+# (haversine) distances on a spherical Earth.
+# ==============================================================================
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0   # ~111.2 km along a meridian
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    Great-circle distance in km between two (lat, lng) points in degrees.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def degrees_to_km(tolerance_deg):
+    """Converts an angular tolerance (degrees of arc) to km."""
+    return tolerance_deg * KM_PER_DEGREE
+
+
+class SphericalBucketIndex:
+    """
+    Incrementally updated nearest-neighbour index over cached observations.
+
+    Points sharing a 4-decimal (lat, lng) key are deduplicated; the most
+    recently observed value wins. Each entry carries its observation time
+    (Unix seconds, kept to the whole second) so queries can skip expired
+    entries, and an optional item id (e.g. the measurement id: a
+    16-character hex string, stored as its 64-bit value).
+
+    Entries live in parallel NumPy arrays rather than Python objects:
+    float32 coordinates and values (about 7 significant digits), int32
+    times, recency and chain links, a 64-bit id and key, plus an int32
+    open-addressing table. That is about 60-95 bytes per entry depending
+    on how full the arrays are, plus 4 MB of bucket heads at the default
+    cell size (about 100 bytes per entry in total at 300k entries).
+
+    Safe to share between threads: every method holds `lock`. Callers that
+    read the arrays after nearest() should hold it too, since a concurrent
+    add() may grow or evict (and so renumber) the entries.
+
+    Parameters
+    ----------
+    cell_deg : float
+        Bucket size in degrees. Queries touch roughly
+        (2 * radius / cell_size + 1)^2 buckets.
+    max_entries : int, optional
+        Size bound. When full, the least recently used tenth of the entries
+        (by insertion or query hit) is evicted.
+    """
+
+    def __init__(self, cell_deg=0.25, max_entries=None):
+        self.cell_deg = cell_deg
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.lock = threading.RLock()
+        self._n_lat_cells = int(math.ceil(180.0 / cell_deg)) + 1
+        self._n_lng_cells = int(math.ceil(360.0 / cell_deg))
+        self._size = 0
+        self._clock = 0
+        self._allocate(16)
+        self._heads = None      # cell -> first slot in its chain (-1 if empty)
+        self._table_bits = 5
+        self._table = np.full(1 << self._table_bits, _EMPTY, dtype=np.int32)    # -> slot
+
+    def __len__(self):
+        with self.lock:
+            return self._size
+
+    # Views over the filled part of the arrays, indexable by slot
+    @property
+    def lats(self):
+        return self._lats[:self._size]
+
+    @property
+    def lngs(self):
+        return self._lngs[:self._size]
+
+    @property
+    def values(self):
+        return self._values[:self._size]
+
+    @property
+    def times(self):
+        """Observation times in Unix seconds (a float64 copy)."""
+        return self._times[:self._size] + float(_TIME_EPOCH)
+
+    def item_id(self, slot):
+        """Returns the item id stored at `slot` (None if it has none)."""
+        with self.lock:
+            return _decode_id(self._ids[slot])
+
+    def entry(self, slot):
+        """
+        Returns (value, observed_at, item_id) of `slot`, with the value
+        converted back to the shortest decimal that rounds to it in float32
+        (so 22.9 is returned as 22.9, not 22.899999618530273).
+        """
+        with self.lock:
+            return (float(str(self._values[slot])), float(self._times[slot]) + _TIME_EPOCH,
+                    _decode_id(self._ids[slot]))
+
+    def _allocate(self, capacity):
+        """Grows (or creates) the per-entry arrays to `capacity`."""
+        old = self._size
+        arrays = {
+            "_lats": np.float32, "_lngs": np.float32, "_values": np.float32,
+            "_times": np.int32, "_ids": np.uint64, "_used": np.int32,
+            "_keys": np.int64, "_next": np.int32,
+        }
+        for name, dtype in arrays.items():
+            grown = np.zeros(capacity, dtype=dtype)
+            if old:
+                grown[:old] = getattr(self, name)[:old]
+            setattr(self, name, grown)
+
+    # -- packed key table ------------------------------------------------------
+
+    def _find(self, key):
+        """Returns the table position holding `key`'s slot, or the empty one where it would go."""
+        mask = len(self._table) - 1
+        pos = ((key * _HASH_MULTIPLIER) & _MASK64) >> (64 - self._table_bits)
+        while True:
+            slot = self._table[pos]
+            if slot == _EMPTY or self._keys[slot] == key:
+                return pos
+            pos = (pos + 1) & mask
+
+    def _lookup(self, lat, lng):
+        slot = self._table[self._find(_pack_key(lat, lng))]
+        return None if slot == _EMPTY else int(slot)
+
+    def _rebuild_table(self, bits):
+        self._table_bits = bits
+        self._table = np.full(1 << bits, _EMPTY, dtype=np.int32)
+        for slot in range(self._size):
+            self._table[self._find(int(self._keys[slot]))] = slot
+
+    # -- buckets -------------------------------------------------------------
+
+    def _cell(self, lat, lng):
+        lat_cell = int(math.floor((lat + 90.0) / self.cell_deg))
+        lng_cell = int(math.floor((lng + 180.0) / self.cell_deg)) % self._n_lng_cells
+        return lat_cell * self._n_lng_cells + lng_cell
+
+    def _link(self, slot):
+        if self._heads is None:
+            self._heads = np.full(self._n_lat_cells * self._n_lng_cells, -1, dtype=np.int32)
+        cell = self._cell(self._lats[slot], self._lngs[slot])
+        self._next[slot] = self._heads[cell]
+        self._heads[cell] = slot
+
+    # -- public API ----------------------------------------------------------
+
+    def add(self, lat, lng, value, observed_at=0.0, item_id=None):
+        """Inserts the observation at (lat, lng), replacing an older one."""
+        with self.lock:
+            key = _pack_key(lat, lng)
+            offset = _encode_time(observed_at)
+            encoded_id = _encode_id(item_id)
+            pos = self._find(key)
+            if self._table[pos] != _EMPTY:
+                slot = self._table[pos]
+                if offset >= self._times[slot]:
+                    self._values[slot] = value
+                    self._times[slot] = offset
+                    self._ids[slot] = encoded_id
+                self._touch(slot)
+                return
+
+            if self.max_entries is not None and self._size >= self.max_entries:
+                self.evict(max(1, self.max_entries - self.max_entries // 10))
+                pos = self._find(key)
+            if self._size == len(self._lats):
+                self._allocate(2 * len(self._lats))
+
+            slot = self._size
+            self._size += 1
+            self._lats[slot] = lat
+            self._lngs[slot] = lng
+            self._values[slot] = value
+            self._times[slot] = offset
+            self._ids[slot] = encoded_id
+            self._keys[slot] = key
+            self._touch(slot)
+            self._table[pos] = slot
+            self._link(slot)
+            if 2 * self._size > len(self._table):
+                # Keep the key table at most half full so probe runs stay short
+                self._rebuild_table(self._table_bits + 1)
+
+    def get(self, lat, lng):
+        """Exact 4-decimal key lookup. Returns the value or None."""
+        with self.lock:
+            slot = self._lookup(lat, lng)
+            if slot is None:
+                return None
+            self._touch(slot)
+            return float(self._values[slot])
+
+    def nearest(self, lat, lng, radius_km, min_time=None):
+        """
+        Finds the closest observation within `radius_km` of (lat, lng),
+        ignoring entries observed before `min_time` if given.
+
+        Returns
+        -------
+        (slot, distance_km) or None
+            Read the entry via self.values[slot], self.times[slot], ...
+        """
+        with self.lock:
+            if min_time is not None:
+                min_time -= _TIME_EPOCH
+            exact = self._lookup(lat, lng)
+            if exact is not None and (min_time is None or self._times[exact] >= min_time):
+                self._touch(exact)
+                return exact, haversine_km(lat, lng, float(self._lats[exact]), float(self._lngs[exact]))
+            if radius_km <= 0 or not self._size:
+                return None
+
+            slots = np.fromiter(self._candidates(lat, lng, radius_km), dtype=np.int64)
+            if min_time is not None and len(slots):
+                slots = slots[self._times[slots] >= min_time]
+            if not len(slots):
+                return None
+
+            if len(slots) <= 16:
+                # Typical small radius query: NumPy call overhead would dominate
+                dists = [haversine_km(lat, lng, a, b)
+                         for a, b in zip(self._lats[slots].tolist(), self._lngs[slots].tolist())]
+                best = min(range(len(dists)), key=dists.__getitem__)
+            else:
+                dists = _haversine_km_array(lat, lng, self._lats[slots], self._lngs[slots])
+                best = int(np.argmin(dists))
+            if dists[best] > radius_km:
+                return None
+            slot = int(slots[best])
+            self._touch(slot)
+            return slot, float(dists[best])
+
+    def evict(self, keep):
+        """Drops all but the `keep` most recently used entries."""
+        with self.lock:
+            if self._size <= keep:
+                return
+            if keep <= 0:
+                self.evictions += self._size
+                self._size = 0
+                self._heads = None
+                self._rebuild_table(self._table_bits)
+                return
+            survivors = np.sort(np.argpartition(self._used[:self._size], self._size - keep)[self._size - keep:])
+            self.evictions += self._size - keep
+            for name in ("_lats", "_lngs", "_values", "_times", "_ids", "_used", "_keys"):
+                array = getattr(self, name)
+                array[:keep] = array[survivors]
+            self._size = keep
+
+            self._heads = None
+            for slot in range(keep):
+                self._link(slot)
+            self._rebuild_table(self._table_bits)
+
+    def stats(self):
+        """Returns the entry count, size bound and eviction count."""
+        with self.lock:
+            return {"entries": self._size, "max_entries": self.max_entries, "evictions": self.evictions}
+
+    def _touch(self, slot):
+        if self._clock == _MAX_CLOCK:
+            # Renumbers the recency stamps 1..n, keeping their order
+            order = np.argsort(self._used[:self._size], kind="stable")
+            self._used[order] = np.arange(1, self._size + 1, dtype=np.int32)
+            self._clock = self._size
+        self._clock += 1
+        self._used[slot] = self._clock
+
+    def _candidates(self, lat, lng, radius_km):
+        """Yields slots in every bucket that may lie within the radius."""
+        dlat = radius_km / KM_PER_DEGREE
+        lat_lo = max(-90.0, lat - dlat)
+        lat_hi = min(90.0, lat + dlat)
+
+        # Meridians converge towards the poles: the longitude half-width of a
+        # spherical cap is asin(sin(r) / cos(lat)), unbounded if it reaches a pole.
+        ratio = 0.0
+        if lat_lo > -90.0 and lat_hi < 90.0:
+            ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))
+        if ratio <= 0.0 or ratio >= 1.0:
+            lng_cells = range(self._n_lng_cells)
+        else:
+            dlng = math.degrees(math.asin(ratio))
+            first = int(math.floor((lng - dlng + 180.0) / self.cell_deg))
+            last = int(math.floor((lng + dlng + 180.0) / self.cell_deg))
+            lng_cells = {c % self._n_lng_cells for c in range(first, last + 1)}
+
+        heads, chain = self._heads, self._next
+        lat_first = int(math.floor((lat_lo + 90.0) / self.cell_deg))
+        lat_last = int(math.floor((lat_hi + 90.0) / self.cell_deg))
+        for lat_cell in range(lat_first, lat_last + 1):
+            row = lat_cell * self._n_lng_cells
+            for lng_cell in lng_cells:
+                slot = heads[row + lng_cell]
+                while slot >= 0:
+                    yield slot
+                    slot = chain[slot]
+
+
+# Packed (4-decimal lat, 4-decimal lng) keys for the open-addressing table
+_EMPTY = -1
+_LNG_SPAN = 4_000_001                   # quantized longitudes in [-2e6, 2e6]
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15   # Fibonacci hashing
+_MASK64 = (1 << 64) - 1
+
+# Times are stored as int32 seconds since 2020-01-01 (covers 1952-2088)
+_TIME_EPOCH = 1_577_836_800
+_MAX_CLOCK = 2 ** 31 - 1
+
+
+def _pack_key(lat, lng):
+    return (int(round(lat * 10_000)) + 1_000_000) * _LNG_SPAN + int(round(lng * 10_000)) + 2_000_000
+
+
+def _encode_time(observed_at):
+    return int(round(observed_at)) - _TIME_EPOCH
+
+
+def _encode_id(item_id):
+    """Packs a 16-character hex id into its 64-bit value (0 stands for no id)."""
+    if not item_id:
+        return 0
+    try:
+        packed = bytes.fromhex(item_id)
+    except ValueError:
+        packed = b""
+    if len(item_id) != 16 or len(packed) != 8:
+        raise ValueError(f"Item ids must be 16-character hex strings: {item_id!r}")
+    return int.from_bytes(packed, "big")
+
+
+def _decode_id(value):
+    return f"{int(value):016x}" if value else None
+
+
+def _haversine_km_array(lat, lng, lats, lngs):
+    """Vectorized haversine_km from one point to arrays of points."""
+    phi1, phi2 = math.radians(lat), np.radians(lats)
+    dlmb = np.radians(lngs - lng)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
@@ -0,0 +1,694 @@
+import argparse
+import atexit
+import csv
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from src.data.file_lock import file_lock
+
+# ==============================================================================
+# RESULTS STORAGE BACKENDS:
+# data_manager writes and reads observations through a backend object.
+#   - CSVBackend:    the original append-only results.csv (default).
+#   - SQLiteBackend: indexed SQLite database in WAL mode; safe for several
+#                    concurrent writer processes and fast filtered reads.
+# Each backend keeps two stores:
+#   - the visit log (results): one row per point a search visited, in order,
+#     used for run traces, playback and evaluation. Rows are dicts with the
+#     keys in VISIT_FIELDS: RESULT_FIELDS plus "run_id", "measurement_id"
+#     and "source" (api, cache or snapshot; snapshot visits have no
+#     measurement). Missing optional values read back as None.
+#   - the measurement table: one row per actual API observation, with a
+#     unique id. It is what backs the cache; revisits (cache hits) only add
+#     visit rows that reference an existing measurement.
+# BufferedResultWriter can sit in front of either backend to batch writes.
+# Both backends are safe for several processes: CSV appends hold an advisory
+# file lock, SQLite relies on its own locking. read_measurements_since()
+# and read_results_since() let a process pick up rows appended by others
+# incrementally, at a cost proportional to the new rows only.
+# ==============================================================================
+
+RESULT_FIELDS = ["timestamp", "lat", "lng", "temp", "search_method"]
+TRACE_FIELDS = ["run_id", "measurement_id", "source"]
+VISIT_FIELDS = RESULT_FIELDS + TRACE_FIELDS
+MEASUREMENT_FIELDS = ["id", "timestamp", "lat", "lng", "temp"]
+
+# Storage layout version; 1 = visit log and measurement table separated,
+# 2 = the CSV visit log also stores TRACE_FIELDS
+SCHEMA_VERSION = 2
+
+# Coordinates are quantized to 4 decimals (~11 m) for cache keys and indexes
+COORD_SCALE = 10_000
+
+
+def quantize(value):
+    """Maps a coordinate in degrees to its integer 4-decimal bucket."""
+    return int(round(value * COORD_SCALE))
+
+
+def new_measurement_id():
+    """Returns a unique measurement id (safe to generate in any process)."""
+    return uuid.uuid4().hex[:16]
+
+
+def deduplicate_measurements(rows, known=()):
+    """
+    Rebuilds a measurement table from a legacy visit log, where cache hits
+    were re-appended as copies of the original observation. Keeps the first
+    row for each (4-decimal cell, temperature) and tags every visit row
+    with the id of the measurement it refers to (in place).
+
+    Rows matching one of the `known` measurements (already in the table)
+    are tagged with its id instead of producing a new measurement.
+
+    Returns
+    -------
+    measurements : list[dict]
+        The new measurements only.
+    """
+    measurements = []
+    ids = _measurement_ids(known)
+    for row in rows:
+        try:
+            lat, lng, temp = float(row["lat"]), float(row["lng"]), float(row["temp"])
+        except (ValueError, KeyError, TypeError):
+            continue
+        key = (quantize(lat), quantize(lng), temp)
+        if key not in ids:
+            ids[key] = new_measurement_id()
+            measurements.append({"id": ids[key], "timestamp": row["timestamp"],
+                                 "lat": lat, "lng": lng, "temp": temp})
+        row["measurement_id"] = ids[key]
+    return measurements
+
+
+def _measurement_ids(measurements):
+    """Maps (4-decimal cell, temperature) to the id of the first matching measurement."""
+    ids = {}
+    for row in measurements:
+        try:
+            ids.setdefault((quantize(float(row["lat"])), quantize(float(row["lng"])), float(row["temp"])), row["id"])
+        except (ValueError, KeyError, TypeError):
+            continue
+    return ids
+
+
+def _tag_known_measurements(rows, known):
+    """Tags visit rows (in place) with the id of the known measurement they match, if any."""
+    ids = _measurement_ids(known)
+    for row in rows:
+        try:
+            key = (quantize(float(row["lat"])), quantize(float(row["lng"])), float(row["temp"]))
+        except (ValueError, KeyError, TypeError):
+            continue
+        if key in ids:
+            row["measurement_id"] = ids[key]
+
+
+# Measurement tables (absolute paths) known to be migrated in this process
+_MIGRATED = set()
+
+
+class CSVBackend:
+    """
+    Append-only CSV files: the visit log at `path` (the standard results
+    columns followed by TRACE_FIELDS, so readers that pick columns by name
+    are unaffected), and the measurement table next to it
+    (results.csv -> results.measurements.csv).
+
+    Files written by older versions are migrated before the first read or
+    write: legacy visit log rows get measurements, and a visit log with
+    the five legacy columns is rewritten with the trace columns (its
+    visits tagged with the measurement they match; run_id and source stay
+    empty). A version file next to the measurement table
+    (results.measurements.csv.version) records that this has happened.
+    """
+
+    def __init__(self, path, measurements_path=None):
+        self.path = path
+        self.measurements_path = measurements_path or os.path.splitext(path)[0] + ".measurements.csv"
+        self.version_path = self.measurements_path + ".version"
+
+    def _migrate(self):
+        """
+        Brings files written by older versions up to SCHEMA_VERSION (once
+        per table, across processes): adds measurements for the visit log
+        rows written before the measurement table existed, and rewrites a
+        legacy visit log with the trace columns.
+        """
+        if os.path.abspath(self.measurements_path) in _MIGRATED:
+            return
+        with file_lock(self.measurements_path):
+            version = _read_version(self.version_path)
+            if version < SCHEMA_VERSION:
+                with file_lock(self.path):
+                    visits = read_csv(self.path)
+                    untagged = [v for v in visits if not v.get("measurement_id")]
+                    known = read_csv(self.measurements_path)
+                    if version < 1:
+                        # Rows already in the table (written before this check
+                        # existed) are matched rather than duplicated
+                        legacy = deduplicate_measurements(untagged, known=known)
+                        if legacy:
+                            _append_csv(self.measurements_path, MEASUREMENT_FIELDS, legacy, lock=False)
+                    else:
+                        # The table is complete: visits matching none of it
+                        # (snapshot interpolations) keep no measurement
+                        _tag_known_measurements(untagged, known)
+                    if os.path.isfile(self.path) and _read_header(self.path) != VISIT_FIELDS:
+                        # Replaced atomically; the lock lives in a sidecar file, so it still applies
+                        tmp = self.path + ".tmp"
+                        write_csv(tmp, visits, fields=VISIT_FIELDS)
+                        os.replace(tmp, self.path)
+                with open(self.version_path, "w") as f:
+                    f.write(f"{SCHEMA_VERSION}\n")
+        _MIGRATED.add(os.path.abspath(self.measurements_path))
+
+    def append(self, rows, fsync=False):
+        self._migrate()
+        _append_csv(self.path, VISIT_FIELDS, rows, fsync=fsync)
+
+    def load(self, search_method=None, run_id=None):
+        """Returns visit log rows in order, optionally filtered by method or run id."""
+        self._migrate()
+        if not os.path.isfile(self.path):
+            return []
+
+        results = []
+        with file_lock(self.path, shared=True), open(self.path, mode='r') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                row = _visit(row)
+                if search_method is not None and row.get("search_method") != search_method:
+                    continue
+                if run_id is not None and row["run_id"] != run_id:
+                    continue
+                results.append(row)
+        return results
+
+    def append_measurements(self, rows, fsync=False):
+        self._migrate()
+        _append_csv(self.measurements_path, MEASUREMENT_FIELDS, rows, fsync=fsync)
+
+    def load_measurements(self):
+        """
+        Loads the measurement table, building it from the visit log the
+        first time (for logs written before the two were separated).
+        """
+        self._migrate()
+        with file_lock(self.measurements_path, shared=True):
+            return read_csv(self.measurements_path)
+
+    def read_measurements_since(self, offset=0):
+        """
+        Reads the measurements appended after byte `offset`.
+
+        Returns
+        -------
+        rows : list[dict]
+        offset : int
+            Pass this to the next call to continue where this one stopped.
+        """
+        self._migrate()
+        if not os.path.isfile(self.measurements_path):
+            return [], 0
+        return _read_csv_since(self.measurements_path, MEASUREMENT_FIELDS, offset)
+
+    def read_results_since(self, offset=0):
+        """
+        Reads the visit log rows appended after byte `offset`.
+
+        Returns
+        -------
+        rows : list[dict]
+        offset : int
+            Pass this to the next call to continue where this one stopped.
+        """
+        self._migrate()
+        if not os.path.isfile(self.path):
+            return [], 0
+        rows, offset = _read_csv_since(self.path, VISIT_FIELDS, offset)
+        return [_visit(row) for row in rows], offset
+
+    def export_csv(self, path):
+        write_csv(path, self.load(), fields=VISIT_FIELDS)
+
+    def import_csv(self, path):
+        visits, measurements = _import_rows(path, known=self.load_measurements())
+        self.append_measurements(measurements)
+        self.append(visits)
+        return len(visits)
+
+
+class SQLiteBackend:
+    """
+    SQLite observation store in WAL mode.
+
+    Indexed on the quantized (lat, lng) cell, timestamp, search_method and
+    run_id so cache lookups and report filters avoid full scans. Each
+    thread gets its own connection; WAL lets readers proceed while another
+    process is writing.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            id            INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp     TEXT NOT NULL,
+            lat           REAL NOT NULL,
+            lng           REAL NOT NULL,
+            qlat          INTEGER NOT NULL,
+            qlng          INTEGER NOT NULL,
+            temp          REAL NOT NULL,
+            search_method TEXT NOT NULL,
+            run_id        TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_results_cell ON results (qlat, qlng);
+        CREATE INDEX IF NOT EXISTS idx_results_timestamp ON results (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_results_method ON results (search_method);
+        CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+        CREATE TABLE IF NOT EXISTS measurements (
+            id            TEXT PRIMARY KEY,
+            timestamp     TEXT NOT NULL,
+            lat           REAL NOT NULL,
+            lng           REAL NOT NULL,
+            qlat          INTEGER NOT NULL,
+            qlng          INTEGER NOT NULL,
+            temp          REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_measurements_cell ON measurements (qlat, qlng);
+        CREATE INDEX IF NOT EXISTS idx_measurements_timestamp ON measurements (timestamp);
+    """
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(results)")]
+        if "measurement_id" not in columns:
+            # Databases created before visits referenced measurements
+            with conn:
+                conn.execute("ALTER TABLE results ADD COLUMN measurement_id TEXT")
+        if "source" not in columns:
+            # Databases created before visits recorded where their value came from
+            with conn:
+                conn.execute("ALTER TABLE results ADD COLUMN source TEXT")
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._migrate(conn)
+
+    def _migrate(self, conn):
+        """
+        Adds measurements for the visits logged before the measurement
+        table existed (those without a measurement_id, in a database older
+        than version 1), then records SCHEMA_VERSION in the database's
+        user_version. Later versions change nothing in SQLite.
+        """
+        # IMMEDIATE takes the write lock up front, so concurrent processes
+        # opening the same database migrate it only once
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version < 1:
+                    visits = [dict(row) for row in conn.execute(
+                        "SELECT id AS rowid_, * FROM results WHERE measurement_id IS NULL ORDER BY id")]
+                    known = [dict(row) for row in conn.execute("SELECT id, lat, lng, temp FROM measurements")]
+                    measurements = deduplicate_measurements(visits, known=known)
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO measurements (id, timestamp, lat, lng, qlat, qlng, temp) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [(m["id"], m["timestamp"], m["lat"], m["lng"], quantize(m["lat"]), quantize(m["lng"]),
+                          m["temp"]) for m in measurements])
+                    conn.executemany("UPDATE results SET measurement_id = ? WHERE id = ?",
+                                     [(row["measurement_id"], row["rowid_"]) for row in visits
+                                      if "measurement_id" in row])
+                if version < SCHEMA_VERSION:
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.isolation_level = ""
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _insert(self, sql, records, fsync):
+        conn = self._connect()
+        if fsync:
+            # FULL syncs the WAL on every commit, surviving power loss
+            conn.execute("PRAGMA synchronous=FULL")
+        try:
+            with conn:
+                conn.executemany(sql, records)
+        finally:
+            if fsync:
+                conn.execute("PRAGMA synchronous=NORMAL")
+
+    def append(self, rows, fsync=False):
+        records = [
+            (row["timestamp"], float(row["lat"]), float(row["lng"]),
+             quantize(float(row["lat"])), quantize(float(row["lng"])),
+             float(row["temp"]), row["search_method"], row.get("run_id"), row.get("measurement_id"),
+             row.get("source"))
+            for row in rows
+        ]
+        self._insert(
+            "INSERT INTO results (timestamp, lat, lng, qlat, qlng, temp, search_method, run_id, measurement_id, "
+            "source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            records, fsync,
+        )
+
+    def append_measurements(self, rows, fsync=False):
+        records = [
+            (row["id"], row["timestamp"], float(row["lat"]), float(row["lng"]),
+             quantize(float(row["lat"])), quantize(float(row["lng"])), float(row["temp"]))
+            for row in rows
+        ]
+        self._insert(
+            "INSERT OR IGNORE INTO measurements (id, timestamp, lat, lng, qlat, qlng, temp) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            records, fsync,
+        )
+
+    def load_measurements(self):
+        """
+        Loads the measurement table. Visits logged before it existed were
+        migrated into it when the database was opened.
+        """
+        cursor = self._connect().execute("SELECT id, timestamp, lat, lng, temp FROM measurements ORDER BY rowid")
+        return [dict(row) for row in cursor]
+
+    def read_measurements_since(self, offset=0):
+        """
+        Reads the measurements inserted after rowid `offset`.
+
+        Returns
+        -------
+        rows : list[dict]
+        offset : int
+            Pass this to the next call to continue where this one stopped.
+        """
+        cursor = self._connect().execute(
+            "SELECT rowid, id, timestamp, lat, lng, temp FROM measurements WHERE rowid > ? ORDER BY rowid",
+            (offset,))
+        rows = [dict(row) for row in cursor]
+        if rows:
+            offset = rows[-1].pop("rowid")
+            for row in rows[:-1]:
+                del row["rowid"]
+        return rows, offset
+
+    def read_results_since(self, offset=0):
+        """
+        Reads the visit log rows inserted after id `offset`.
+
+        Returns
+        -------
+        rows : list[dict]
+        offset : int
+            Pass this to the next call to continue where this one stopped.
+        """
+        cursor = self._connect().execute(
+            "SELECT id, timestamp, lat, lng, temp, search_method, run_id, measurement_id, source "
+            "FROM results WHERE id > ? ORDER BY id", (offset,))
+        rows = [dict(row) for row in cursor]
+        if rows:
+            offset = rows[-1]["id"]
+        for row in rows:
+            del row["id"]
+        return rows, offset
+
+    def load(self, search_method=None, run_id=None, since=None):
+        """
+        Returns rows in insertion order, optionally filtered by method,
+        run id, or a minimum ISO timestamp.
+        """
+        clauses, args = [], []
+        if search_method is not None:
+            clauses.append("search_method = ?")
+            args.append(search_method)
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            args.append(run_id)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            args.append(since)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        cursor = self._connect().execute(
+            f"SELECT timestamp, lat, lng, temp, search_method, run_id, measurement_id, source "
+            f"FROM results{where} ORDER BY id", args)
+        return [dict(row) for row in cursor]
+
+    def lookup(self, lat, lng):
+        """
+        Returns the most recent temperature measured in the same 4-decimal
+        cell as (lat, lng), or None. Uses the cell index.
+        """
+        row = self._connect().execute(
+            "SELECT temp FROM measurements WHERE qlat = ? AND qlng = ? ORDER BY timestamp DESC LIMIT 1",
+            (quantize(lat), quantize(lng)),
+        ).fetchone()
+        return None if row is None else row["temp"]
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def export_csv(self, path):
+        write_csv(path, self.load(), fields=VISIT_FIELDS)
+
+    def import_csv(self, path):
+        visits, measurements = _import_rows(path, known=self.load_measurements())
+        self.append_measurements(measurements)
+        self.append(visits)
+        return len(visits)
+
+
+class BufferedResultWriter:
+    """
+    Write-behind buffer in front of a storage backend.
+
+    Rows are kept in memory and written in one batch once `max_rows` are
+    pending, once the oldest pending row is `max_delay` seconds old (a
+    background timer enforces this even when no more rows arrive), on
+    flush()/close(), and at interpreter exit. Safe to share between
+    threads.
+
+    Parameters
+    ----------
+    backend : CSVBackend or SQLiteBackend
+        Destination of the rows.
+    max_rows : int
+        Size threshold that triggers a flush.
+    max_delay : float or None
+        Time threshold in seconds; None disables time-based flushing.
+    fsync : bool
+        Force each flushed batch to stable storage.
+    """
+
+    def __init__(self, backend, max_rows=500, max_delay=5.0, fsync=False):
+        self.backend = backend
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self._rows = []
+        self._measurements = []
+        self._first_pending = None
+        self._timer = None
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+
+    def __len__(self):
+        return len(self._rows) + len(self._measurements)
+
+    def append(self, rows):
+        """Buffers visit-log rows."""
+        self._buffer(self._rows, rows)
+
+    def append_measurements(self, rows):
+        """Buffers measurement rows."""
+        self._buffer(self._measurements, rows)
+
+    def pending_measurements(self):
+        """Returns a copy of the measurement rows not yet written."""
+        with self._lock:
+            return list(self._measurements)
+
+    def _buffer(self, pending, rows):
+        with self._lock:
+            if len(self) == 0:
+                self._first_pending = time.monotonic()
+            pending.extend(rows)
+
+            if len(self) >= self.max_rows:
+                self.flush()
+            elif self.max_delay is not None:
+                if time.monotonic() - self._first_pending >= self.max_delay:
+                    self.flush()
+                elif self._timer is None:
+                    self._timer = threading.Timer(self.max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+    def flush(self):
+        """Writes all pending rows to the backend."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if len(self) == 0:
+                return
+            rows, self._rows = self._rows, []
+            measurements, self._measurements = self._measurements, []
+            self._first_pending = None
+            # Measurements first, so visits never reference a missing id
+            if measurements:
+                self.backend.append_measurements(measurements, fsync=self.fsync)
+            if rows:
+                self.backend.append(rows, fsync=self.fsync)
+
+    def close(self):
+        """Flushes and stops flushing at exit."""
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+def _append_csv(path, fields, rows, fsync=False, lock=True):
+    """
+    Appends dict rows to a CSV file, writing the header if it is new.
+    Holds an exclusive file lock unless the caller already does.
+    """
+    if lock:
+        with file_lock(path):
+            _append_csv(path, fields, rows, fsync=fsync, lock=False)
+        return
+
+    file_exists = os.path.isfile(path)
+
+    with open(path, mode='a', newline='') as f:
+        writer = csv.writer(f)
+        # Write header if file is new
+        if not file_exists:
+            writer.writerow(fields)
+        for row in rows:
+            writer.writerow([row.get(field) for field in fields])
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _read_csv_since(path, fields, offset):
+    """
+    Reads the rows appended to a CSV file after byte `offset`.
+
+    Only complete lines are consumed, so a row being written by another
+    process is picked up on the next call instead of half-parsed. If the
+    file shrank (it was replaced or truncated) reading starts over.
+    """
+    with file_lock(path, shared=True), open(path, mode='rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < offset:
+            offset = 0
+        if size == offset:
+            return [], offset
+        f.seek(offset)
+        data = f.read()
+
+    end = data.rfind(b"\n") + 1
+    lines = data[:end].decode("utf-8").splitlines()
+    if offset == 0:
+        lines = lines[1:]   # header
+    rows = [dict(zip(fields, values)) for values in csv.reader(lines) if values]
+    return rows, offset + end
+
+
+def _read_version(path):
+    """Reads a storage version file; 0 if there is none."""
+    try:
+        with open(path) as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def _import_rows(path, known):
+    """
+    Reads a results CSV for import_csv, skipping malformed rows. Returns
+    the visits, each tagged with its measurement, and the measurements
+    not among the `known` ones (so re-importing adds none). Snapshot
+    visits keep no measurement.
+    """
+    visits = []
+    for row in read_csv(path):
+        try:
+            float(row["lat"]), float(row["lng"]), float(row["temp"])
+        except (ValueError, KeyError, TypeError):
+            continue
+        visits.append(_visit(row))
+    measured = [v for v in visits if v["source"] != "snapshot"]
+    return visits, deduplicate_measurements(measured, known=known)
+
+
+def _read_header(path):
+    with open(path, mode='r', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def _visit(row):
+    """Normalizes a visit read from CSV: trace fields that are missing or empty become None."""
+    for field in TRACE_FIELDS:
+        row[field] = row.get(field) or None
+    return row
+
+
+def read_csv(path):
+    """Reads a results CSV into a list of dicts (string values)."""
+    if not os.path.isfile(path):
+        return []
+    with open(path, mode='r') as f:
+        return list(csv.DictReader(f))
+
+
+def write_csv(path, rows, fields=RESULT_FIELDS):
+    """Writes rows to a results CSV with the given header (the standard results columns by default)."""
+    with open(path, mode='w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([row.get(field) for field in fields])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert between results.csv and the SQLite store.")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("csv_path")
+    parser.add_argument("db_path")
+    args = parser.parse_args()
+
+    db = SQLiteBackend(args.db_path)
+    if args.command == "import":
+        n = db.import_csv(args.csv_path)
+        print(f"Imported {n} rows into {args.db_path}")
+    else:
+        db.export_csv(args.csv_path)
+        print(f"Exported {db.count()} rows to {args.csv_path}")
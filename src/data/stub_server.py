@@ -0,0 +1,207 @@
+"""
+Local Open-Meteo Stub Server
+============================
+A small threaded HTTP server implementing the part of the Open-Meteo
+/v1/forecast API we use (single and multi-location
+current=temperature_2m), answered from a temperature field instead of the
+real model. Point the client at it with fetch_temperature(...,
+base_url=server.base_url) or OPEN_METEO_BASE_URL to load-test the real
+code path (pooling, retries, backoff) at high concurrency on one machine.
+
+Knobs:
+  - latency:    seconds added to every response (plus uniform jitter)
+  - error_rate: fraction of requests answered with HTTP 500
+  - rate_limit: requests per second (token bucket, burst of one second);
+                excess requests get HTTP 429 with a Retry-After header
+
+Usage:
+    python -m src.data.stub_server --port 8080 --latency 0.05 --rate-limit 600
+    OPEN_METEO_BASE_URL=http://127.0.0.1:8080 python -m src.models.random_search
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.data.weather_api import FORECAST_PATH
+
+
+class _ForecastHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so client pooling is exercised
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def do_GET(self):
+        status, payload, headers = self.server.stub.handle(self.path)
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass    # one line per request would swamp load tests
+
+
+class StubServer:
+    """
+    Open-Meteo-compatible forecast server backed by `field`.
+
+    Parameters
+    ----------
+    field : callable
+        field(lat, lng) -> temperature or None, e.g. a SyntheticObjective
+        or SnapshotObjective from src/models/objectives.py.
+    host, port : str, int
+        Address to bind; port 0 picks a free port (see base_url).
+    latency : float
+        Seconds to wait before answering.
+    jitter : float
+        Up to this many extra seconds of uniformly random latency.
+    error_rate : float
+        Probability of answering a request with HTTP 500.
+    rate_limit : float or None
+        Requests per second accepted before answering HTTP 429.
+    seed : int or None
+        Seeds the error and jitter draws.
+    """
+
+    def __init__(self, field, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate_limit=None, seed=None):
+        self.field = field
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.stats = {"requests": 0, "locations": 0, "errors": 0, "throttled": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = rate_limit or 0.0
+        self._refilled_at = time.monotonic()
+
+        self._httpd = ThreadingHTTPServer((host, port), _ForecastHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        """Serves requests on the calling thread until stop() is called."""
+        self._httpd.serve_forever()
+
+    def start(self):
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _take_token(self):
+        """Token bucket holding up to one second of requests."""
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+        self._refilled_at = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def handle(self, path):
+        """Returns (status, JSON payload, extra headers) for a request path."""
+        url = urlparse(path)
+        with self._lock:
+            self.stats["requests"] += 1
+            if url.path != FORECAST_PATH:
+                return 404, {"error": True, "reason": f"Unknown endpoint {url.path}"}, {}
+            if self.rate_limit is not None and not self._take_token():
+                self.stats["throttled"] += 1
+                return 429, {"error": True, "reason": "Too many requests"}, {"Retry-After": "1"}
+            fail = self._rng.random() < self.error_rate
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+        if delay:
+            time.sleep(delay)
+        if fail:
+            with self._lock:
+                self.stats["errors"] += 1
+            return 500, {"error": True, "reason": "Injected server error"}, {}
+
+        try:
+            locations = self._locations(parse_qs(url.query))
+        except ValueError as e:
+            return 400, {"error": True, "reason": str(e)}, {}
+
+        with self._lock:
+            self.stats["locations"] += len(locations)
+        return 200, (locations if len(locations) > 1 else locations[0]), {}
+
+    def _locations(self, query):
+        if "latitude" not in query or "longitude" not in query:
+            raise ValueError("Parameter 'latitude' and 'longitude' must be set")
+        if query.get("current", [""])[0] != "temperature_2m":
+            raise ValueError("Only current=temperature_2m is supported")
+        lats = [float(v) for v in query["latitude"][0].split(",")]
+        lngs = [float(v) for v in query["longitude"][0].split(",")]
+        if len(lats) != len(lngs):
+            raise ValueError("Parameter 'latitude' and 'longitude' must have the same number of elements")
+        for lat, lng in zip(lats, lngs):
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                raise ValueError(f"Invalid coordinates ({lat}, {lng})")
+
+        now = datetime.now(timezone.utc)
+        slot = now.replace(minute=now.minute - now.minute % 15, second=0, microsecond=0)
+        return [{
+            "latitude": lat,
+            "longitude": lng,
+            "current_units": {"time": "iso8601", "interval": "seconds", "temperature_2m": "°C"},
+            "current": {"time": slot.strftime("%Y-%m-%dT%H:%M"), "interval": 900,
+                        "temperature_2m": self.field(lat, lng)},
+        } for lat, lng in zip(lats, lngs)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve an Open-Meteo-compatible forecast API locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--snapshot", help="Serve a recorded snapshot (.npz) instead of a synthetic field.")
+    parser.add_argument("--field-seed", type=int, default=0, help="Synthetic field seed.")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before HTTP 429.")
+    args = parser.parse_args()
+
+    from src.models.objectives import SnapshotObjective, SyntheticObjective
+    field = SnapshotObjective(args.snapshot) if args.snapshot else SyntheticObjective(seed=args.field_seed)
+    server = StubServer(field, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, rate_limit=args.rate_limit)
+    print(f"Serving Open-Meteo stub at {server.base_url}{FORECAST_PATH} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Stats: {server.stats}")
@@ -1,56 +1,75 @@
+import os
+
 import requests
-from src.data.data_manager import is_valid_coordinate, get_cached_result, save_result
+from src.data.http_client import get_session
+from src.data.rate_limit import OPEN_METEO, get_rate_limiter, note_throttled, wait_for_slot
+from src.data.resilience import CircuitOpenError, call_guarded
+from src.data.singleflight import SingleFlight
+from src.data.storage import quantize
+from src.data.data_manager import is_valid_coordinate, get_cached_entry, record_visit, save_result, save_results
 
 import time
 
-def fetch_temperature(lat, lng, search_method="unknown", use_cache=True, retries=3, backoff_factor=1):
+# Point OPEN_METEO_BASE_URL (or the base_url argument) at another server
+# speaking the same API, e.g. the local stub in src/data/stub_server.py
+OPEN_METEO_BASE_URL = os.getenv("OPEN_METEO_BASE_URL", "https://api.open-meteo.com")
+FORECAST_PATH = "/v1/forecast"
+OPEN_METEO_URL = OPEN_METEO_BASE_URL + FORECAST_PATH
+
+# Open-Meteo accepts comma-separated coordinate lists; keep each request
+# comfortably below URL length limits.
+MAX_LOCATIONS_PER_REQUEST = 100
+
+REQUEST_TIMEOUT = 10        # Seconds per attempt
+
+# Concurrent cache misses for the same 4-decimal cell share one request
+IN_FLIGHT = SingleFlight()
+
+# Optional RequestCoalescer batching single-point fetches (src/data/coalescer.py)
+_COALESCER = None
+
+
+def set_coalescer(coalescer):
     """
-    Fetches the current temperature for a given latitude and longitude.
-    Checks the local cache first unless use_cache is False.
-    Includes a retry mechanism for API reliability.
+    Routes single-point fetches through `coalescer` (None sends them
+    directly). Returns the previously installed one.
     """
-    if not is_valid_coordinate(lat, lng):
-        print(f"Error: Invalid coordinates ({lat}, {lng}). Must be -90 <= lat <= 90 and -180 <= lng <= 180.")
-        return None
+    global _COALESCER
+    previous, _COALESCER = _COALESCER, coalescer
+    return previous
 
-    # 1. Check Cache
-    if use_cache:
-        cached_temp = get_cached_result(lat, lng)
-        if cached_temp is not None:
-            print(f"Cache hit for ({lat}, {lng}): {cached_temp}°C")
-            # Automatically save the cache hit back to the log with a new timestamp
-            # so the visualizer knows this point was "visited" in the current run sequence.
-            save_result(lat, lng, cached_temp, search_method)
-            return cached_temp
-        
-    # 2. If not in cache, fetch from API
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": lat,
-        "longitude": lng,
-        "current": "temperature_2m",
-    }
-    
+
+def get_coalescer():
+    return _COALESCER
+
+
+def forecast_url(base_url=None):
+    """Forecast endpoint URL, at `base_url` if given (e.g. "http://localhost:8080")."""
+    if base_url is None:
+        return OPEN_METEO_URL
+    return base_url.rstrip("/") + FORECAST_PATH
+
+
+def _get_forecast(params, retries=3, backoff_factor=1, base_url=None):
+    """
+    Performs a GET against the Open-Meteo forecast endpoint with retries
+    and exponential backoff, paced by the Open-Meteo rate limiter if one
+    is configured. Returns the decoded JSON, or None on failure (at once
+    if the endpoint's circuit breaker is open).
+    """
+    url = forecast_url(base_url)
     for attempt in range(retries):
         try:
-            # Added a 10s timeout
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if "current" in data:
-                temp = data["current"]["temperature_2m"]
-                
-                # 3. Save to Cache
-                save_result(lat, lng, temp, search_method)
-                print(f"Fetched and cached ({lat}, {lng}): {temp}°C")
-                
-                return temp
+            wait_for_slot(OPEN_METEO)
+            # Hedged and circuit-broken if configured, see src/data/resilience.py
+            return call_guarded(OPEN_METEO, _get_once, url, params, REQUEST_TIMEOUT).json()
+
+        except CircuitOpenError as e:
+            print(f"Error fetching weather data: {e}")
             return None
-            
         except (requests.exceptions.RequestException, requests.exceptions.Timeout) as e:
             if attempt < retries - 1:
-                sleep_time = backoff_factor * (2 ** attempt)
+                sleep_time = _backoff(e, attempt, backoff_factor)
                 print(f"Attempt {attempt + 1} failed: {e}. Retrying in {sleep_time}s...")
                 time.sleep(sleep_time)
             else:
@@ -58,6 +77,214 @@ def fetch_temperature(lat, lng, search_method="unknown", use_cache=True, retries
                 return None
     return None
 
+
+def _get_once(url, params, timeout):
+    """One GET attempt; raises for HTTP error statuses."""
+    response = get_session().get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+
+def _backoff(error, attempt, backoff_factor):
+    """
+    Seconds to sleep before retrying after `error`. A 429 pauses the
+    shared rate limiter for its Retry-After instead, if there is one, so
+    the next slot already accounts for it.
+    """
+    throttled = note_throttled(OPEN_METEO, getattr(error, "response", None))
+    if throttled is not None and get_rate_limiter(OPEN_METEO) is not None:
+        return 0
+    return backoff_factor * (2 ** attempt)
+
+
+def _parse_current_temperature(data):
+    """Extracts current temperature_2m from a single-location response."""
+    if isinstance(data, dict) and "current" in data:
+        return data["current"]["temperature_2m"]
+    return None
+
+
+def fetch_temperature(lat, lng, search_method="unknown", use_cache=True, retries=3, backoff_factor=1,
+                      cache_radius_km=None, base_url=None):
+    """
+    Fetches the current temperature for a given latitude and longitude.
+    Checks the local cache first unless use_cache is False; with
+    cache_radius_km set, any cached observation within that distance counts
+    as a hit. Concurrent misses for the same cell share one request.
+    base_url overrides the Open-Meteo server.
+    Includes a retry mechanism for API reliability.
+    """
+    if not is_valid_coordinate(lat, lng):
+        print(f"Error: Invalid coordinates ({lat}, {lng}). Must be -90 <= lat <= 90 and -180 <= lng <= 180.")
+        return None
+
+    # 1. Check Cache
+    if use_cache:
+        cached = get_cached_entry(lat, lng, radius_km=cache_radius_km)
+        if cached is not None:
+            print(f"Cache hit for ({lat}, {lng}): {cached.temp}°C")
+            # Log the visit (not a new measurement) with a new timestamp
+            # so the visualizer knows this point was "visited" in the current run sequence.
+            record_visit(lat, lng, cached.temp, search_method, cached.measurement_id, cached.source)
+            return cached.temp
+        
+    # 2. If not in cache, fetch from API, or join a fetch of the same cell
+    #    already in flight on another thread
+    if not use_cache:
+        return _fetch_and_save(lat, lng, search_method, retries, backoff_factor, base_url)[0]
+    (temp, measurement_id), leader = IN_FLIGHT.do(
+        in_flight_key(lat, lng), _fetch_and_save, lat, lng, search_method, retries, backoff_factor, base_url)
+    if not leader and temp is not None:
+        print(f"Shared in-flight fetch for ({lat}, {lng}): {temp}°C")
+        record_visit(lat, lng, temp, search_method, measurement_id)
+    return temp
+
+
+def in_flight_key(lat, lng):
+    """Single-flight key of a point: its quantized cache cell."""
+    return quantize(lat), quantize(lng)
+
+
+def _fetch_and_save(lat, lng, search_method, retries, backoff_factor, base_url):
+    """
+    Fetches one point (through the coalescer, if one is installed) and
+    saves it as a new measurement. Returns (temp, measurement_id), or
+    (None, None) on failure.
+    """
+    coalescer = _COALESCER
+    if coalescer is not None:
+        temp = coalescer.submit(lat, lng, base_url).result()
+    else:
+        params = {
+            "latitude": lat,
+            "longitude": lng,
+            "current": "temperature_2m",
+        }
+        data = _get_forecast(params, retries=retries, backoff_factor=backoff_factor, base_url=base_url)
+        temp = _parse_current_temperature(data)
+    if temp is None:
+        return None, None
+
+    # 3. Save to Cache
+    measurement_id = save_result(lat, lng, temp, search_method)
+    print(f"Fetched and cached ({lat}, {lng}): {temp}°C")
+    return temp, measurement_id
+
+
+def fetch_temperatures(points, search_method="unknown", use_cache=True, chunk_size=MAX_LOCATIONS_PER_REQUEST,
+                       retries=3, backoff_factor=1, cache_radius_km=None, base_url=None):
+    """
+    Fetches current temperatures for many coordinates at once.
+
+    Cached points are answered locally; the remaining points are split into
+    chunks of at most `chunk_size` and each chunk is sent as a single
+    multi-location Open-Meteo request. All observations (including cache
+    hits) are written back to the log in one bulk append.
+
+    Parameters
+    ----------
+    points : list[tuple]
+        (lat, lng) pairs.
+    search_method : str
+        Label stored alongside each observation.
+    use_cache : bool
+        Whether to consult the local cache before calling the API.
+    cache_radius_km : float or None
+        Accept cached observations within this distance as hits.
+    chunk_size : int
+        Maximum number of locations per HTTP request.
+    base_url : str or None
+        Overrides the Open-Meteo server.
+
+    Returns
+    -------
+    temps : list[float or None]
+        Temperatures aligned with `points`; None for invalid coordinates
+        or failed requests.
+    """
+    points, temps, hits, misses = _partition_cached(points, use_cache, cache_radius_km)
+    n_hits = sum(t is not None for t in temps)
+    n_requests = 0
+
+    for start in range(0, len(misses), chunk_size):
+        chunk = misses[start:start + chunk_size]
+        data = _get_forecast(_batch_params(points, chunk), retries=retries, backoff_factor=backoff_factor,
+                             base_url=base_url)
+        n_requests += 1
+        _fill_batch(temps, chunk, data)
+
+    _save_batch(points, temps, hits, search_method)
+
+    print(f"Fetched {len(points)} points: {n_hits} cache hits, "
+          f"{len(misses)} fetched in {n_requests} requests.")
+    return temps
+
+
+def _partition_cached(points, use_cache, cache_radius_km=None):
+    """
+    Validates points and answers what it can from the cache.
+
+    Returns the normalized points, a temperature list pre-filled with
+    cache hits, the CacheEntry of each hit (None elsewhere), and the
+    indices that still need to be fetched.
+    """
+    points = [(float(lat), float(lng)) for lat, lng in points]
+    temps = [None] * len(points)
+    hits = [None] * len(points)
+    misses = []
+
+    for i, (lat, lng) in enumerate(points):
+        if not is_valid_coordinate(lat, lng):
+            print(f"Error: Invalid coordinates ({lat}, {lng}). Must be -90 <= lat <= 90 and -180 <= lng <= 180.")
+            continue
+        if use_cache:
+            cached = get_cached_entry(lat, lng, radius_km=cache_radius_km)
+            if cached is not None:
+                temps[i] = cached.temp
+                hits[i] = cached
+                continue
+        misses.append(i)
+
+    return points, temps, hits, misses
+
+
+def _batch_params(points, chunk):
+    """Builds multi-location query parameters for the given point indices."""
+    return {
+        "latitude": ",".join(str(points[i][0]) for i in chunk),
+        "longitude": ",".join(str(points[i][1]) for i in chunk),
+        "current": "temperature_2m",
+    }
+
+
+def _fill_batch(temps, chunk, data):
+    """Writes the temperatures of a multi-location response into `temps`."""
+    if data is None:
+        return
+    # A single location comes back as an object, several as a list
+    locations = data if isinstance(data, list) else [data]
+    for i, location in zip(chunk, locations):
+        temps[i] = _parse_current_temperature(location)
+
+
+def _save_batch(points, temps, hits, search_method):
+    """
+    Appends all successful observations to the log in one write, in point
+    order. Cache hits are logged as visits of their existing measurement
+    (or of the snapshot).
+    """
+    rows = []
+    for (lat, lng), temp, cached in zip(points, temps, hits):
+        if temp is None:
+            continue
+        if cached is None:
+            rows.append((lat, lng, temp, search_method))
+        else:
+            rows.append((lat, lng, temp, search_method, cached.measurement_id, cached.source))
+    if rows:
+        save_results(rows)
+
+
 if __name__ == "__main__":
     # Test with Copenhagen
     copenhagen = (55.6761, 12.5683)
@@ -8,38 +8,34 @@ produces standard performance metrics:
   - Summary statistics per method
 """
 
-import csv
 import os
 from collections import defaultdict
 
 import matplotlib.pyplot as plt
 import numpy as np
 
+from src.data.columnar import load_results_frame
+
 RESULTS_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "results.csv")
 
 
 def load_results(filepath=None):
-    """Load results.csv into a list of dicts, sorted by timestamp."""
+    """
+    Load results.csv into a list of dicts, sorted by timestamp.
+
+    Reads through the columnar copy (src/data/columnar.py), so only rows
+    appended since the last call are parsed.
+    """
     filepath = filepath or RESULTS_FILE
     if not os.path.isfile(filepath):
         print(f"Results file not found: {filepath}")
         return []
 
-    results = []
-    with open(filepath, mode="r") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                row["lat"] = float(row["lat"])
-                row["lng"] = float(row["lng"])
-                row["temp"] = float(row["temp"])
-            except (ValueError, KeyError):
-                continue
-            results.append(row)
-    
+    df = load_results_frame(filepath)
     # Sort by timestamp to ensure chronological order
-    results.sort(key=lambda r: r.get("timestamp", ""))
-    return results
+    df = df.sort_values("timestamp", kind="stable", na_position="first")
+    df["search_method"] = df["search_method"].astype(str)
+    return df.to_dict("records")
 
 
 def group_by_method(results):
@@ -0,0 +1,146 @@
+"""
+Kernels on the Sphere
+=====================
+Covariance functions for the GP in train_model.py, evaluated on points
+embedded as xyz unit vectors. Every pairwise cosine comes out of a single
+matrix product U1 @ U2.T (one BLAS GEMM), and the kernel is then applied
+in place, so a (n1, n2) kernel costs one n1 x n2 array rather than the
+several broadcast (n1, n2, 2) degree-difference temporaries, and
+distances shrink correctly towards the poles.
+
+Distances are in degrees of arc, so lengthscales keep their meaning from
+the lat/lng formulation:
+  - "chordal":      straight-line distance through the sphere, scaled to
+                    match the arc for nearby points. Positive definite
+                    for every kernel here (the default).
+  - "great_circle": arc length along the surface. Only guaranteed
+                    positive definite for matern12; the GP's noise term
+                    usually masks this for smooth kernels.
+
+Usage:
+    U = to_unit_vectors(points)
+    K = get_kernel("matern32")(U, U, variance=1.0, lengthscale=45.0)
+"""
+
+import numpy as np
+
+METRICS = ("chordal", "great_circle")
+
+_DEGREES_PER_RADIAN = 180.0 / np.pi
+
+
+def to_unit_vectors(points):
+    """
+    Embeds (lat, lng) points in degrees as xyz unit vectors.
+
+    Parameters
+    ----------
+    points : array-like, shape (n, 2)
+
+    Returns
+    -------
+    U : np.ndarray, shape (n, 3)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    lat = np.radians(points[:, 0])
+    lng = np.radians(points[:, 1])
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)])
+
+
+def _cosines(U1, U2):
+    """Pairwise cosines of the angles between unit vectors (one GEMM)."""
+    C = U1 @ U2.T
+    np.clip(C, -1.0, 1.0, out=C)
+    return C
+
+
+def distances(U1, U2, metric="chordal"):
+    """
+    Pairwise distances between unit vectors, in degrees of arc.
+
+    Returns
+    -------
+    D : np.ndarray, shape (len(U1), len(U2))
+    """
+    D = _cosines(U1, U2)
+    if metric == "chordal":
+        # |u - v| = sqrt(2 - 2 cos)
+        D *= -2.0
+        D += 2.0
+        np.maximum(D, 0.0, out=D)
+        np.sqrt(D, out=D)
+    elif metric == "great_circle":
+        np.arccos(D, out=D)
+    else:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of {METRICS}")
+    D *= _DEGREES_PER_RADIAN
+    return D
+
+
+def rbf(U1, U2, variance=1.0, lengthscale=45.0, metric="chordal"):
+    """
+    Squared exponential kernel: variance * exp(-d^2 / (2 lengthscale^2)).
+    """
+    if metric == "chordal":
+        # d^2 / 2 = (1 - cos) in radians^2, so no square root is needed
+        K = _cosines(U1, U2)
+        K -= 1.0
+        K *= (_DEGREES_PER_RADIAN / lengthscale) ** 2
+    else:
+        K = distances(U1, U2, metric)
+        K *= K
+        K *= -0.5 / lengthscale ** 2
+    np.exp(K, out=K)
+    K *= variance
+    return K
+
+
+def matern12(U1, U2, variance=1.0, lengthscale=45.0, metric="chordal"):
+    """Matern nu=1/2 (exponential) kernel: variance * exp(-d / lengthscale)."""
+    K = distances(U1, U2, metric)
+    K *= -1.0 / lengthscale
+    np.exp(K, out=K)
+    K *= variance
+    return K
+
+
+def matern32(U1, U2, variance=1.0, lengthscale=45.0, metric="chordal"):
+    """Matern nu=3/2 kernel: variance * (1 + r) exp(-r), r = sqrt(3) d / lengthscale."""
+    r = distances(U1, U2, metric)
+    r *= np.sqrt(3.0) / lengthscale
+    decay = np.exp(-r)
+    r += 1.0
+    r *= decay
+    r *= variance
+    return r
+
+
+def matern52(U1, U2, variance=1.0, lengthscale=45.0, metric="chordal"):
+    """Matern nu=5/2 kernel: variance * (1 + r + r^2 / 3) exp(-r), r = sqrt(5) d / lengthscale."""
+    r = distances(U1, U2, metric)
+    r *= np.sqrt(5.0) / lengthscale
+    decay = np.exp(-r)
+    K = r * r
+    K *= 1.0 / 3.0
+    K += r
+    K += 1.0
+    K *= decay
+    K *= variance
+    return K
+
+
+KERNELS = {
+    "rbf": rbf,
+    "matern12": matern12,
+    "matern32": matern32,
+    "matern52": matern52,
+}
+
+
+def get_kernel(name):
+    """Returns the kernel function called `name` (see KERNELS)."""
+    try:
+        return KERNELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown kernel {name!r}; expected one of {sorted(KERNELS)}") from None
@@ -62,7 +62,7 @@ def manual_search(max_guesses=None):
             continue
 
         iteration += 1
-        temp = fetch_temperature(lat, lng, search_method="manual_search", use_cache=False)
+        temp = fetch_temperature(lat, lng, search_method="manual_search", use_cache=True)
 
         if temp is not None:
             if best_temp is None or temp > best_temp:
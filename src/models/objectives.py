@@ -0,0 +1,214 @@
+"""
+Search Objectives
+=================
+The temperature field a search is maximizing, behind one small interface
+so every search method (Bayesian optimization, random search, the tuning
+sweep) can run against the live API or an offline stand-in:
+
+  - LiveObjective:      current temperatures from Open-Meteo via
+                        fetch_temperature (cached and logged as usual).
+  - SyntheticObjective: deterministic analytic field (latitude gradient,
+                        large-scale waves and Gaussian hot spots) with
+                        optional noise and injected latency. Nothing is
+                        logged; sweeps become fast, repeatable benchmarks.
+  - SnapshotObjective:  a recorded global snapshot (src/data/snapshot.py),
+                        interpolated, for benchmarks on real data.
+
+An objective is called as objective(lat, lng) -> temperature or None, and
+offers evaluate_many(points) / aevaluate_many(points) for batches and
+await objective.acall(lat, lng) for asyncio searches.
+"""
+
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from src.data.async_weather_api import afetch_temperature, afetch_temperatures
+from src.data.snapshot import load_snapshot
+from src.data.spatial_index import EARTH_RADIUS_KM
+from src.data.weather_api import fetch_temperature, fetch_temperatures
+
+
+class Objective(ABC):
+    """
+    Base class: subclasses implement __call__; batches and the async
+    variants fall back to calling it point by point.
+    """
+
+    @abstractmethod
+    def __call__(self, lat, lng):
+        """Temperature at (lat, lng), or None if unavailable."""
+
+    def evaluate_many(self, points):
+        return [self(lat, lng) for lat, lng in points]
+
+    async def acall(self, lat, lng, semaphore=None):
+        return await asyncio.to_thread(self, lat, lng)
+
+    async def aevaluate_many(self, points, concurrency=None):
+        return await asyncio.gather(*(self.acall(lat, lng) for lat, lng in points))
+
+    def global_max(self):
+        """(lat, lng, temp) of the true maximum, or None if unknown."""
+        return None
+
+
+class LiveObjective(Objective):
+    """
+    Current temperatures from the Open-Meteo API, going through the cache
+    and the results log like any search.
+
+    Parameters
+    ----------
+    search_method : str
+        Label stored with each observation.
+    use_cache : bool
+        Whether to consult the local cache before calling the API.
+    cache_radius_km : float or None
+        Accept cached observations within this distance as hits.
+    """
+
+    def __init__(self, search_method="unknown", use_cache=True, cache_radius_km=None):
+        self.search_method = search_method
+        self.use_cache = use_cache
+        self.cache_radius_km = cache_radius_km
+
+    def __call__(self, lat, lng):
+        return fetch_temperature(lat, lng, search_method=self.search_method, use_cache=self.use_cache,
+                                 cache_radius_km=self.cache_radius_km)
+
+    def evaluate_many(self, points):
+        return fetch_temperatures(points, search_method=self.search_method, use_cache=self.use_cache,
+                                  cache_radius_km=self.cache_radius_km)
+
+    async def acall(self, lat, lng, semaphore=None):
+        return await afetch_temperature(lat, lng, search_method=self.search_method, use_cache=self.use_cache,
+                                        semaphore=semaphore, cache_radius_km=self.cache_radius_km)
+
+    async def aevaluate_many(self, points, concurrency=None):
+        kwargs = {} if concurrency is None else {"chunk_size": 1, "concurrency": concurrency}
+        return await afetch_temperatures(points, search_method=self.search_method, use_cache=self.use_cache,
+                                         cache_radius_km=self.cache_radius_km, **kwargs)
+
+
+class SyntheticObjective(Objective):
+    """
+    Deterministic synthetic temperature field:
+
+        T = -20 + 50 * cos(lat)                      (warm equator, cold poles)
+            + 4 * cos(lat) * sin(2 * lng + phase)   (continental-scale waves)
+            + sum_k A_k * exp(-(d_k / w_k)^2)        (hot spots)
+
+    where d_k is the great-circle distance to hot spot k. Hot spot centres
+    (within 45 degrees of the equator), amplitudes (5-15 degC) and widths
+    (300-1500 km) are drawn from `seed`.
+
+    Parameters
+    ----------
+    seed : int or None
+        Selects the field (and the noise sequence); None draws a fresh one.
+    n_hot_spots : int
+        Number of Gaussian hot spots.
+    noise : float
+        Standard deviation of Gaussian noise added to each evaluation.
+    latency : float
+        Seconds each request sleeps, to mimic network round trips.
+    """
+
+    def __init__(self, seed=0, n_hot_spots=8, noise=0.0, latency=0.0):
+        rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.noise = noise
+        self.latency = latency
+        self.phase = rng.uniform(0, 2 * np.pi)
+        self.spot_lats = rng.uniform(-45, 45, n_hot_spots)
+        self.spot_lngs = rng.uniform(-180, 180, n_hot_spots)
+        self.spot_amplitudes = rng.uniform(5, 15, n_hot_spots)
+        self.spot_widths_km = rng.uniform(300, 1500, n_hot_spots)
+        self._noise_rng = np.random.default_rng(None if seed is None else seed + 1)
+        self._global_max = None
+
+    def field(self, lats, lngs):
+        """Noise-free temperatures at arrays of coordinates (degrees)."""
+        phi = np.radians(np.asarray(lats, dtype=np.float64))
+        lmb = np.radians(np.asarray(lngs, dtype=np.float64))
+        temps = -20.0 + 50.0 * np.cos(phi) + 4.0 * np.cos(phi) * np.sin(2 * lmb + self.phase)
+
+        for lat0, lng0, amplitude, width in zip(self.spot_lats, self.spot_lngs,
+                                                self.spot_amplitudes, self.spot_widths_km):
+            phi0, lmb0 = math.radians(lat0), math.radians(lng0)
+            a = np.sin((phi - phi0) / 2) ** 2 + np.cos(phi) * math.cos(phi0) * np.sin((lmb - lmb0) / 2) ** 2
+            dist = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+            temps = temps + amplitude * np.exp(-(dist / width) ** 2)
+        return temps
+
+    def _observe(self, lats, lngs):
+        temps = self.field(lats, lngs)
+        if self.noise:
+            temps = temps + self._noise_rng.normal(0.0, self.noise, np.shape(temps))
+        return np.round(temps, 2)
+
+    def __call__(self, lat, lng):
+        if self.latency:
+            time.sleep(self.latency)
+        return float(self._observe(lat, lng))
+
+    def evaluate_many(self, points):
+        if self.latency:
+            time.sleep(self.latency)
+        if not points:
+            return []
+        lats, lngs = zip(*points)
+        return self._observe(lats, lngs).tolist()
+
+    async def acall(self, lat, lng, semaphore=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return float(self._observe(lat, lng))
+
+    async def aevaluate_many(self, points, concurrency=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if not points:
+            return []
+        lats, lngs = zip(*points)
+        return self._observe(lats, lngs).tolist()
+
+    def global_max(self, resolution_deg=0.25):
+        """Maximum of the noise-free field on a global grid (cached)."""
+        if self._global_max is None:
+            lats = np.arange(-90.0, 90.0 + resolution_deg / 2, resolution_deg)
+            lngs = np.arange(-180.0, 180.0, resolution_deg)
+            grid = self.field(lats[:, None], lngs[None, :])
+            i, j = np.unravel_index(np.argmax(grid), grid.shape)
+            self._global_max = (float(lats[i]), float(lngs[j]), float(grid[i, j]))
+        return self._global_max
+
+
+class SnapshotObjective(Objective):
+    """
+    Interpolated temperatures from a recorded global snapshot. Nothing is
+    fetched or logged.
+
+    Parameters
+    ----------
+    snapshot : TemperatureSnapshot or str
+        A snapshot, or the path of one saved by prefetch_global_snapshot.
+    """
+
+    def __init__(self, snapshot=None):
+        if snapshot is None or isinstance(snapshot, str):
+            path = snapshot
+            snapshot = load_snapshot(path)
+            if snapshot is None:
+                raise FileNotFoundError(f"No temperature snapshot at {path or 'the default location'}")
+        self.snapshot = snapshot
+
+    def __call__(self, lat, lng):
+        return self.snapshot.lookup(lat, lng)
+
+    def global_max(self):
+        return self.snapshot.global_max()
@@ -6,11 +6,17 @@ fetches the current temperature. This establishes a baseline for
 comparison with Bayesian Optimization and manual search.
 """
 
+import asyncio
+from contextlib import nullcontext
+
 import numpy as np
-from src.data.weather_api import fetch_temperature
+from src.data.data_manager import buffered_results, start_run
+from src.data.weather_api import fetch_temperature, fetch_temperatures
+from src.data.async_weather_api import afetch_temperatures
+from src.data.snapshot import use_snapshot
 
 
-def random_search(n_iterations=50, seed=None):
+def random_search(n_iterations=50, seed=None, batch=False, concurrency=None, snapshot_file=None, objective=None):
     """
     Runs a random search over the globe to find the highest temperature.
 
@@ -20,6 +26,18 @@ def random_search(n_iterations=50, seed=None):
         Number of random points to sample.
     seed : int or None
         Random seed for reproducibility.
+    batch : bool
+        If True, all points are drawn up front and fetched with a handful
+        of multi-location requests instead of one request per point.
+    concurrency : int or None
+        If given, points are drawn up front and fetched with the asyncio
+        engine, one request per point with up to this many in flight.
+    snapshot_file : str or None
+        Prefetched global snapshot (see src/data/snapshot.py) the cache
+        answers from for points it has no fresh observation of.
+    objective : Objective or None
+        Temperature field to sample (see src/models/objectives.py).
+        Defaults to live Open-Meteo temperatures.
 
     Returns
     -------
@@ -27,28 +45,52 @@ def random_search(n_iterations=50, seed=None):
         List of dicts with keys: iteration, lat, lng, temp, best_temp.
     """
     rng = np.random.default_rng(seed)
+    start_run()
     results = []
     best_temp = -np.inf
 
-    for i in range(n_iterations):
-        lat = rng.uniform(-90, 90)
-        lng = rng.uniform(-180, 180)
+    # Observations are written to the results log in batches
+    with use_snapshot(snapshot_file) if snapshot_file else nullcontext(), buffered_results():
+        batch = batch or concurrency is not None
+        if batch:
+            points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(n_iterations)]
+            if objective is not None:
+                if concurrency is not None:
+                    batch_temps = asyncio.run(objective.aevaluate_many(points, concurrency=concurrency))
+                else:
+                    batch_temps = objective.evaluate_many(points)
+            elif concurrency is not None:
+                batch_temps = asyncio.run(afetch_temperatures(
+                    points, search_method="random_search", use_cache=True, chunk_size=1, concurrency=concurrency))
+            else:
+                batch_temps = fetch_temperatures(points, search_method="random_search", use_cache=True)
+
+        for i in range(n_iterations):
+            if batch:
+                lat, lng = points[i]
+                temp = batch_temps[i]
+            else:
+                lat = rng.uniform(-90, 90)
+                lng = rng.uniform(-180, 180)
 
-        temp = fetch_temperature(lat, lng, search_method="random_search", use_cache=False)
+                if objective is not None:
+                    temp = objective(lat, lng)
+                else:
+                    temp = fetch_temperature(lat, lng, search_method="random_search", use_cache=True)
 
-        if temp is not None and temp > best_temp:
-            best_temp = temp
+            if temp is not None and temp > best_temp:
+                best_temp = temp
 
-        results.append({
-            "iteration": i + 1,
-            "lat": round(lat, 4),
-            "lng": round(lng, 4),
-            "temp": temp,
-            "best_temp": best_temp if best_temp > -np.inf else None,
-        })
+            results.append({
+                "iteration": i + 1,
+                "lat": round(lat, 4),
+                "lng": round(lng, 4),
+                "temp": temp,
+                "best_temp": best_temp if best_temp > -np.inf else None,
+            })
 
-        print(f"[Random] Iter {i+1}/{n_iterations}  ({lat:.2f}, {lng:.2f})  "
-              f"temp={temp}°C  best={best_temp:.1f}°C")
+            print(f"[Random] Iter {i+1}/{n_iterations}  ({lat:.2f}, {lng:.2f})  "
+                  f"temp={temp}°C  best={best_temp:.1f}°C")
 
     return results
 
@@ -6,8 +6,12 @@ temperature on a 2D world map. The model balances exploration and
 exploitation using grid search to optimize the acquisition function.
 """
 
+import asyncio
+from contextlib import nullcontext
+
 import numpy as np
 import yaml
+from scipy.linalg import solve_triangular
 import os
 import sys
 
@@ -16,17 +20,37 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
-from src.data.weather_api import fetch_temperature
+from src.data.data_manager import buffered_results, start_run
+from src.data.snapshot import use_snapshot
+from src.models.kernels import get_kernel, to_unit_vectors
+from src.models.objectives import LiveObjective
 
 class BayesianOptimizationSearch:
     """
-    Bayesian Optimization using Gaussian Process with RBF kernel and UCB acquisition.
+    Bayesian Optimization using a Gaussian Process on the sphere (RBF or
+    Matern kernel, see src/models/kernels.py) and UCB acquisition.
     
     The model maintains a GP over observed temperatures and uses UCB to select
     the next sampling location via grid search.
+    
+    The Cholesky factor L of K + noise*I is kept between iterations and
+    grown by a rank-one append per new observation (one triangular solve,
+    O(n^2), instead of refactoring at O(n^3)). The candidate grid is
+    fixed, so its unit-vector embedding and whitened cross-kernel
+    L^-1 K_star are kept too; the latter gains one row per observation
+    (O(n m)), which updates the grid's posterior mean and variance in
+    place, so the acquisition itself costs O(m) per iteration.
     """
     
-    def __init__(self, config_path="config.yaml"):
+    # Grid points closer than this to an observation (degrees) are not proposed
+    EXCLUSION_RADIUS_DEG = 2.0
+    
+    # Floor on a new pivot d^2 of the Cholesky factor: an observation the
+    # others already determine (K not positive definite, e.g. a repeated
+    # point with zero noise) gets this much diagonal jitter instead
+    CHOLESKY_JITTER = 1e-10
+    
+    def __init__(self, config_path="config.yaml", objective=None):
         """
         Initialize the Bayesian Optimization model.
         
@@ -34,12 +58,17 @@ class BayesianOptimizationSearch:
         ----------
         config_path : str
             Path to the configuration YAML file.
+        objective : Objective or None
+            Temperature field to maximize (see src/models/objectives.py).
+            Defaults to live Open-Meteo temperatures.
         """
         # Load configuration
         with open(config_path, 'r') as f:
             config = yaml.safe_load(f)
         
         # GP hyperparameters
+        self.kernel = config.get('kernel', 'rbf')
+        self.kernel_metric = config.get('kernel_metric', 'chordal')
         self.kernel_variance = config['kernel_variance']
         self.lengthscale = config['lengthscale']
         self.noise = config['noise']
@@ -51,6 +80,14 @@ class BayesianOptimizationSearch:
         self.n_iterations = config['n_iterations']
         self.grid_resolution = config['grid_resolution']
         
+        # Cached observations within this distance are reused instead of calling the API
+        self.cache_radius_km = config.get('cache_radius_km')
+        
+        # Optional prefetched global snapshot the cache answers from (src/data/snapshot.py)
+        self.snapshot_file = config.get('snapshot_file')
+        
+        self.objective = objective
+        
         # Bounds
         self.lat_min = config['lat_min']
         self.lat_max = config['lat_max']
@@ -65,11 +102,17 @@ class BayesianOptimizationSearch:
         self.temp_min = None
         self.temp_max = None
         
-    def _rbf_kernel(self, X1, X2):
-        """
-        Compute the RBF (Squared Exponential) kernel matrix.
+        # Candidate grid, built once per bounds/resolution (see _get_grid)
+        self._grid = None
+        self._grid_U = None
+        self._grid_key = None
         
-        K(x, x') = variance * exp(-||x - x'||^2 / (2 * lengthscale^2))
+        # Incrementally grown GP state (see _update_factor)
+        self._reset_factor()
+        
+    def _kernel(self, X1, X2):
+        """
+        Compute the kernel matrix between two sets of (lat, lng) points.
         
         Parameters
         ----------
@@ -83,22 +126,17 @@ class BayesianOptimizationSearch:
         K : np.ndarray, shape (n1, n2)
             Kernel matrix.
         """
-        # Compute squared distances with longitude wraparound
-        X1_expanded = X1[:, np.newaxis, :]  # (n1, 1, 2)
-        X2_expanded = X2[np.newaxis, :, :]  # (1, n2, 2)
-        
-        # Latitude difference (no wraparound)
-        dlat = X1_expanded[:, :, 0] - X2_expanded[:, :, 0]
-        
-        # Longitude difference with wraparound: min(|Δlng|, 360 - |Δlng|)
-        dlng = np.abs(X1_expanded[:, :, 1] - X2_expanded[:, :, 1])
-        dlng = np.minimum(dlng, 360.0 - dlng)
-        
-        sq_dist = dlat ** 2 + dlng ** 2
-        
-        # RBF kernel
-        K = self.kernel_variance * np.exp(-sq_dist / (2 * self.lengthscale ** 2))
-        return K
+        return self._kernel_uv(to_unit_vectors(X1), to_unit_vectors(X2))
+    
+    def _kernel_uv(self, U1, U2):
+        """
+        Kernel matrix between points already embedded as unit vectors.
+        The model keeps the embeddings of its observations and grid, so
+        this is one GEMM plus an in-place transform.
+        """
+        kernel = get_kernel(self.kernel)
+        return kernel(U1, U2, variance=self.kernel_variance, lengthscale=self.lengthscale,
+                      metric=self.kernel_metric)
     
     def _normalize_temperature(self, temp):
         """Normalize temperature to [0, 1] range."""
@@ -114,6 +152,127 @@ class BayesianOptimizationSearch:
             self.temp_min = min(self.y_observed)
             self.temp_max = max(self.y_observed)
     
+    def _reset_factor(self):
+        """Forget the factorization; the next _update_factor rebuilds it."""
+        self._n_factored = 0
+        self._X_factored = np.empty((0, 2))
+        self._U_factored = np.empty((0, 3))  # Unit-vector embeddings of _X_factored
+        self._y_factored = np.empty(0)
+        self._L = np.empty((0, 0))
+        # L^-1 y and L^-1 1: the normalized targets are affine in y, so
+        # L^-1 y_normalized = (w_y - temp_min * w_1) / (temp_max - temp_min)
+        self._w_y = np.empty(0)
+        self._w_1 = np.empty(0)
+        self._factor_params = self._kernel_params()
+        self._V_grid = None     # L^-1 K(X_obs, grid), rows grown with the factor
+        self._grid_var = None   # Posterior variance on the grid
+        self._grid_v_y = None   # V^T w_y and V^T w_1 on the grid (see _normalized_mean)
+        self._grid_v_1 = None
+        self._excluded = None   # Grid points too close to an observation
+        self._n_excluded = 0
+    
+    def _kernel_params(self):
+        """Everything the factorization depends on besides the observations."""
+        return (self.kernel, self.kernel_metric, self.kernel_variance, self.lengthscale, self.noise)
+    
+    def _update_factor(self):
+        """
+        Bring the Cholesky factor up to date with X_observed,
+        appending one row per new observation. Rebuilds from scratch if
+        the hyperparameters changed or the observations were replaced.
+        """
+        n_done = self._n_factored
+        if (self._kernel_params() != self._factor_params or len(self.X_observed) < n_done
+                or (n_done and (tuple(self._X_factored[n_done - 1]) != tuple(self.X_observed[n_done - 1])
+                                or self._y_factored[n_done - 1] != self.y_observed[n_done - 1]))):
+            self._reset_factor()
+            n_done = 0
+        for x, y in zip(self.X_observed[n_done:], self.y_observed[n_done:]):
+            self._append_to_factor(x, y)
+    
+    def _grow_factor(self):
+        """Double the factor storage so appends are amortized O(n^2)."""
+        n = self._n_factored
+        capacity = max(16, 2 * n)
+        X = np.zeros((capacity, 2))
+        X[:n] = self._X_factored[:n]
+        U = np.zeros((capacity, 3))
+        U[:n] = self._U_factored[:n]
+        self._U_factored = U
+        L = np.zeros((capacity, capacity))
+        L[:n, :n] = self._L[:n, :n]
+        y, w_y, w_1 = np.zeros(capacity), np.zeros(capacity), np.zeros(capacity)
+        y[:n], w_y[:n], w_1[:n] = self._y_factored[:n], self._w_y[:n], self._w_1[:n]
+        self._X_factored, self._L = X, L
+        self._y_factored, self._w_y, self._w_1 = y, w_y, w_1
+        if self._V_grid is not None:
+            V = np.zeros((capacity, self._V_grid.shape[1]))
+            V[:n] = self._V_grid[:n]
+            self._V_grid = V
+    
+    def _append_to_factor(self, x, y):
+        """
+        Rank-one append of observation (x, y) to L, where L L^T = K + noise*I:
+        
+            L' = [[L, 0], [l^T, d]]      with l = L^-1 k, d = sqrt(k(x, x) + noise - l.l)
+        
+        with d^2 floored at CHOLESKY_JITTER. Every quantity of the form L^-1 b
+        gains one entry, (b_new - l.(L^-1 b)) / d, and nothing already
+        computed changes. That is applied to w_y, w_1 and the grid's V,
+        whose new row then updates the grid posterior in place (a rank-one
+        downdate of the variance).
+        """
+        n = self._n_factored
+        if n == len(self._X_factored):
+            self._grow_factor()
+        
+        x = np.asarray(x, dtype=float)
+        u = to_unit_vectors(x)
+        k = self._kernel_uv(self._U_factored[:n], u)[:, 0]
+        l = solve_triangular(self._L[:n, :n], k, lower=True, check_finite=False)
+        d = np.sqrt(max(self.kernel_variance + self.noise - l @ l, self.CHOLESKY_JITTER))
+        
+        self._X_factored[n] = x
+        self._U_factored[n] = u[0]
+        self._y_factored[n] = y
+        self._L[n, :n] = l
+        self._L[n, n] = d
+        self._w_y[n] = (y - l @ self._w_y[:n]) / d
+        self._w_1[n] = (1.0 - l @ self._w_1[:n]) / d
+        self._n_factored = n + 1
+        
+        if self._V_grid is not None:
+            # New whitened grid row: (k(x, grid) - l^T V) / d
+            k_grid = self._kernel_uv(u, self._grid_U)[0]
+            v = (k_grid - l @ self._V_grid[:n]) / d
+            self._V_grid[n] = v
+            self._grid_var -= v * v
+            self._grid_v_y += v * self._w_y[n]
+            self._grid_v_1 += v * self._w_1[n]
+    
+    def _build_grid_state(self):
+        """Grid cross-kernel and posterior terms for all current observations, from scratch."""
+        n = self._n_factored
+        self._V_grid = np.zeros((len(self._L), len(self._grid)))
+        if n:
+            self._V_grid[:n] = solve_triangular(self._L[:n, :n], self._kernel_uv(self._U_factored[:n], self._grid_U),
+                                                lower=True, check_finite=False)
+        V = self._V_grid[:n]
+        self._grid_var = self.kernel_variance - np.sum(V * V, axis=0)
+        self._grid_v_y = V.T @ self._w_y[:n]
+        self._grid_v_1 = V.T @ self._w_1[:n]
+    
+    def _normalized_mean(self, v_y, v_1):
+        """
+        Combine V^T w_y and V^T w_1 into the mean of the normalized targets
+        (see _normalize_temperature).
+        """
+        if self.temp_min is None or self.temp_max is None:
+            return v_y
+        if self.temp_max == self.temp_min:
+            return 0.5 * v_1
+        return (v_y - self.temp_min * v_1) / (self.temp_max - self.temp_min)
+    
     def _predict(self, X_new):
         """
         Predict mean and standard deviation at new points using GP.
@@ -136,40 +295,41 @@ class BayesianOptimizationSearch:
             std = np.sqrt(self.kernel_variance) * np.ones(len(X_new))
             return mean, std
         
-        # Convert observations to arrays
-        X_obs = np.array(self.X_observed)
-        y_obs = np.array(self.y_observed)
+        # Extend the factorization with any new observations
+        self._update_factor()
+        n = self._n_factored
         
-        # Normalize observations
-        y_normalized = np.array([self._normalize_temperature(y) for y in y_obs])
+        # Whitened cross-covariances V = L^-1 K_star, shared by mean and variance
+        K_star = self._kernel_uv(self._U_factored[:n], to_unit_vectors(X_new))
+        V = solve_triangular(self._L[:n, :n], K_star, lower=True, check_finite=False)
         
-        # Compute kernel matrices
-        K = self._rbf_kernel(X_obs, X_obs)
-        K_star = self._rbf_kernel(X_obs, X_new)
+        # Compute mean: k_star^T (K + noise*I)^-1 y = V^T (L^-1 y)
+        mean = self._normalized_mean(V.T @ self._w_y[:n], V.T @ self._w_1[:n])
         
-        # Add noise to diagonal of K
-        K_noisy = K + self.noise * np.eye(len(X_obs))
-        
-        # Compute mean: k_star^T * K^-1 * y
-        try:
-            K_inv_y = np.linalg.solve(K_noisy, y_normalized)
-            mean = K_star.T @ K_inv_y
-            
-            # Compute variance
-            # Only need the diagonal of K_star_star, which is always self.kernel_variance
-            K_star_star_diag = np.full(len(X_new), self.kernel_variance)
-            K_inv_k_star = np.linalg.solve(K_noisy, K_star)
-            variance = K_star_star_diag - np.sum(K_star * K_inv_k_star, axis=0)
-            variance = np.maximum(variance, 1e-10)  # Ensure non-negative
-            std = np.sqrt(variance)
-            
-        except np.linalg.LinAlgError:
-            # Fallback to prior if numerical issues
-            mean = np.zeros(len(X_new))
-            std = np.sqrt(self.kernel_variance) * np.ones(len(X_new))
+        # Compute variance
+        # Only need the diagonal of K_star_star, which is always self.kernel_variance
+        variance = self.kernel_variance - np.sum(V * V, axis=0)
+        variance = np.maximum(variance, 1e-10)  # Ensure non-negative
+        std = np.sqrt(variance)
         
         return mean, std
     
+    def _predict_grid(self):
+        """
+        Same as _predict(self._get_grid()), but read from the grid
+        posterior maintained in place as observations arrive: O(m) per
+        call instead of O(n m).
+        """
+        grid = self._get_grid()
+        self._update_factor()
+        if self._n_factored == 0:
+            return self._predict(grid)
+        if self._V_grid is None:
+            self._build_grid_state()
+        
+        mean = self._normalized_mean(self._grid_v_y, self._grid_v_1)
+        return mean, np.sqrt(np.maximum(self._grid_var, 1e-10))
+    
     def _ucb_acquisition(self, X_grid):
         """
         Compute UCB acquisition function values on a grid.
@@ -199,12 +359,62 @@ class BayesianOptimizationSearch:
         grid : np.ndarray, shape (grid_resolution^2, 2)
             Grid points as (lat, lng) pairs.
         """
-        lat_vals = np.linspace(self.lat_min, self.lat_max, self.grid_resolution)
-        lng_vals = np.linspace(self.lng_min, self.lng_max, self.grid_resolution)
+        lat_vals, lng_vals = self._grid_axes()
         lat_grid, lng_grid = np.meshgrid(lat_vals, lng_vals)
         grid = np.column_stack([lat_grid.ravel(), lng_grid.ravel()])
         return grid
     
+    def _grid_axes(self):
+        """Latitude and longitude values of the grid; point (i, j) is grid[j * len(lat_vals) + i]."""
+        lat_vals = np.linspace(self.lat_min, self.lat_max, self.grid_resolution)
+        lng_vals = np.linspace(self.lng_min, self.lng_max, self.grid_resolution)
+        return lat_vals, lng_vals
+    
+    def _get_grid(self):
+        """
+        The candidate grid, created once and reused until the bounds or
+        resolution change.
+        """
+        key = (self.lat_min, self.lat_max, self.lng_min, self.lng_max, self.grid_resolution)
+        if key != self._grid_key:
+            self._grid = self._create_grid()
+            self._grid_U = to_unit_vectors(self._grid)
+            self._grid_key = key
+            self._V_grid = None     # rebuilt by _predict_grid
+            self._excluded = None   # rebuilt by _update_exclusion
+        return self._grid
+    
+    def _update_exclusion(self):
+        """
+        Bring the mask of grid points too close to an observation up to
+        date, visiting only the grid neighbourhood of each new observation.
+        Shares the factor's bookkeeping, so it is rebuilt with it.
+        """
+        if self._excluded is None:
+            self._excluded = np.zeros(len(self._grid), dtype=bool)
+            self._n_excluded = 0
+        for x in self._X_factored[self._n_excluded:self._n_factored]:
+            self._exclude_near(x[0], x[1])
+        self._n_excluded = self._n_factored
+    
+    def _exclude_near(self, lat, lng):
+        """
+        Mask grid points within EXCLUSION_RADIUS_DEG of (lat, lng), in
+        degrees with longitude wraparound. The grid is a lat x lng
+        product, so only the rows and columns within the radius are
+        checked.
+        """
+        lat_vals, lng_vals = self._grid_axes()
+        radius = self.EXCLUSION_RADIUS_DEG
+        dlat = lat_vals - lat
+        dlng = np.abs(lng_vals - lng)
+        dlng = np.minimum(dlng, 360.0 - dlng)
+        rows = np.nonzero(np.abs(dlat) < radius)[0]
+        cols = np.nonzero(dlng < radius)[0]
+        close = dlat[rows][np.newaxis, :] ** 2 + dlng[cols][:, np.newaxis] ** 2 < radius ** 2
+        flat = cols[:, np.newaxis] * len(lat_vals) + rows[np.newaxis, :]
+        self._excluded[flat[close]] = True
+    
     def _select_next_point(self):
         """
         Select the next sampling point by maximizing UCB over a grid.
@@ -214,22 +424,16 @@ class BayesianOptimizationSearch:
         next_point : tuple
             (lat, lng) of the next point to sample.
         """
-        # Create grid
-        grid = self._create_grid()
+        # Grid and its cross-kernel are kept across iterations
+        grid = self._get_grid()
         
         # Evaluate UCB on grid
-        ucb_values = self._ucb_acquisition(grid)
+        mean, std = self._predict_grid()
+        ucb_values = mean + self.kappa * std
         
         # Mask out grid points near already-observed locations
-        if len(self.X_observed) > 0:
-            X_obs = np.array(self.X_observed)
-            min_dist_threshold = 2.0  # degrees
-            for obs in X_obs:
-                dlat = grid[:, 0] - obs[0]
-                dlng = np.abs(grid[:, 1] - obs[1])
-                dlng = np.minimum(dlng, 360.0 - dlng)
-                dist = np.sqrt(dlat ** 2 + dlng ** 2)
-                ucb_values[dist < min_dist_threshold] = -np.inf
+        self._update_exclusion()
+        ucb_values[self._excluded] = -np.inf
         
         # Select point with highest UCB
         best_idx = np.argmax(ucb_values)
@@ -237,26 +441,23 @@ class BayesianOptimizationSearch:
         
         return next_point
     
-    def run_search(self, seed=None):
+    def _propose(self, iteration):
         """
-        Run the Bayesian Optimization search.
-        
-        Parameters
-        ----------
-        seed : int or None
-            Random seed for reproducibility (used for initial random sample).
-            
-        Returns
-        -------
-        results : dict
-            Dictionary containing:
-            - 'guesses': list of (lat, lng) tuples in order
-            - 'temperatures': list of observed temperatures
-            - 'best_location': (lat, lng) of highest temperature
-            - 'best_temperature': highest temperature found
+        Propose the point for the given 0-based iteration: a random start,
+        then the UCB maximiser.
         """
+        if iteration == 0:
+            # Start with a random point for initial exploration
+            lat = np.random.uniform(self.lat_min, self.lat_max)
+            lng = np.random.uniform(self.lng_min, self.lng_max)
+            return (lat, lng)
+        return self._select_next_point()
+    
+    def _start_search(self, seed):
+        """Seed the RNG, print the banner and return an empty results dict."""
         if seed is not None:
             np.random.seed(seed)
+        start_run()
         
         results = {
             'guesses': [],
@@ -270,52 +471,54 @@ class BayesianOptimizationSearch:
         print(f"Parameters: κ={self.kappa}, lengthscale={self.lengthscale}")
         print(f"Grid resolution: {self.grid_resolution}x{self.grid_resolution}")
         print(f"Max iterations: {self.n_iterations}\n")
-        
-        for i in range(self.n_iterations):
-            # Select next point
-            if i == 0:
-                # Start with a random point for initial exploration
-                lat = np.random.uniform(self.lat_min, self.lat_max)
-                lng = np.random.uniform(self.lng_min, self.lng_max)
-                next_point = (lat, lng)
-            else:
-                next_point = self._select_next_point()
+        return results
+    
+    def _snapshot_scope(self):
+        """Context in which the cache may answer from snapshot_file, if one is set."""
+        return use_snapshot(self.snapshot_file) if self.snapshot_file else nullcontext()
+    
+    def _get_objective(self):
+        """The objective to query; live temperatures unless one was given."""
+        if self.objective is not None:
+            return self.objective
+        return LiveObjective(search_method="bayesian_optimization", use_cache=True,
+                             cache_radius_km=self.cache_radius_km)
+    
+    def _record_observation(self, iteration, lat, lng, temp, results):
+        """Store one observation (or report a failed fetch) in the model and results."""
+        i = iteration
+        if temp is not None:
+            # Store observation
+            self.X_observed.append((lat, lng))
+            self.y_observed.append(temp)
             
-            lat, lng = next_point
+            # Update normalization
+            self._update_normalization()
             
-            # Query temperature
-            temp = fetch_temperature(lat, lng, search_method="bayesian_optimization", use_cache=True)
+            # Store in results
+            results['guesses'].append((round(lat, 4), round(lng, 4)))
+            results['temperatures'].append(temp)
             
-            if temp is not None:
-                # Store observation
-                self.X_observed.append((lat, lng))
-                self.y_observed.append(temp)
-                
-                # Update normalization
-                self._update_normalization()
-                
-                # Store in results
-                results['guesses'].append((round(lat, 4), round(lng, 4)))
-                results['temperatures'].append(temp)
-                
-                # Find current best
-                best_temp = max(self.y_observed)
-                best_idx = self.y_observed.index(best_temp)
-                best_loc = self.X_observed[best_idx]
-                
-                results['iterations'].append({
-                    'iteration': i + 1,
-                    'lat': round(lat, 4),
-                    'lng': round(lng, 4),
-                    'temp': temp,
-                    'best_temp': best_temp
-                })
-                
-                print(f"[BO] Iter {i+1}/{self.n_iterations}  ({lat:.2f}, {lng:.2f})  "
-                      f"temp={temp:.1f}°C  best={best_temp:.1f}°C")
-            else:
-                print(f"[BO] Iter {i+1}/{self.n_iterations}  Failed to fetch temperature")
-        
+            # Find current best
+            best_temp = max(self.y_observed)
+            best_idx = self.y_observed.index(best_temp)
+            best_loc = self.X_observed[best_idx]
+            
+            results['iterations'].append({
+                'iteration': i + 1,
+                'lat': round(lat, 4),
+                'lng': round(lng, 4),
+                'temp': temp,
+                'best_temp': best_temp
+            })
+            
+            print(f"[BO] Iter {i+1}/{self.n_iterations}  ({lat:.2f}, {lng:.2f})  "
+                  f"temp={temp:.1f}°C  best={best_temp:.1f}°C")
+        else:
+            print(f"[BO] Iter {i+1}/{self.n_iterations}  Failed to fetch temperature")
+    
+    def _finish_search(self, results):
+        """Fill in the best location/temperature and print the summary."""
         # Set best results
         if len(self.y_observed) > 0:
             best_temp = max(self.y_observed)
@@ -337,9 +540,77 @@ class BayesianOptimizationSearch:
         print(f"Total iterations: {len(results['guesses'])}")
         
         return results
+    
+    def run_search(self, seed=None):
+        """
+        Run the Bayesian Optimization search.
+        
+        Parameters
+        ----------
+        seed : int or None
+            Random seed for reproducibility (used for initial random sample).
+            
+        Returns
+        -------
+        results : dict
+            Dictionary containing:
+            - 'guesses': list of (lat, lng) tuples in order
+            - 'temperatures': list of observed temperatures
+            - 'best_location': (lat, lng) of highest temperature
+            - 'best_temperature': highest temperature found
+        """
+        results = self._start_search(seed)
+        objective = self._get_objective()
+        
+        # Observations are written to the results log in batches
+        with self._snapshot_scope(), buffered_results():
+            for i in range(self.n_iterations):
+                lat, lng = self._propose(i)
+                
+                # Query temperature
+                temp = objective(lat, lng)
+                
+                self._record_observation(i, lat, lng, temp, results)
+        
+        return self._finish_search(results)
+    
+    async def arun_search(self, seed=None, semaphore=None):
+        """
+        Async variant of run_search.
+        
+        Proposals are computed on a worker thread and temperatures are
+        awaited with the objective's acall, so several searches (e.g. tuning
+        seeds) can share one event loop and keep their requests in flight
+        concurrently. Note that np.random is process-global; for
+        reproducible concurrent runs pass seed=None and seed up front.
+        
+        Parameters
+        ----------
+        seed : int or None
+            Random seed for reproducibility.
+        semaphore : asyncio.Semaphore or None
+            Shared limiter for requests in flight across searches.
+            
+        Returns
+        -------
+        results : dict
+            Same structure as run_search.
+        """
+        results = self._start_search(seed)
+        objective = self._get_objective()
+        
+        with self._snapshot_scope(), buffered_results():
+            for i in range(self.n_iterations):
+                lat, lng = await asyncio.to_thread(self._propose, i)
+                
+                temp = await objective.acall(lat, lng, semaphore=semaphore)
+                
+                self._record_observation(i, lat, lng, temp, results)
+        
+        return self._finish_search(results)
 
 
-def bayesian_optimization_search(n_iterations=50, config_path="config.yaml", seed=None):
+def bayesian_optimization_search(n_iterations=50, config_path="config.yaml", seed=None, objective=None):
     """
     Convenience function to run Bayesian Optimization search.
     
@@ -351,13 +622,15 @@ def bayesian_optimization_search(n_iterations=50, config_path="config.yaml", see
         Path to configuration file.
     seed : int or None
         Random seed for reproducibility.
+    objective : Objective or None
+        Temperature field to maximize; live temperatures by default.
         
     Returns
     -------
     results : dict
         Search results including guesses, temperatures, and best location.
     """
-    model = BayesianOptimizationSearch(config_path=config_path)
+    model = BayesianOptimizationSearch(config_path=config_path, objective=objective)
     
     # Override n_iterations if provided
     if n_iterations is not None:
@@ -1,6 +1,6 @@
-import pandas as pd
 import os
 import webbrowser
+import sys
 import json
 
 # ==============================================================================
@@ -10,6 +10,9 @@ import json
 # ==============================================================================
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+from src.data.columnar import load_results_frame
+
 DATA_FILE = os.path.join(PROJECT_ROOT, "src", "data", "results.csv")
 OUTPUT_FILE = os.path.join(PROJECT_ROOT, "reports", "peak_hunter.html")
 
@@ -30,7 +33,7 @@ def generate_dashboard():
         print("Error: results.csv not found.")
         return None
 
-    df = pd.read_csv(DATA_FILE)
+    df = load_results_frame(DATA_FILE)
 
     if len(df) == 0:
         print("Error: No data in results.csv.")
@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 import os
 import webbrowser
@@ -8,6 +7,7 @@ import sys
 # Make sure we can import src
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(PROJECT_ROOT)
+from src.data.columnar import load_results_frame
 from src.models.train_model import BayesianOptimizationSearch
 
 # ==============================================================================
@@ -39,13 +39,13 @@ def compute_gp_frames(df):
     
     config_path = os.path.join(PROJECT_ROOT, "config.yaml")
 
-    for step in range(1, len(df) + 1):
-        bo = BayesianOptimizationSearch(config_path=config_path)
-        sub_df = df.iloc[:step]
-        
+    # One model fed one observation per frame, so its GP factorization is
+    # extended incrementally instead of rebuilt for every frame
+    bo = BayesianOptimizationSearch(config_path=config_path)
+    for step, row in enumerate(df.itertuples(index=False), start=1):
         # Populate BO model manually with observed data
-        bo.X_observed = [(row["lat"], row["lng"]) for _, row in sub_df.iterrows()]
-        bo.y_observed = sub_df["temp"].tolist()
+        bo.X_observed.append((row.lat, row.lng))
+        bo.y_observed.append(row.temp)
         
         # We must call _update_normalization so the temperature bounds are correct
         bo._update_normalization()
@@ -94,18 +94,10 @@ def generate_playback():
         print("Error: results.csv not found.")
         return None
 
-    df = pd.read_csv(DATA_FILE)
-    
-    # Filter to only the latest execution run
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    time_diff = df['timestamp'].diff()
-    # A gap of more than 5 seconds indicates a new run (prevents quick back-to-back runs from stacking)
-    new_session_mask = time_diff > pd.Timedelta(seconds=5)
-    df['session_id'] = new_session_mask.cumsum()
-    
-    last_session_id = df['session_id'].iloc[-1]
-    df = df[df['session_id'] == last_session_id].copy()
-    
+    # Load only the latest execution run: a gap of more than 5 seconds
+    # indicates a new run (prevents quick back-to-back runs from stacking)
+    df = load_results_frame(DATA_FILE, session_gap=5)
+
     print(f"Filtered to the latest run ({len(df)} points).")
 
     if len(df) < 2:
@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
@@ -6,6 +5,7 @@ import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 import os
 import webbrowser
+import sys
 
 # ==============================================================================
 # Simple World Map Visualization
@@ -14,6 +14,9 @@ import webbrowser
 # ==============================================================================
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+from src.data.columnar import load_results_frame
+
 DATA_FILE = os.path.join(PROJECT_ROOT, "src", "data", "results.csv")
 OUTPUT_FILE = os.path.join(PROJECT_ROOT, "reports", "temperature_map.png")
 
@@ -25,7 +28,7 @@ def create_map():
         print("Error: results.csv not found.")
         return None
 
-    df = pd.read_csv(DATA_FILE)
+    df = load_results_frame(DATA_FILE)
 
     if len(df) == 0:
         print("Error: No data.")
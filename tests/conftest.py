@@ -0,0 +1,44 @@
+"""Fixtures and helpers shared by the test modules."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.data.http_client import set_session
+
+
+@pytest.fixture
+def isolated_results(tmp_path, monkeypatch):
+    """
+    Point the results log and cache at a fresh temporary file, with no
+    snapshot and the real HTTP session. Modules that talk to the weather
+    layer apply it to every test with
+    pytestmark = pytest.mark.usefixtures("isolated_results").
+    """
+    monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+    monkeypatch.setattr("src.data.data_manager._INTERNAL_CACHE", None)
+    monkeypatch.setattr("src.data.data_manager._SNAPSHOT", None)
+    set_session(None)
+    yield
+    set_session(None)
+
+
+@pytest.fixture
+def mock_get():
+    """Inject a mock session into the shared HTTP client layer."""
+    session = MagicMock()
+    set_session(session)
+    yield session.get
+    set_session(None)
+
+
+def mock_response(payload):
+    """A mock HTTP response whose .json() returns `payload`."""
+    response = MagicMock()
+    response.json.return_value = payload
+    return response
+
+
+def location(temp):
+    """Open-Meteo payload for one location at `temp`."""
+    return {"current": {"temperature_2m": temp}}
@@ -0,0 +1,64 @@
+"""Tests for src/data/async_weather_api.py"""
+
+import asyncio
+import threading
+
+import pytest
+import requests
+
+from src.data.async_weather_api import afetch_temperature, afetch_temperatures
+
+from tests.conftest import location, mock_response
+
+
+pytestmark = pytest.mark.usefixtures("isolated_results")
+
+
+class TestAfetchTemperature:
+    def test_fetches_temperature(self, mock_get):
+        mock_get.return_value = mock_response(location(12.0))
+        assert asyncio.run(afetch_temperature(10.0, 20.0)) == 12.0
+
+    def test_retries_without_blocking(self, mock_get):
+        mock_get.side_effect = [requests.exceptions.ConnectionError("down"), mock_response(location(8.0))]
+        temp = asyncio.run(afetch_temperature(10.0, 20.0, backoff_factor=0))
+        assert temp == 8.0
+        assert mock_get.call_count == 2
+
+    def test_gives_up_after_retries(self, mock_get):
+        mock_get.side_effect = requests.exceptions.ConnectionError("down")
+        assert asyncio.run(afetch_temperature(10.0, 20.0, retries=2, backoff_factor=0)) is None
+
+
+class TestAfetchTemperatures:
+    def test_one_request_per_point(self, mock_get):
+        mock_get.side_effect = lambda url, params, timeout: mock_response(location(float(params["latitude"])))
+
+        temps = asyncio.run(afetch_temperatures([(1, 0), (2, 0), (3, 0)], chunk_size=1, concurrency=2))
+
+        assert temps == [1.0, 2.0, 3.0]
+        assert mock_get.call_count == 3
+
+    def test_multi_location_chunks(self, mock_get):
+        mock_get.return_value = mock_response([location(1.0), location(2.0)])
+
+        temps = asyncio.run(afetch_temperatures([(1, 0), (2, 0)]))
+
+        assert temps == [1.0, 2.0]
+        assert mock_get.call_count == 1
+
+    def test_concurrency_not_capped_by_default_executor(self, mock_get):
+        # The loop's default executor would cap this at min(32, cpu + 4) threads
+        n = 64
+        barrier = threading.Barrier(n, timeout=5)
+
+        def get(url, params, timeout):
+            barrier.wait()
+            return mock_response(location(float(params["latitude"])))
+
+        mock_get.side_effect = get
+        points = [(i * 0.5, 0) for i in range(n)]
+
+        temps = asyncio.run(afetch_temperatures(points, chunk_size=1, concurrency=n, use_cache=False))
+
+        assert temps == [float(lat) for lat, _ in points]
@@ -0,0 +1,90 @@
+"""Tests for src/data/coalescer.py"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.data.async_weather_api import afetch_temperature
+from src.data.coalescer import RequestCoalescer, coalescing
+from src.data.data_manager import load_measurements
+from src.data.stub_server import StubServer
+from src.data.weather_api import fetch_temperature, get_coalescer
+
+
+def _field(lat, lng):
+    return round(lat + lng, 2)
+
+
+pytestmark = pytest.mark.usefixtures("isolated_results")
+
+
+@pytest.fixture
+def server():
+    with StubServer(_field) as stub:
+        yield stub
+
+
+class TestCoalescing:
+    def test_threads_share_requests(self, server):
+        points = [(float(i), 1.0) for i in range(12)]
+        temps = [None] * len(points)
+        barrier = threading.Barrier(len(points))
+
+        def run(i):
+            barrier.wait()
+            temps[i] = fetch_temperature(*points[i], base_url=server.base_url)
+
+        with coalescing(max_delay=0.05) as coalescer:
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(len(points))]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert temps == [_field(lat, lng) for lat, lng in points]
+        assert server.stats["requests"] <= 2
+        assert coalescer.stats["points"] == 12
+        assert len(load_measurements()) == 12
+        assert get_coalescer() is None
+
+    def test_coroutines_share_requests(self, server):
+        points = [(float(i), -1.0) for i in range(20)]
+
+        async def run():
+            return await asyncio.gather(*(afetch_temperature(lat, lng, base_url=server.base_url)
+                                          for lat, lng in points))
+
+        with coalescing(max_delay=0.05):
+            temps = asyncio.run(run())
+        assert temps == [_field(lat, lng) for lat, lng in points]
+        assert server.stats["requests"] == 1
+        assert server.stats["locations"] == 20
+
+    def test_full_batches_flush_early(self, server):
+        coalescer = RequestCoalescer(max_batch=4, max_delay=10.0)
+        futures = [coalescer.submit(float(i), 0.0, server.base_url) for i in range(8)]
+        assert [f.result(timeout=2) for f in futures] == [float(i) for i in range(8)]
+        assert coalescer.stats["requests"] == 2
+        coalescer.close()
+
+    def test_duplicate_cells_requested_once(self, server):
+        coalescer = RequestCoalescer(max_delay=0.05)
+        futures = [coalescer.submit(5.0, 5.00001, server.base_url) for _ in range(3)]
+        assert [f.result(timeout=2) for f in futures] == [10.0] * 3
+        coalescer.close()
+        assert server.stats["locations"] == 1
+
+    def test_close_flushes_queue(self, server):
+        coalescer = RequestCoalescer(max_delay=60.0)
+        future = coalescer.submit(1.0, 2.0, server.base_url)
+        coalescer.close()
+        assert future.result(timeout=0) == 3.0
+        with pytest.raises(RuntimeError):
+            coalescer.submit(1.0, 2.0)
+
+    def test_failed_batch(self):
+        with StubServer(_field, error_rate=1.0) as stub:
+            with coalescing(max_delay=0.01, retries=1):
+                assert fetch_temperature(1.0, 2.0, base_url=stub.base_url) is None
+        assert len(load_measurements()) == 0
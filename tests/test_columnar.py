@@ -0,0 +1,149 @@
+"""Tests for src/data/columnar.py"""
+
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.data.columnar import (
+    columnar_paths, format_timestamp, last_session_start, load_columnar, load_results_frame, sync_columnar,
+)
+from src.data.storage import CSVBackend, RESULT_FIELDS
+
+
+def _write(path, rows, header=True):
+    with open(path, "a", newline="") as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(RESULT_FIELDS)
+        writer.writerows(rows)
+
+
+class TestColumnar:
+    def test_roundtrip_matches_csv(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        _write(path, [
+            ["2026-01-01T00:00:00.123456", 25.123456789, 15.0, 22.9, "random_search"],
+            ["2026-01-01T00:00:01", -10.5, 170.25, -3.4, "bayesian_optimization"],
+        ])
+
+        data, methods = load_columnar(path)
+        assert isinstance(data, np.memmap)
+        assert len(data) == 2
+        assert data["lat"][0] == 25.123456789
+        assert [methods[c] for c in data["method"]] == ["random_search", "bayesian_optimization"]
+        assert format_timestamp(data["timestamp"][0]) == "2026-01-01T00:00:00.123456"
+
+    def test_frame_matches_read_csv(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        _write(path, [["2026-01-01T00:00:00.5", 1.0, 2.0, 3.0, "a"], ["2026-01-01T00:00:07", 4.0, 5.0, 6.0, "b"]])
+
+        df = load_results_frame(path)
+        expected = pd.read_csv(path)
+        assert list(df.columns) == RESULT_FIELDS
+        assert (df["timestamp"] == pd.to_datetime(expected["timestamp"], format="ISO8601")).all()
+        assert df["search_method"].tolist() == ["a", "b"]
+        assert isinstance(df["search_method"].dtype, pd.CategoricalDtype)
+
+    def test_sync_only_parses_appended_rows(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        _write(path, [["2026-01-01T00:00:00", 1.0, 2.0, 3.0, "a"]])
+        assert sync_columnar(path) == 1
+        assert sync_columnar(path) == 0
+
+        _write(path, [["2026-01-01T00:00:01", 4.0, 5.0, 6.0, "b"]], header=False)
+        assert sync_columnar(path) == 1
+        data, methods = load_columnar(path)
+        assert data["temp"].tolist() == [3.0, 6.0]
+        assert methods == ["a", "b"]
+
+    def test_sync_appends_in_place(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        npy_path, _ = columnar_paths(path)
+        _write(path, [["2026-01-01T00:00:00", 1.0, 2.0, 3.0, "a"]])
+        before, _ = load_columnar(path)
+        inode = os.stat(npy_path).st_ino
+
+        for i in range(3):
+            _write(path, [["2026-01-01T00:00:01", 4.0, 5.0, float(i), "b"]], header=False)
+            assert sync_columnar(path) == 1
+        assert os.stat(npy_path).st_ino == inode
+        assert np.load(npy_path)["temp"].tolist() == [3.0, 0.0, 1.0, 2.0]
+        assert before["temp"].tolist() == [3.0]
+
+    def test_interrupted_append_is_discarded(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        npy_path, _ = columnar_paths(path)
+        _write(path, [["2026-01-01T00:00:00", 1.0, 2.0, 3.0, "a"]])
+        sync_columnar(path)
+        # Records written past the header's row count by a sync that never finished
+        with open(npy_path, "ab") as f:
+            f.write(b"\xff" * 50)
+
+        _write(path, [["2026-01-01T00:00:01", 4.0, 5.0, 6.0, "a"]], header=False)
+        assert sync_columnar(path) == 1
+        assert np.load(npy_path)["temp"].tolist() == [3.0, 6.0]
+
+    def test_partial_trailing_line_waits(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        _write(path, [["2026-01-01T00:00:00", 1.0, 2.0, 3.0, "a"]])
+        with open(path, "a") as f:
+            f.write("2026-01-01T00:00:01,4.0,5.")
+        assert sync_columnar(path) == 1
+
+        with open(path, "a") as f:
+            f.write("0,6.0,a\n")
+        assert sync_columnar(path) == 1
+        assert load_columnar(path)[0]["lng"].tolist() == [2.0, 5.0]
+
+    def test_skips_malformed_rows(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        _write(path, [["2026-01-01T00:00:00", "bad", 2.0, 3.0, "a"], ["2026-01-01T00:00:01", 4.0, 5.0, 6.0, "a"]])
+        assert len(load_columnar(path)[0]) == 1
+
+    def test_rebuilds_when_log_is_replaced(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        _write(path, [["2026-01-01T00:00:00", 1.0, 2.0, 3.0, "a"]] * 3)
+        sync_columnar(path)
+
+        (tmp_path / "results.csv").unlink()
+        _write(path, [["2026-01-01T00:00:00", 9.0, 9.0, 9.0, "z"]])
+        data, methods = load_columnar(path)
+        assert data["temp"].tolist() == [9.0]
+        assert methods == ["z"]
+
+    def test_rebuilds_when_log_is_migrated(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        _write(path, [["2026-01-01T00:00:00", 1.0, 2.0, 3.0, "a"]])
+        sync_columnar(path)
+
+        # Rewrites the legacy log with the trace columns (larger, not appended to)
+        CSVBackend(path).append([{"timestamp": "2026-01-01T00:00:01", "lat": 4.0, "lng": 5.0, "temp": 6.0,
+                                  "search_method": "b"}])
+        data, methods = load_columnar(path)
+        assert data["temp"].tolist() == [3.0, 6.0]
+        assert methods == ["a", "b"]
+
+    def test_missing_file(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        data, methods = load_columnar(path)
+        assert len(data) == 0 and methods == []
+        assert not any(os.path.exists(p) for p in columnar_paths(path))
+
+    def test_last_session_only(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        _write(path, [
+            ["2026-01-01T00:00:00", 1.0, 1.0, 1.0, "a"],
+            ["2026-01-01T00:00:01", 2.0, 2.0, 2.0, "a"],
+            ["2026-01-01T00:01:00", 3.0, 3.0, 3.0, "b"],
+            ["2026-01-01T00:01:02", 4.0, 4.0, 4.0, "b"],
+        ])
+        df = load_results_frame(path, session_gap=5)
+        assert df["temp"].tolist() == [3.0, 4.0]
+
+    def test_last_session_start_across_blocks(self):
+        timestamps = np.array([0.0, 1.0, 2.0, 10.0, 11.0, 20.0, 21.0, 22.0])
+        for block in (1, 2, 3, 100):
+            assert last_session_start(timestamps, 5, block=block) == 5
+        assert last_session_start(timestamps[:3], 5) == 0
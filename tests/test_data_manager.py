@@ -3,9 +3,20 @@
 import csv
 import os
 import tempfile
+import threading
+from datetime import datetime, timedelta
 import pytest
 
-from src.data.data_manager import is_valid_coordinate, save_result, load_results, get_cached_result
+from src.data.cache_policy import FixedTTL, ModelUpdateSlots, NoExpiry
+from src.data.data_manager import (
+    is_valid_coordinate, save_result, save_results, load_results, get_cached_result, lookup_cache,
+    cache_stats, reset_cache_stats, set_cache_limit,
+)
+
+
+def _now(**offset):
+    """ISO timestamp relative to now, e.g. _now(hours=-3)."""
+    return (datetime.now() + timedelta(**offset)).isoformat()
 
 
 # ── is_valid_coordinate ──────────────────────────────────────────────────────
@@ -65,7 +76,17 @@ class TestSaveAndLoad:
 
         with open(fake_csv) as f:
             header = f.readline().strip()
-        assert header == "timestamp,lat,lng,temp,search_method"
+        assert header == "timestamp,lat,lng,temp,search_method,run_id,measurement_id,source"
+
+    def test_save_results_bulk(self, tmp_path, monkeypatch):
+        fake_csv = tmp_path / "results.csv"
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
+
+        save_results([(1.0, 2.0, 10.0, "bulk"), (3.0, 4.0, 20.0, "bulk")])
+
+        results = load_results()
+        assert [float(r["temp"]) for r in results] == [10.0, 20.0]
+        assert results[0]["timestamp"] == results[1]["timestamp"]
 
 
 # ── get_cached_result ────────────────────────────────────────────────────────
@@ -82,7 +103,7 @@ class TestGetCachedResult:
     def test_cache_hit_exact(self, tmp_path, monkeypatch):
         fake_csv = tmp_path / "results.csv"
         self._seed_csv(fake_csv, [
-            ["2026-01-01T00:00:00", 25.0, 15.0, 22.9, "test"],
+            [_now(), 25.0, 15.0, 22.9, "test"],
         ])
         monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
 
@@ -91,7 +112,7 @@ class TestGetCachedResult:
     def test_cache_hit_within_tolerance(self, tmp_path, monkeypatch):
         fake_csv = tmp_path / "results.csv"
         self._seed_csv(fake_csv, [
-            ["2026-01-01T00:00:00", 25.0, 15.0, 22.9, "test"],
+            [_now(), 25.0, 15.0, 22.9, "test"],
         ])
         monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
 
@@ -100,7 +121,7 @@ class TestGetCachedResult:
     def test_cache_miss(self, tmp_path, monkeypatch):
         fake_csv = tmp_path / "results.csv"
         self._seed_csv(fake_csv, [
-            ["2026-01-01T00:00:00", 25.0, 15.0, 22.9, "test"],
+            [_now(), 25.0, 15.0, 22.9, "test"],
         ])
         monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
 
@@ -111,3 +132,115 @@ class TestGetCachedResult:
         monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
 
         assert get_cached_result(25.0, 15.0) is None
+
+    def test_cache_hit_within_radius_km(self, tmp_path, monkeypatch):
+        fake_csv = tmp_path / "results.csv"
+        self._seed_csv(fake_csv, [
+            [_now(), 25.0, 15.0, 22.9, "test"],
+        ])
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
+
+        # ~2 km east of the cached point
+        assert get_cached_result(25.0, 15.02) is None
+        assert get_cached_result(25.0, 15.02, radius_km=5.0) == 22.9
+
+    def test_cache_updated_incrementally_on_save(self, tmp_path, monkeypatch):
+        fake_csv = tmp_path / "results.csv"
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
+
+        assert get_cached_result(10.0, 10.0) is None
+        save_result(10.0, 10.0, 18.0, "test")
+        assert get_cached_result(10.00002, 10.0) == 18.0
+
+    def test_stale_entry_is_not_reused(self, tmp_path, monkeypatch):
+        fake_csv = tmp_path / "results.csv"
+        self._seed_csv(fake_csv, [
+            [_now(days=-14), 25.0, 15.0, 22.9, "test"],
+        ])
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
+
+        assert get_cached_result(25.0, 15.0) is None
+        entry = lookup_cache(25.0, 15.0)
+        assert entry.temp == 22.9
+        assert not entry.fresh
+        assert entry.age_seconds == pytest.approx(14 * 24 * 3600, rel=0.01)
+
+    def test_explicit_policies(self, tmp_path, monkeypatch):
+        fake_csv = tmp_path / "results.csv"
+        self._seed_csv(fake_csv, [
+            [_now(hours=-3), 25.0, 15.0, 22.9, "test"],
+        ])
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
+
+        assert get_cached_result(25.0, 15.0, policy=FixedTTL(3600)) is None
+        assert get_cached_result(25.0, 15.0, policy=FixedTTL(4 * 3600)) == 22.9
+        assert get_cached_result(25.0, 15.0, policy=NoExpiry()) == 22.9
+
+    def test_fresh_entry_preferred_over_nearer_stale(self, tmp_path, monkeypatch):
+        fake_csv = tmp_path / "results.csv"
+        self._seed_csv(fake_csv, [
+            [_now(days=-1), 25.0, 15.0, 10.0, "test"],
+            [_now(), 25.0, 15.02, 20.0, "test"],
+        ])
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
+
+        assert get_cached_result(25.0, 15.0, radius_km=5.0) == 20.0
+
+
+    def test_cache_stats_count_hits_and_misses(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+        reset_cache_stats()
+
+        save_result(25.0, 15.0, 22.9, "test")
+        get_cached_result(25.0, 15.0)
+        get_cached_result(0.0, 0.0)
+
+        stats = cache_stats()
+        assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 1, 0)
+        assert stats["entries"] == 1
+
+    def test_cache_limit(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+        monkeypatch.setattr("src.data.data_manager.CACHE_MAX_ENTRIES", None)
+        save_results([(float(i), 0.0, float(i), "test") for i in range(20)])
+        get_cached_result(0.0, 0.0)
+
+        set_cache_limit(5)
+        stats = cache_stats()
+        assert stats["entries"] == 5
+        assert stats["evictions"] == 15
+        assert get_cached_result(0.0, 0.0) == 0.0
+
+    def test_threads_share_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+        monkeypatch.setattr("src.data.data_manager._INTERNAL_CACHE", None)
+        monkeypatch.setattr("src.data.data_manager.CACHE_MAX_ENTRIES", 64)
+        errors = []
+
+        def run(worker):
+            try:
+                for i in range(50):
+                    save_result(worker + i * 0.01, 0.0, float(i), "test")
+                    get_cached_result(worker + i * 0.01, 0.0)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(w,)) for w in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert cache_stats()["entries"] <= 64
+
+
+class TestCachePolicies:
+    def test_model_update_slots(self):
+        policy = ModelUpdateSlots(interval_seconds=900)
+        assert policy.oldest_fresh_time(1000.0) == 900.0
+        assert policy.oldest_fresh_time(900.0) == 900.0
+
+    def test_model_update_slots_offset(self):
+        policy = ModelUpdateSlots(interval_seconds=3600, offset_seconds=600)
+        assert policy.oldest_fresh_time(4000.0) == 600.0
+        assert policy.oldest_fresh_time(4300.0) == 4200.0
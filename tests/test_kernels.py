@@ -0,0 +1,77 @@
+"""Tests for src/models/kernels.py"""
+
+import numpy as np
+import pytest
+
+from src.models.kernels import KERNELS, distances, get_kernel, matern32, matern52, rbf, to_unit_vectors
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    return np.column_stack([rng.uniform(-90, 90, 60), rng.uniform(-180, 180, 60)])
+
+
+class TestUnitVectors:
+    def test_unit_length(self, points):
+        np.testing.assert_allclose(np.linalg.norm(to_unit_vectors(points), axis=1), 1.0)
+
+    def test_poles_and_antimeridian(self):
+        U = to_unit_vectors([(90.0, 0.0), (90.0, 123.0), (0.0, 180.0), (0.0, -180.0)])
+        np.testing.assert_allclose(U[0], U[1], atol=1e-12)
+        np.testing.assert_allclose(U[2], U[3], atol=1e-12)
+
+
+class TestDistances:
+    def test_great_circle(self):
+        U = to_unit_vectors([(0.0, 0.0), (0.0, 90.0), (90.0, 0.0), (0.0, 179.5), (0.0, -179.5)])
+        D = distances(U, U, metric="great_circle")
+        assert D[0, 1] == pytest.approx(90.0)
+        assert D[0, 2] == pytest.approx(90.0)
+        assert D[3, 4] == pytest.approx(1.0)
+
+    def test_meridians_converge(self):
+        # 10 degrees of longitude are far shorter near the pole than at the equator
+        U = to_unit_vectors([(0.0, 0.0), (0.0, 10.0), (80.0, 0.0), (80.0, 10.0)])
+        D = distances(U, U, metric="great_circle")
+        assert D[2, 3] == pytest.approx(10.0 * np.cos(np.radians(80.0)), rel=0.01)
+        assert D[0, 1] == pytest.approx(10.0)
+
+    def test_chordal_close_to_arc_for_nearby_points(self):
+        U = to_unit_vectors([(10.0, 10.0), (10.5, 10.5)])
+        chord = distances(U, U, metric="chordal")[0, 1]
+        arc = distances(U, U, metric="great_circle")[0, 1]
+        assert chord == pytest.approx(arc, rel=1e-4)
+        assert chord < arc
+
+    def test_unknown_metric(self):
+        U = to_unit_vectors([(0.0, 0.0)])
+        with pytest.raises(ValueError):
+            distances(U, U, metric="manhattan")
+
+
+class TestKernels:
+    @pytest.mark.parametrize("name", sorted(KERNELS))
+    def test_positive_definite_and_symmetric(self, name, points):
+        U = to_unit_vectors(points)
+        K = get_kernel(name)(U, U, variance=2.0, lengthscale=30.0)
+        np.testing.assert_allclose(np.diag(K), 2.0)
+        np.testing.assert_allclose(K, K.T, atol=1e-12)
+        assert np.linalg.eigvalsh(K).min() > -1e-8
+
+    def test_rbf_fast_path_matches_formula(self, points):
+        U = to_unit_vectors(points)
+        D = distances(U, U, metric="chordal")
+        expected = 1.5 * np.exp(-D ** 2 / (2 * 20.0 ** 2))
+        np.testing.assert_allclose(rbf(U, U, variance=1.5, lengthscale=20.0), expected, atol=1e-12)
+
+    def test_matern_formulas(self):
+        U = to_unit_vectors([(0.0, 0.0), (0.0, 30.0)])
+        d = distances(U, U, metric="great_circle")[0, 1]
+        r3, r5 = np.sqrt(3) * d / 45.0, np.sqrt(5) * d / 45.0
+        assert matern32(U, U, metric="great_circle")[0, 1] == pytest.approx((1 + r3) * np.exp(-r3))
+        assert matern52(U, U, metric="great_circle")[0, 1] == pytest.approx((1 + r5 + r5 ** 2 / 3) * np.exp(-r5))
+
+    def test_unknown_kernel(self):
+        with pytest.raises(ValueError):
+            get_kernel("periodic")
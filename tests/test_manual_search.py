@@ -86,4 +86,4 @@ class TestManualSearch:
         manual_search()
         _, kwargs = mock_fetch.call_args
         assert kwargs["search_method"] == "manual_search"
-        assert kwargs["use_cache"] is False
+        assert kwargs["use_cache"] is True
@@ -0,0 +1,132 @@
+"""Tests for src/models/objectives.py"""
+
+import asyncio
+import os
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.data.http_client import set_session
+from src.data.snapshot import TemperatureSnapshot, grid_points
+from src.models.objectives import Objective, SnapshotObjective, SyntheticObjective
+from src.models.hyperparameter_tuning import output_suffix
+from src.models.random_search import random_search
+from src.models.train_model import BayesianOptimizationSearch
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.yaml")
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Fails the test if anything reaches the network or the results log."""
+    results_file = tmp_path / "results.csv"
+    monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(results_file))
+    session = MagicMock()
+    set_session(session)
+    yield results_file
+    set_session(None)
+    session.get.assert_not_called()
+    assert not results_file.exists()
+
+
+class TestObjectiveInterface:
+    def test_call_must_be_implemented(self):
+        class Incomplete(Objective):
+            def evaluate_many(self, points):
+                return []
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_batches_fall_back_to_call(self):
+        class Constant(Objective):
+            def __call__(self, lat, lng):
+                return lat + lng
+
+        objective = Constant()
+        assert objective.evaluate_many([(1.0, 2.0), (3.0, 4.0)]) == [3.0, 7.0]
+        assert asyncio.run(objective.aevaluate_many([(1.0, 2.0)])) == [3.0]
+
+
+class TestSyntheticObjective:
+    def test_unseeded(self):
+        objective = SyntheticObjective(seed=None, noise=1.0)
+        assert np.isfinite(objective(10.0, 20.0))
+
+    def test_deterministic_for_a_seed(self):
+        a, b = SyntheticObjective(seed=3), SyntheticObjective(seed=3)
+        assert a(10.0, 20.0) == b(10.0, 20.0)
+        assert a(10.0, 20.0) != SyntheticObjective(seed=4)(10.0, 20.0)
+
+    def test_equator_warmer_than_poles(self):
+        objective = SyntheticObjective(seed=0)
+        assert objective(0.0, 0.0) > objective(85.0, 0.0)
+        assert objective(0.0, 0.0) > objective(-85.0, 0.0)
+
+    def test_batch_matches_single_calls(self):
+        objective = SyntheticObjective(seed=1)
+        points = [(0.0, 0.0), (45.0, 90.0), (-30.0, -120.0)]
+        assert objective.evaluate_many(points) == [objective(lat, lng) for lat, lng in points]
+
+    def test_noise_is_repeatable(self):
+        noisy = [SyntheticObjective(seed=2, noise=1.0)(10.0, 10.0) for _ in range(2)]
+        assert noisy[0] == noisy[1]
+        assert noisy[0] != SyntheticObjective(seed=2)(10.0, 10.0)
+
+    def test_global_max_bounds_samples(self):
+        objective = SyntheticObjective(seed=0)
+        lat, lng, temp = objective.global_max()
+        rng = np.random.default_rng(0)
+        samples = objective.field(rng.uniform(-90, 90, 5000), rng.uniform(-180, 180, 5000))
+        assert samples.max() <= temp + 0.1
+        assert objective(lat, lng) == pytest.approx(temp, abs=0.01)
+
+    def test_injected_latency(self):
+        objective = SyntheticObjective(seed=0, latency=0.05)
+
+        async def run():
+            return await objective.aevaluate_many([(0.0, 0.0)] * 10)
+
+        start = time.perf_counter()
+        assert len(asyncio.run(run())) == 10
+        assert time.perf_counter() - start >= 0.05
+
+
+class TestSnapshotObjective:
+    def test_interpolates_snapshot(self):
+        points, shape = grid_points(90.0)
+        snapshot = TemperatureSnapshot(np.arange(12.0).reshape(shape), 90.0, time.time())
+        objective = SnapshotObjective(snapshot)
+        assert objective(-90.0, -180.0) == 0.0
+        assert objective.global_max() == (90.0, 90.0, 11.0)
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            SnapshotObjective(str(tmp_path / "missing.npz"))
+
+
+class TestSearchesUseObjective:
+    def test_offline_sweeps_keep_live_reports(self, tmp_path):
+        snapshot_path = str(tmp_path / "snapshot.npz")
+        TemperatureSnapshot(np.zeros(grid_points(90.0)[1]), 90.0, time.time()).save(snapshot_path)
+        suffixes = {output_suffix(None), output_suffix(SyntheticObjective(seed=0)),
+                    output_suffix(SnapshotObjective(snapshot_path))}
+        assert suffixes == {"", "_synthetic", "_snapshot"}
+
+    def test_random_search_offline(self, offline):
+        results = random_search(n_iterations=5, seed=0, objective=SyntheticObjective(seed=0))
+        assert all(r["temp"] is not None for r in results)
+        assert results[-1]["best_temp"] == max(r["temp"] for r in results)
+
+    def test_random_search_batch_offline(self, offline):
+        results = random_search(n_iterations=5, seed=0, batch=True, objective=SyntheticObjective(seed=0))
+        assert all(r["temp"] is not None for r in results)
+
+    def test_bayesian_optimization_offline(self, offline):
+        bo = BayesianOptimizationSearch(config_path=CONFIG_PATH, objective=SyntheticObjective(seed=0))
+        bo.n_iterations = 5
+        results = bo.run_search(seed=0)
+        assert len(results["temperatures"]) == 5
+        assert results["best_temperature"] == max(results["temperatures"])
@@ -62,4 +62,33 @@ class TestRandomSearch:
         random_search(n_iterations=1, seed=0)
         _, kwargs = mock_fetch.call_args
         assert kwargs["search_method"] == "random_search"
-        assert kwargs["use_cache"] is False
+        assert kwargs["use_cache"] is True
+
+    @patch("src.models.random_search.fetch_temperatures")
+    def test_batch_uses_single_bulk_fetch(self, mock_fetch_many):
+        mock_fetch_many.return_value = [10.0, None, 30.0]
+        results = random_search(n_iterations=3, seed=0, batch=True)
+
+        mock_fetch_many.assert_called_once()
+        assert len(mock_fetch_many.call_args.args[0]) == 3
+        assert [r["best_temp"] for r in results] == [10.0, 10.0, 30.0]
+
+    @patch("src.models.random_search.fetch_temperatures")
+    @patch("src.models.random_search.fetch_temperature")
+    def test_batch_matches_sequential_points(self, mock_fetch, mock_fetch_many):
+        mock_fetch.return_value = 25.0
+        mock_fetch_many.return_value = [25.0] * 4
+        sequential = random_search(n_iterations=4, seed=7)
+        batched = random_search(n_iterations=4, seed=7, batch=True)
+        assert [(r["lat"], r["lng"]) for r in sequential] == [(r["lat"], r["lng"]) for r in batched]
+
+    @patch("src.models.random_search.afetch_temperatures")
+    def test_concurrency_uses_async_engine(self, mock_afetch):
+        async def fake(points, **kwargs):
+            return [15.0] * len(points)
+        mock_afetch.side_effect = fake
+
+        results = random_search(n_iterations=3, seed=0, concurrency=4)
+
+        assert mock_afetch.call_args.kwargs["concurrency"] == 4
+        assert [r["temp"] for r in results] == [15.0] * 3
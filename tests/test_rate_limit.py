@@ -0,0 +1,138 @@
+"""Tests for src/data/rate_limit.py"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from src.data import rate_limit
+from src.data.async_weather_api import afetch_temperatures
+from src.data.http_client import set_session
+from src.data.rate_limit import (OPEN_METEO, TokenBucket, configure_rate_limit, get_rate_limiter,
+                                 set_rate_limiter)
+from src.data.stub_server import StubServer
+from src.data.weather_api import fetch_temperature
+
+
+@pytest.fixture(autouse=True)
+def no_limiters(monkeypatch):
+    """Starts every test without configured limiters."""
+    monkeypatch.setattr(rate_limit, "_LIMITERS", {})
+    yield
+
+
+def _acquire_many(state_path, rate, burst, n):
+    bucket = TokenBucket(rate, burst, state_path=state_path)
+    for _ in range(n):
+        bucket.acquire()
+
+
+class TestTokenBucket:
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=50, burst=5)
+        start = time.perf_counter()
+        for _ in range(5):
+            bucket.acquire()
+        assert time.perf_counter() - start < 0.05
+        for _ in range(10):
+            bucket.acquire()
+        # 10 tokens beyond the burst at 50/s take 0.2s
+        assert time.perf_counter() - start >= 0.19
+
+    def test_try_acquire(self):
+        bucket = TokenBucket(rate=1, burst=2)
+        assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+
+    def test_pause(self):
+        bucket = TokenBucket(rate=1000, burst=10)
+        bucket.pause(0.1)
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+        assert not bucket.try_acquire()
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_shared_across_threads(self):
+        bucket = TokenBucket(rate=100, burst=1)
+        threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert time.perf_counter() - start >= 0.18
+
+    def test_shared_across_processes(self, tmp_path):
+        state_path = str(tmp_path / "bucket.state")
+        ctx = multiprocessing.get_context("spawn")
+        start = time.perf_counter()
+        procs = [ctx.Process(target=_acquire_many, args=(state_path, 40, 1, 6)) for _ in range(2)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        assert all(p.exitcode == 0 for p in procs)
+        # 12 tokens at 40/s with no burst: the last one is due 11/40s after the first
+        assert time.perf_counter() - start >= 11 / 40
+
+    def test_async_acquire(self):
+        bucket = TokenBucket(rate=100, burst=1)
+
+        async def run():
+            await asyncio.gather(*(bucket.aacquire() for _ in range(11)))
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        assert time.perf_counter() - start >= 0.09
+
+
+class TestRegistry:
+    def test_disabled_by_default(self):
+        assert get_rate_limiter(OPEN_METEO) is None
+
+    def test_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("OPEN_METEO_RATE_LIMIT", "10")
+        monkeypatch.setenv("OPEN_METEO_BURST", "3")
+        monkeypatch.setattr(rate_limit, "RATE_LIMIT_DIR", str(tmp_path))
+        limiter = get_rate_limiter(OPEN_METEO)
+        assert (limiter.rate, limiter.burst) == (10.0, 3)
+        assert limiter.state_path.startswith(str(tmp_path))
+
+
+class TestClients:
+    @pytest.fixture
+    def results(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+        monkeypatch.setattr("src.data.data_manager._INTERNAL_CACHE", None)
+        set_session(None)
+        yield
+        set_session(None)
+
+    def test_paced_client_avoids_throttling(self, results):
+        set_rate_limiter(OPEN_METEO, TokenBucket(rate=20, burst=1))
+        with StubServer(lambda lat, lng: lat + lng, rate_limit=20) as stub:
+            points = [(float(i), 0.0) for i in range(15)]
+            temps = asyncio.run(afetch_temperatures(points, use_cache=False, chunk_size=1, retries=1,
+                                                    base_url=stub.base_url))
+        assert temps == [float(i) for i in range(15)]
+        assert stub.stats["throttled"] == 0
+
+    def test_throttled_response_pauses_limiter(self, results):
+        limiter = TokenBucket(rate=1000, burst=1)
+        set_rate_limiter(OPEN_METEO, limiter)
+        with StubServer(lambda lat, lng: 1.0, rate_limit=1) as stub:
+            assert fetch_temperature(0.0, 0.0, use_cache=False, base_url=stub.base_url) == 1.0
+            start = time.perf_counter()
+            # Throttled once, then retried after the server's Retry-After (1s), not the backoff
+            assert fetch_temperature(1.0, 1.0, use_cache=False, retries=2, backoff_factor=10,
+                                     base_url=stub.base_url) == 1.0
+        assert 0.9 <= time.perf_counter() - start < 5
+        assert stub.stats["throttled"] == 1
+
+    def test_configure_unshared(self):
+        limiter = configure_rate_limit(OPEN_METEO, 5, shared=False)
+        assert limiter.state_path is None
+        assert get_rate_limiter(OPEN_METEO) is limiter
@@ -0,0 +1,108 @@
+"""Tests for src/data/recording.py"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from src.data.http_client import get_session, set_session
+from src.data.recording import RecordingSession, ReplaySession, recording, replaying
+from src.data.weather_api import fetch_temperature, fetch_temperatures
+
+
+pytestmark = pytest.mark.usefixtures("isolated_results")
+
+
+@pytest.fixture
+def live():
+    """A mock 'network' session answering temperature = lat + lng."""
+    session = MagicMock()
+
+    def respond(url, params, timeout):
+        lats = [float(v) for v in str(params["latitude"]).split(",")]
+        lngs = [float(v) for v in str(params["longitude"]).split(",")]
+        locations = [{"current": {"temperature_2m": lat + lng}} for lat, lng in zip(lats, lngs)]
+        response = MagicMock(status_code=200)
+        response.json.return_value = locations if len(locations) > 1 else locations[0]
+        return response
+
+    session.get.side_effect = respond
+    set_session(session)
+    yield session
+    set_session(None)
+
+
+def _tape(path, records):
+    with open(path, "w") as f:
+        for lat, lng, temp in records:
+            f.write(json.dumps({"lat": lat, "lng": lng, "response": {"current": {"temperature_2m": temp}}}) + "\n")
+
+
+class TestRecording:
+    def test_records_single_and_multi_location_requests(self, tmp_path, live):
+        tape = str(tmp_path / "tape.jsonl")
+        with recording(tape):
+            assert fetch_temperature(10.0, 20.0, use_cache=False) == 30.0
+            assert fetch_temperatures([(1.0, 2.0), (3.0, 4.0)], use_cache=False) == [3.0, 7.0]
+        assert get_session() is live
+
+        with open(tape) as f:
+            records = [json.loads(line) for line in f]
+        assert [(r["lat"], r["lng"]) for r in records] == [(10.0, 20.0), (1.0, 2.0), (3.0, 4.0)]
+        assert records[2]["response"]["current"]["temperature_2m"] == 7.0
+
+    def test_other_requests_pass_through(self, tmp_path):
+        inner = MagicMock()
+        session = RecordingSession(str(tmp_path / "tape.jsonl"), session=inner)
+        session.get("https://maps.example/elevation", params={"locations": "1,2"})
+        session.post("https://maps.example/other")
+        inner.post.assert_called_once()
+        assert not (tmp_path / "tape.jsonl").exists()
+
+
+class TestReplay:
+    def test_round_trip_without_network(self, tmp_path, live):
+        tape = str(tmp_path / "tape.jsonl")
+        with recording(tape):
+            recorded = fetch_temperatures([(1.0, 2.0), (3.0, 4.0), (5.0, 6.0)], use_cache=False)
+        live.get.reset_mock()
+
+        with replaying(tape) as session:
+            assert fetch_temperatures([(1.0, 2.0), (3.0, 4.0), (5.0, 6.0)], use_cache=False) == recorded
+            assert fetch_temperature(3.0, 4.0, use_cache=False) == 7.0
+        live.get.assert_not_called()
+        assert session.hits == 4
+
+    def test_repeated_visits_replay_in_order(self, tmp_path):
+        tape = str(tmp_path / "tape.jsonl")
+        _tape(tape, [(1.0, 2.0, 10.0), (1.0, 2.0, 11.0)])
+        session = ReplaySession(tape)
+        params = {"latitude": 1.0, "longitude": 2.0, "current": "temperature_2m"}
+        temps = [session.get("url", params=params).json()["current"]["temperature_2m"] for _ in range(3)]
+        assert temps == [10.0, 11.0, 11.0]
+
+    def test_coordinates_are_normalized(self, tmp_path):
+        tape = str(tmp_path / "tape.jsonl")
+        _tape(tape, [(1.00001, 2.0, 10.0)])
+        with replaying(tape):
+            assert fetch_temperature(1.0, 2.00002, use_cache=False) == 10.0
+
+    def test_nearest_fallback(self, tmp_path):
+        tape = str(tmp_path / "tape.jsonl")
+        _tape(tape, [(1.0, 2.0, 10.0), (40.0, 40.0, 20.0)])
+
+        with replaying(tape) as strict:
+            assert fetch_temperature(1.05, 2.0, use_cache=False, retries=1) is None
+        assert strict.misses == 1
+
+        with replaying(tape, nearest_km=25) as lenient:
+            assert fetch_temperature(1.05, 2.0, use_cache=False) == 10.0
+            assert fetch_temperature(20.0, 20.0, use_cache=False, retries=1) is None
+        assert lenient.nearest_hits == 1
+
+    def test_non_forecast_requests_have_no_network(self, tmp_path):
+        tape = str(tmp_path / "tape.jsonl")
+        _tape(tape, [])
+        with pytest.raises(requests.exceptions.ConnectionError):
+            ReplaySession(tape).get("https://maps.example/elevation", params={"locations": "1,2"})
@@ -0,0 +1,195 @@
+"""Tests for src/data/resilience.py"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.data import resilience
+from src.data.async_weather_api import afetch_temperature
+from src.data.http_client import set_session
+from src.data.rate_limit import OPEN_METEO
+from src.data.resilience import (CircuitBreaker, LatencyHistogram, acall_guarded, call_guarded,
+                                 configure_circuit_breaker, configure_hedging, get_histogram, latency_stats)
+from src.data.stub_server import StubServer
+from src.data.weather_api import fetch_temperature
+
+
+pytestmark = pytest.mark.usefixtures("isolated_results")
+
+
+@pytest.fixture(autouse=True)
+def fresh_resilience_state():
+    """Forget histograms, breakers and counters around every test."""
+    resilience.reset()
+    yield
+    resilience.reset()
+
+
+@pytest.fixture
+def slow_first_session():
+    """Mock session whose first request hangs for a second and later ones answer at once."""
+    session = MagicMock()
+    calls = []
+    lock = threading.Lock()
+
+    def respond(url, params, timeout):
+        with lock:
+            calls.append(time.perf_counter())
+            first = len(calls) == 1
+        if first:
+            time.sleep(1.0)
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"current": {"temperature_2m": 5.0 if first else 7.0}}
+        return response
+
+    session.get.side_effect = respond
+    set_session(session)
+    return calls
+
+
+def _prime(seconds=0.01, n=resilience.HEDGE_MIN_SAMPLES):
+    for _ in range(n):
+        get_histogram(OPEN_METEO).record(seconds)
+
+
+class TestLatencyHistogram:
+    def test_quantiles(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+        assert histogram.quantile(0.5) == pytest.approx(0.05, rel=0.26)
+        assert histogram.quantile(0.95) == pytest.approx(0.095, rel=0.26)
+        assert histogram.quantile(1.0) == pytest.approx(0.1)
+        assert histogram.summary()["count"] == 100
+
+    def test_empty_and_out_of_range(self):
+        histogram = LatencyHistogram(max_latency=1.0)
+        assert histogram.quantile(0.5) is None
+        histogram.record(5.0)
+        assert histogram.quantile(0.99) == 5.0
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        for _ in range(2):
+            breaker.record_failure()
+        breaker.record_success()
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        assert not breaker.allow()
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert not breaker.allow()      # only one probe
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_cancelled_probe_releases_circuit(self):
+        breaker = configure_circuit_breaker(OPEN_METEO, failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        async def cancelled_probe():
+            probe = asyncio.ensure_future(acall_guarded(OPEN_METEO, lambda: asyncio.sleep(10)))
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+        asyncio.run(cancelled_probe())
+        assert breaker.state == CircuitBreaker.OPEN
+        assert get_histogram(OPEN_METEO).count == 0
+        assert breaker.allow()          # the next call probes without waiting out the timeout
+
+    def test_interrupted_probe_releases_circuit(self):
+        breaker = configure_circuit_breaker(OPEN_METEO, failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        def interrupted():
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            call_guarded(OPEN_METEO, interrupted)
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_client_fails_fast(self):
+        configure_circuit_breaker(OPEN_METEO, failure_threshold=2, reset_timeout=60)
+        with StubServer(lambda lat, lng: 1.0, error_rate=1.0) as stub:
+            assert fetch_temperature(0.0, 0.0, use_cache=False, backoff_factor=0, base_url=stub.base_url) is None
+            start = time.perf_counter()
+            assert fetch_temperature(1.0, 1.0, use_cache=False, base_url=stub.base_url) is None
+            assert time.perf_counter() - start < 0.1
+        assert stub.stats["requests"] == 2
+        assert latency_stats(OPEN_METEO)["circuit"] == "open"
+        assert latency_stats(OPEN_METEO)["rejected"] == 2
+
+    def test_client_errors_do_not_open_circuit(self):
+        breaker = configure_circuit_breaker(OPEN_METEO, failure_threshold=1)
+        with StubServer(lambda lat, lng: 1.0) as stub:
+            # Wrong path: the server answers 404, which says nothing about its health
+            assert fetch_temperature(0.0, 0.0, use_cache=False, backoff_factor=0,
+                                     base_url=stub.base_url + "/missing") is None
+        assert stub.stats["requests"] == 3
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestHedging:
+    def test_disabled_by_default(self, slow_first_session):
+        _prime()
+        assert fetch_temperature(0.0, 0.0, use_cache=False) == 5.0
+        assert len(slow_first_session) == 1
+
+    def test_needs_samples(self, slow_first_session):
+        configure_hedging(OPEN_METEO, 0.95)
+        assert resilience.hedge_delay(OPEN_METEO) is None
+
+    def test_hedge_wins_tail(self, slow_first_session):
+        configure_hedging(OPEN_METEO, 0.95)
+        _prime()
+        start = time.perf_counter()
+        assert fetch_temperature(0.0, 0.0, use_cache=False) == 7.0
+        assert time.perf_counter() - start < 0.5
+        stats = latency_stats(OPEN_METEO)
+        assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+        # The hedge fired after the p95 delay, not straight away
+        assert slow_first_session[1] - slow_first_session[0] >= resilience.HEDGE_MIN_DELAY
+
+    def test_async_hedge_wins_tail(self, slow_first_session):
+        configure_hedging(OPEN_METEO, 0.95)
+        _prime()
+
+        async def run():
+            start = time.perf_counter()
+            temp = await afetch_temperature(0.0, 0.0, use_cache=False)
+            return temp, time.perf_counter() - start
+
+        # asyncio.run itself still waits for the abandoned worker thread
+        temp, elapsed = asyncio.run(run())
+        assert temp == 7.0
+        assert elapsed < 0.5
+        assert latency_stats(OPEN_METEO)["hedge_wins"] == 1
+
+    def test_latencies_recorded(self):
+        with StubServer(lambda lat, lng: 1.0, latency=0.02) as stub:
+            for i in range(3):
+                fetch_temperature(float(i), 0.0, use_cache=False, base_url=stub.base_url)
+        stats = latency_stats(OPEN_METEO)
+        assert stats["count"] == 3
+        assert stats["p50"] >= 0.02
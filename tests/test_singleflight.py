@@ -0,0 +1,103 @@
+"""Tests for src/data/singleflight.py"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.data.async_weather_api import afetch_temperature
+from src.data.data_manager import load_measurements, load_results
+from src.data.singleflight import SingleFlight
+from src.data.stub_server import StubServer
+from src.data.weather_api import fetch_temperature
+
+
+pytestmark = pytest.mark.usefixtures("isolated_results")
+
+
+def _run_threads(target, n):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def run(i):
+        barrier.wait()
+        results[i] = target()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.1)
+            return 42
+
+        results = _run_threads(lambda: flight.do("key", work), 6)
+        assert len(calls) == 1
+        assert sorted(results, key=lambda r: not r[1]) == [(42, True)] + [(42, False)] * 5
+        assert (flight.leaders, flight.followers) == (1, 5)
+        assert len(flight) == 0
+
+    def test_errors_are_shared(self):
+        flight = SingleFlight()
+
+        def fail():
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                flight.do("key", fail)
+            except ValueError as e:
+                return str(e)
+
+        assert _run_threads(call, 3) == ["boom"] * 3
+        # A later call starts afresh
+        assert flight.do("key", lambda: 1) == (1, True)
+
+    def test_distinct_keys_do_not_wait(self):
+        flight = SingleFlight()
+        assert flight.do("a", lambda: 1) == (1, True)
+        assert flight.do("b", lambda: 2) == (2, True)
+
+
+class TestFetchDeduplication:
+    def test_threads_fetch_a_cell_once(self):
+        with StubServer(lambda lat, lng: 12.5, latency=0.1) as stub:
+            temps = _run_threads(lambda: fetch_temperature(10.0, 20.0, base_url=stub.base_url), 8)
+        assert temps == [12.5] * 8
+        assert stub.stats["requests"] == 1
+        assert len(load_measurements()) == 1
+        assert len(load_results()) == 8
+
+    def test_coroutines_fetch_a_cell_once(self):
+        with StubServer(lambda lat, lng: 12.5, latency=0.1) as stub:
+            async def run():
+                return await asyncio.gather(*(afetch_temperature(10.00001, 20.0, base_url=stub.base_url)
+                                              for _ in range(5)))
+
+            temps = asyncio.run(run())
+        assert temps == [12.5] * 5
+        assert stub.stats["requests"] == 1
+        assert len(load_results()) == 5
+
+    def test_without_cache_every_call_fetches(self):
+        with StubServer(lambda lat, lng: 12.5, latency=0.05) as stub:
+            _run_threads(lambda: fetch_temperature(10.0, 20.0, use_cache=False, base_url=stub.base_url), 3)
+        assert stub.stats["requests"] == 3
+
+    def test_failures_are_not_remembered(self):
+        with StubServer(lambda lat, lng: 12.5, error_rate=1.0) as stub:
+            assert fetch_temperature(10.0, 20.0, retries=1, base_url=stub.base_url) is None
+            stub.error_rate = 0.0
+            assert fetch_temperature(10.0, 20.0, retries=1, base_url=stub.base_url) == 12.5
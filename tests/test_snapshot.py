@@ -0,0 +1,163 @@
+"""Tests for src/data/snapshot.py"""
+
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.data import data_manager
+from src.data.http_client import set_session
+from src.data.storage import SQLiteBackend
+from src.data.snapshot import TemperatureSnapshot, grid_points, load_snapshot, prefetch_global_snapshot, use_snapshot
+from src.data.weather_api import fetch_temperature
+from src.models.random_search import random_search
+
+
+pytestmark = pytest.mark.usefixtures("isolated_results")
+
+
+def _snapshot(resolution=90.0, fetched_at=None):
+    """3 x 4 grid whose value is lat + lng / 10 at each grid point."""
+    points, shape = grid_points(resolution)
+    temps = np.array([lat + lng / 10 for lat, lng in points]).reshape(shape)
+    return TemperatureSnapshot(temps, resolution, time.time() if fetched_at is None else fetched_at)
+
+
+class TestTemperatureSnapshot:
+    def test_grid_shape(self):
+        points, shape = grid_points(1.0)
+        assert shape == (181, 360)
+        assert points[0] == (-90.0, -180.0)
+        assert points[-1] == (90.0, 179.0)
+
+    def test_lookup_at_grid_points_and_between(self):
+        snapshot = _snapshot()
+        assert snapshot.lookup(0.0, 0.0) == 0.0
+        assert snapshot.lookup(90.0, 90.0) == 99.0
+        assert snapshot.lookup(45.0, 0.0) == 45.0
+        assert snapshot.lookup(0.0, 45.0) == 4.5
+
+    def test_lookup_wraps_antimeridian(self):
+        snapshot = _snapshot()
+        # Halfway between lng 90 (9.0) and lng -180 (-18.0)
+        assert snapshot.lookup(0.0, 135.0) == -4.5
+
+    def test_missing_corners_are_skipped(self):
+        snapshot = _snapshot()
+        snapshot.temps[1, 2] = np.nan   # (0, 0)
+        assert snapshot.lookup(0.0, 0.0) is None
+        assert snapshot.lookup(0.0, 45.0) == 9.0
+
+    def test_global_max(self):
+        assert _snapshot().global_max() == (90.0, 90.0, 99.0)
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / "snapshot.npz")
+        assert load_snapshot(path) is None
+        snapshot = _snapshot(fetched_at=123.0)
+        snapshot.save(path)
+
+        loaded = load_snapshot(path)
+        assert loaded.fetched_at == 123.0
+        assert loaded.temps.dtype == np.float32
+        np.testing.assert_array_equal(loaded.temps, snapshot.temps)
+
+
+class TestPrefetch:
+    def test_fills_grid_with_multi_location_calls(self, tmp_path):
+        session = MagicMock()
+
+        def respond(url, params, timeout):
+            n = len(params["latitude"].split(","))
+            response = MagicMock()
+            response.json.return_value = [{"current": {"temperature_2m": 20.0}}] * n
+            return response
+
+        session.get.side_effect = respond
+        set_session(session)
+        started = time.time()
+        try:
+            snapshot = prefetch_global_snapshot(90.0, path=str(tmp_path / "snapshot.npz"), chunk_size=5)
+        finally:
+            set_session(None)
+
+        assert session.get.call_count == 3     # 12 grid points in chunks of 5
+        assert snapshot.temps.shape == (3, 4)
+        assert (snapshot.temps == 20.0).all()
+        assert snapshot.fetched_at >= started
+        assert load_snapshot(str(tmp_path / "snapshot.npz")) is not None
+
+
+class TestCacheFallback:
+    def test_fresh_snapshot_answers_cache_misses(self, tmp_path):
+        path = str(tmp_path / "snapshot.npz")
+        _snapshot().save(path)
+        data_manager.save_result(10.0, 10.0, 5.0, "test")
+
+        session = MagicMock()
+        set_session(session)
+        try:
+            with use_snapshot(path):
+                assert fetch_temperature(45.0, 0.0, search_method="test") == 45.0
+        finally:
+            set_session(None)
+
+        session.get.assert_not_called()
+        # Logged as a visit, not as a new measurement
+        assert data_manager.load_results()[-1]["temp"] == "45.0"
+        assert len(data_manager.load_measurements()) == 1
+        assert data_manager.cache_stats()["snapshot"] >= 1
+
+    def test_snapshot_visits_reference_no_measurement(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        data_manager.set_storage(db)
+        try:
+            data_manager.set_snapshot(_snapshot())
+            data_manager.save_result(10.0, 10.0, 5.0, "test")
+            session = MagicMock()
+            set_session(session)
+            try:
+                assert fetch_temperature(45.0, 0.0, search_method="test") == 45.0
+                assert fetch_temperature(10.0, 10.0, search_method="test") == 5.0
+            finally:
+                set_session(None)
+        finally:
+            data_manager.set_storage(None)
+
+        measurement_ids = {m["id"] for m in db.load_measurements()}
+        visits = db.load()
+        assert [v["source"] for v in visits] == ["api", "snapshot", "cache"]
+        assert visits[1]["measurement_id"] is None
+        # Every other visit joins to a real measurement
+        assert {visits[0]["measurement_id"], visits[2]["measurement_id"]} <= measurement_ids
+
+    def test_expired_snapshot_is_ignored(self):
+        data_manager.set_snapshot(_snapshot(fetched_at=time.time() - 7 * 3600))
+        assert data_manager.get_cached_result(45.0, 0.0) is None
+
+    def test_snapshot_outlives_cache_slot(self):
+        # Older than any 15-minute cache slot, but within the snapshot's own max age
+        data_manager.set_snapshot(_snapshot(fetched_at=time.time() - 3600))
+        assert data_manager.get_cached_result(45.0, 0.0) == 45.0
+
+    def test_scope_restores_previous_snapshot(self, tmp_path):
+        path = str(tmp_path / "snapshot.npz")
+        _snapshot().save(path)
+        with use_snapshot(path) as snapshot:
+            assert data_manager.get_cached_result(45.0, 0.0) == 45.0
+            assert snapshot is not None
+        assert data_manager.get_cached_result(45.0, 0.0) is None
+
+    def test_search_does_not_leak_snapshot(self, tmp_path):
+        path = str(tmp_path / "snapshot.npz")
+        _snapshot().save(path)
+        session = MagicMock()
+        set_session(session)
+        try:
+            results = random_search(n_iterations=3, seed=0, snapshot_file=path)
+        finally:
+            set_session(None)
+        assert all(r["temp"] is not None for r in results)
+        session.get.assert_not_called()
+        assert data_manager.get_cached_result(45.0, 0.0) is None
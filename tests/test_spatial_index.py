@@ -0,0 +1,183 @@
+"""Tests for src/data/spatial_index.py"""
+
+import threading
+
+import pytest
+
+from src.data.spatial_index import SphericalBucketIndex, haversine_km, KM_PER_DEGREE
+
+
+class TestHaversine:
+    def test_zero_distance(self):
+        assert haversine_km(10, 20, 10, 20) == 0
+
+    def test_one_degree_along_meridian(self):
+        assert haversine_km(0, 0, 1, 0) == pytest.approx(KM_PER_DEGREE)
+
+    def test_longitude_wraparound(self):
+        assert haversine_km(0, 179.9, 0, -179.9) == pytest.approx(0.2 * KM_PER_DEGREE)
+
+
+class TestSphericalBucketIndex:
+    def test_exact_lookup_and_overwrite(self):
+        index = SphericalBucketIndex()
+        index.add(25.0, 15.0, 10.0)
+        index.add(25.00001, 15.00001, 12.0)  # same 4-decimal key
+        assert len(index) == 1
+        assert index.get(25.0, 15.0) == 12.0
+
+    def test_nearest_within_radius(self):
+        index = SphericalBucketIndex()
+        index.add(25.0, 15.0, 10.0)
+        index.add(25.0, 15.3, 20.0)
+
+        slot, dist = index.nearest(25.0, 15.02, radius_km=5.0)
+        assert index.values[slot] == 10.0
+        assert dist == pytest.approx(haversine_km(25.0, 15.02, 25.0, 15.0))
+
+    def test_nearest_outside_radius(self):
+        index = SphericalBucketIndex()
+        index.add(25.0, 15.0, 10.0)
+        assert index.nearest(25.0, 16.0, radius_km=5.0) is None
+
+    def test_crosses_antimeridian(self):
+        index = SphericalBucketIndex()
+        index.add(0.0, 179.99, 30.0)
+        slot, _ = index.nearest(0.0, -179.99, radius_km=5.0)
+        assert index.values[slot] == 30.0
+
+    def test_near_pole_uses_true_distance(self):
+        index = SphericalBucketIndex()
+        # 90 degrees of longitude apart, but only ~12 km apart at this latitude
+        index.add(89.9, 0.0, -30.0)
+        slot, dist = index.nearest(89.9, 90.0, radius_km=20.0)
+        assert index.values[slot] == -30.0
+        assert dist < 20.0
+
+    def test_matches_brute_force(self):
+        import random
+        rng = random.Random(0)
+        index = SphericalBucketIndex(cell_deg=1.0)
+        points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(500)]
+        for i, (lat, lng) in enumerate(points):
+            index.add(lat, lng, float(i))
+
+        for _ in range(50):
+            qlat, qlng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            dists = [haversine_km(qlat, qlng, lat, lng) for lat, lng in points]
+            best = min(range(len(points)), key=dists.__getitem__)
+            hit = index.nearest(qlat, qlng, radius_km=1500.0)
+            if dists[best] <= 1500.0:
+                assert index.values[hit[0]] == float(best)
+            else:
+                assert hit is None
+
+    def test_newer_observation_wins(self):
+        index = SphericalBucketIndex()
+        index.add(25.0, 15.0, 10.0, observed_at=200.0)
+        index.add(25.0, 15.0, 12.0, observed_at=100.0)
+        assert index.get(25.0, 15.0) == 10.0
+
+    def test_min_time_skips_expired_entries(self):
+        index = SphericalBucketIndex()
+        index.add(25.0, 15.0, 10.0, observed_at=100.0)
+        index.add(25.0, 15.03, 20.0, observed_at=500.0)
+
+        assert index.values[index.nearest(25.0, 15.0, radius_km=5.0)[0]] == 10.0
+        assert index.values[index.nearest(25.0, 15.0, radius_km=5.0, min_time=300.0)[0]] == 20.0
+        assert index.nearest(25.0, 15.0, radius_km=1.0, min_time=300.0) is None
+
+    def test_item_ids(self):
+        index = SphericalBucketIndex()
+        index.add(25.0, 15.0, 10.0, item_id="abcdef0123456789")
+        index.add(26.0, 15.0, 11.0)
+        assert index.item_id(index.nearest(25.0, 15.0, radius_km=1.0)[0]) == "abcdef0123456789"
+        assert index.item_id(index.nearest(26.0, 15.0, radius_km=1.0)[0]) is None
+        for bad in ("x" * 17, "not-a-hex-id-xyz", "abcdef01"):
+            with pytest.raises(ValueError):
+                index.add(27.0, 15.0, 12.0, item_id=bad)
+
+    def test_entry_round_trips_float32_storage(self):
+        index = SphericalBucketIndex()
+        index.add(25.0, 15.0, 22.9, observed_at=1_760_000_000.4, item_id="00000000000000ff")
+        slot, _ = index.nearest(25.0, 15.0, radius_km=1.0)
+        assert index.entry(slot) == (22.9, 1_760_000_000.0, "00000000000000ff")
+        assert index.times[slot] == 1_760_000_000.0
+        assert index.nearest(25.0, 15.0, radius_km=1.0, min_time=1_760_000_001.0) is None
+
+    def test_compact_storage(self):
+        index = SphericalBucketIndex()
+        for i in range(5000):
+            index.add(i * 0.01, i * 0.02, float(i), observed_at=1.7e9 + i, item_id=f"{i + 1:016x}")
+        per_entry = sum(getattr(index, name).nbytes for name in
+                        ("_lats", "_lngs", "_values", "_times", "_ids", "_used", "_keys", "_next", "_table"))
+        assert per_entry / len(index) < 100
+
+    def test_grows_past_initial_capacity(self):
+        index = SphericalBucketIndex()
+        for i in range(1000):
+            index.add(i * 0.01, i * 0.02, float(i))
+        assert len(index) == 1000
+        assert all(index.get(i * 0.01, i * 0.02) == float(i) for i in range(1000))
+
+
+class TestBoundedIndex:
+    def test_evicts_least_recently_used(self):
+        index = SphericalBucketIndex(max_entries=10)
+        for i in range(10):
+            index.add(float(i), 0.0, float(i))
+        # Touch the oldest entry so it survives the next eviction
+        assert index.get(0.0, 0.0) == 0.0
+
+        index.add(50.0, 50.0, 50.0)
+        assert len(index) == 10
+        assert index.stats()["evictions"] == 1
+        assert index.get(0.0, 0.0) == 0.0
+        assert index.get(1.0, 0.0) is None
+        assert index.get(50.0, 50.0) == 50.0
+
+    def test_queries_still_work_after_eviction(self):
+        index = SphericalBucketIndex(max_entries=100)
+        for i in range(250):
+            index.add(i * 0.1, 10.0, float(i))
+        assert len(index) <= 100
+        slot, _ = index.nearest(249 * 0.1, 10.0, radius_km=1.0)
+        assert index.values[slot] == 249.0
+        assert index.nearest(0.0, 10.0, radius_km=1.0) is None
+
+
+    def test_recency_clock_wraps(self, monkeypatch):
+        monkeypatch.setattr("src.data.spatial_index._MAX_CLOCK", 50)
+        index = SphericalBucketIndex(max_entries=10)
+        for i in range(200):
+            index.add(float(i % 30), 0.0, float(i))
+            assert index.get(float(i % 30), 0.0) == float(i)
+        assert len(index) <= 10
+
+
+class TestConcurrentAccess:
+    def test_threads_add_and_query(self):
+        index = SphericalBucketIndex(max_entries=500)
+        errors = []
+        barrier = threading.Barrier(8)
+
+        def run(worker):
+            try:
+                barrier.wait()
+                for i in range(400):
+                    # Held across both calls: other threads could otherwise evict the entry in between
+                    with index.lock:
+                        index.add(worker * 10.0 + i * 0.01, i * 0.05, float(i), observed_at=float(i))
+                        hit = index.nearest(worker * 10.0 + i * 0.01, i * 0.05, radius_km=1.0)
+                        assert hit is not None and index.values[hit[0]] == float(i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(w,)) for w in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert len(index) <= 500
+        assert index.stats()["evictions"] == 8 * 400 - len(index)
@@ -0,0 +1,400 @@
+"""Tests for src/data/storage.py"""
+
+import csv
+import multiprocessing
+import sqlite3
+import time
+from datetime import datetime
+
+from src.data.storage import (BufferedResultWriter, CSVBackend, SQLiteBackend, RESULT_FIELDS, VISIT_FIELDS,
+                              new_measurement_id, write_csv)
+from src.data import data_manager
+from src.features.build_features import load_results as load_evaluation_results
+
+
+def _row(lat, lng, temp, method="test", ts="2026-01-01T00:00:00", run_id=None):
+    return {"timestamp": ts, "lat": lat, "lng": lng, "temp": temp, "search_method": method, "run_id": run_id}
+
+
+class TestSQLiteBackend:
+    def test_uses_wal_mode(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        mode = sqlite3.connect(db.path).execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_append_and_load_in_order(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        db.append([_row(1.0, 2.0, 10.0), _row(3.0, 4.0, 20.0)])
+
+        rows = db.load()
+        assert [r["temp"] for r in rows] == [10.0, 20.0]
+        assert db.count() == 2
+
+    def test_filters(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        db.append([
+            _row(1.0, 2.0, 10.0, method="random_search", run_id="a"),
+            _row(3.0, 4.0, 20.0, method="bayesian_optimization", run_id="b", ts="2026-02-01T00:00:00"),
+        ])
+        assert len(db.load(search_method="random_search")) == 1
+        assert db.load(run_id="b")[0]["temp"] == 20.0
+        assert len(db.load(since="2026-01-15")) == 1
+
+    def test_lookup_uses_latest_measurement_in_cell(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        db.append_measurements([
+            {"id": "a", "timestamp": "2026-01-01T00:00:00", "lat": 25.0, "lng": 15.0, "temp": 10.0},
+            {"id": "b", "timestamp": "2026-01-01T01:00:00", "lat": 25.00001, "lng": 15.0, "temp": 12.0},
+        ])
+        assert db.lookup(25.0, 15.0) == 12.0
+        assert db.lookup(0.0, 0.0) is None
+
+    def test_csv_roundtrip(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        src_csv = tmp_path / "in.csv"
+        with open(src_csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(RESULT_FIELDS)
+            writer.writerow(["2026-01-01T00:00:00", 25.0, 15.0, 22.9, "random_search"])
+            writer.writerow(["2026-01-01T00:00:01", "bad", "bad", "bad", "broken"])
+
+        assert db.import_csv(str(src_csv)) == 1
+
+        out_csv = tmp_path / "out.csv"
+        db.export_csv(str(out_csv))
+        rows = load_evaluation_results(str(out_csv))
+        assert len(rows) == 1
+        assert rows[0]["temp"] == 22.9
+
+
+class TestDataManagerBackend:
+    def test_save_and_cache_through_sqlite(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        data_manager.set_storage(db)
+        try:
+            data_manager.save_result(25.0, 15.0, 22.9, "test")
+            assert db.count() == 1
+            assert db.load()[0]["run_id"] == data_manager.get_run_id()
+            assert data_manager.get_cached_result(25.0, 15.0) == 22.9
+        finally:
+            data_manager.set_storage(None)
+
+    def test_csv_backend_stores_visit_trace(self, tmp_path):
+        backend = CSVBackend(str(tmp_path / "results.csv"))
+        backend.append([dict(_row(1.0, 2.0, 3.0, run_id="x"), measurement_id="m1", source="api"),
+                        dict(_row(4.0, 5.0, 6.0, run_id="y"), source="snapshot")])
+        with open(backend.path) as f:
+            # The legacy columns come first, so readers that pick columns by name are unaffected
+            assert f.readline().strip() == ",".join(VISIT_FIELDS)
+
+        visits = backend.load()
+        assert [(v["run_id"], v["measurement_id"], v["source"]) for v in visits] == [
+            ("x", "m1", "api"), ("y", None, "snapshot")]
+        assert [v["temp"] for v in backend.load(run_id="y")] == ["6.0"]
+        assert backend.load(run_id="z") == []
+        assert backend.read_results_since(0)[0][1]["source"] == "snapshot"
+
+    def test_data_manager_trace_through_csv(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+        monkeypatch.setattr("src.data.data_manager._INTERNAL_CACHE", None)
+        measurement_id = data_manager.save_result(25.0, 15.0, 22.9, "test")
+        entry = data_manager.get_cached_entry(25.0, 15.0)
+        data_manager.record_visit(25.0, 15.0, entry.temp, "test", entry.measurement_id)
+
+        visits = CSVBackend(str(tmp_path / "results.csv")).load(run_id=data_manager.get_run_id())
+        assert [v["source"] for v in visits] == ["api", "cache"]
+        assert visits[0]["measurement_id"] == visits[1]["measurement_id"] == measurement_id
+
+
+class TestBufferedResultWriter:
+    def test_flushes_at_size_threshold(self, tmp_path):
+        backend = CSVBackend(str(tmp_path / "results.csv"))
+        writer = BufferedResultWriter(backend, max_rows=3, max_delay=None)
+
+        writer.append([_row(1.0, 1.0, 1.0), _row(2.0, 2.0, 2.0)])
+        assert backend.load() == []
+        assert len(writer) == 2
+
+        writer.append([_row(3.0, 3.0, 3.0)])
+        assert len(backend.load()) == 3
+        assert len(writer) == 0
+        writer.close()
+
+    def test_flushes_after_delay_without_new_rows(self, tmp_path):
+        backend = CSVBackend(str(tmp_path / "results.csv"))
+        writer = BufferedResultWriter(backend, max_rows=100, max_delay=0.05)
+
+        writer.append([_row(1.0, 1.0, 1.0)])
+        time.sleep(0.3)
+        assert len(backend.load()) == 1
+        writer.close()
+
+    def test_close_flushes_with_fsync(self, tmp_path):
+        backend = SQLiteBackend(str(tmp_path / "results.db"))
+        writer = BufferedResultWriter(backend, max_rows=100, max_delay=None, fsync=True)
+
+        writer.append([_row(1.0, 1.0, 1.0)])
+        writer.close()
+        assert backend.count() == 1
+
+
+class TestBufferedResults:
+    def test_rows_buffered_until_block_exits(self, tmp_path, monkeypatch):
+        fake_csv = tmp_path / "results.csv"
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(fake_csv))
+
+        with data_manager.buffered_results(max_delay=None):
+            data_manager.save_result(1.0, 1.0, 10.0, "test")
+            data_manager.save_result(2.0, 2.0, 20.0, "test")
+            assert not fake_csv.exists()
+            # Reads see pending rows
+            assert len(data_manager.load_results()) == 2
+            data_manager.save_result(3.0, 3.0, 30.0, "test")
+
+        assert len(CSVBackend(str(fake_csv)).load()) == 3
+
+    def test_cache_misses_do_not_flush(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+        monkeypatch.setattr("src.data.data_manager._INTERNAL_CACHE", None)
+        appends = []
+        monkeypatch.setattr(CSVBackend, "append", lambda self, rows, fsync=False: appends.append(rows))
+
+        with data_manager.buffered_results(max_rows=500, max_delay=None):
+            data_manager.save_result(0.0, 0.0, 5.0, "test")     # buffered before the cache is loaded
+            for i in range(1, 20):
+                assert data_manager.get_cached_result(float(i), float(i)) is None
+                data_manager.save_result(float(i), float(i), 10.0, "test")
+            assert appends == []
+            assert data_manager.get_cached_result(0.0, 0.0) == 5.0
+            assert data_manager.get_cached_result(7.0, 7.0) == 10.0
+        assert len(appends) == 1 and len(appends[0]) == 20
+
+    def test_nested_blocks_share_buffer(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+
+        with data_manager.buffered_results() as outer:
+            with data_manager.buffered_results() as inner:
+                assert inner is outer
+
+
+class TestMeasurementTable:
+    def _legacy_rows(self):
+        return [
+            _row(25.0, 15.0, 22.9, ts="2026-01-01T00:00:00"),
+            _row(25.0, 15.0, 22.9, ts="2026-01-01T00:05:00"),   # re-logged cache hit
+            _row(10.0, 20.0, 18.0, ts="2026-01-01T00:06:00"),
+        ]
+
+    def _legacy_db(self, path):
+        """A database in the layout used before measurements were separated."""
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE results (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, "
+                     "lat REAL NOT NULL, lng REAL NOT NULL, qlat INTEGER NOT NULL, qlng INTEGER NOT NULL, "
+                     "temp REAL NOT NULL, search_method TEXT NOT NULL, run_id TEXT)")
+        conn.executemany("INSERT INTO results (timestamp, lat, lng, qlat, qlng, temp, search_method) "
+                         "VALUES (?, ?, ?, 0, 0, ?, ?)",
+                         [(r["timestamp"], r["lat"], r["lng"], r["temp"], r["search_method"])
+                          for r in self._legacy_rows()])
+        conn.commit()
+        conn.close()
+
+    def test_csv_bootstraps_from_legacy_log(self, tmp_path):
+        write_csv(str(tmp_path / "results.csv"), self._legacy_rows())
+        backend = CSVBackend(str(tmp_path / "results.csv"))
+
+        measurements = backend.load_measurements()
+        assert [float(m["temp"]) for m in measurements] == [22.9, 18.0]
+        assert measurements[0]["timestamp"] == "2026-01-01T00:00:00"
+        # Persisted, and the visits are linked to them
+        assert (tmp_path / "results.measurements.csv").exists()
+        visits = backend.load()
+        assert visits[0]["measurement_id"] == visits[1]["measurement_id"] == measurements[0]["id"]
+        assert visits[2]["measurement_id"] == measurements[1]["id"]
+        assert len(CSVBackend(str(tmp_path / "results.csv")).load_measurements()) == 2
+
+    def test_csv_version_1_log_gains_trace_columns(self, tmp_path):
+        # Separated measurement table, but a visit log in the five legacy columns
+        write_csv(str(tmp_path / "results.csv"), self._legacy_rows() + [_row(45.0, 0.0, 45.0)])
+        with open(tmp_path / "results.measurements.csv", "w") as f:
+            f.write("id,timestamp,lat,lng,temp\na,2026-01-01T00:00:00,25.0,15.0,22.9\n"
+                    "b,2026-01-01T00:06:00,10.0,20.0,18.0\n")
+        (tmp_path / "results.measurements.csv.version").write_text("1\n")
+        backend = CSVBackend(str(tmp_path / "results.csv"))
+
+        visits = backend.load()
+        assert [v["measurement_id"] for v in visits] == ["a", "a", "b", None]   # the last one was interpolated
+        assert len(backend.load_measurements()) == 2
+        with open(backend.path) as f:
+            assert f.readline().strip() == ",".join(VISIT_FIELDS)
+
+    def test_csv_first_write_before_first_read(self, tmp_path):
+        write_csv(str(tmp_path / "results.csv"), self._legacy_rows())
+        backend = CSVBackend(str(tmp_path / "results.csv"))
+        backend.append_measurements([{"id": "new", "timestamp": "2026-01-02T00:00:00",
+                                      "lat": 1.0, "lng": 1.0, "temp": 5.0}])
+
+        assert [float(m["temp"]) for m in backend.load_measurements()] == [22.9, 18.0, 5.0]
+
+    def test_csv_table_written_without_migration(self, tmp_path):
+        # A measurement table created before the version file existed
+        write_csv(str(tmp_path / "results.csv"), self._legacy_rows() + [_row(1.0, 1.0, 5.0)])
+        with open(tmp_path / "results.measurements.csv", "w") as f:
+            f.write("id,timestamp,lat,lng,temp\nnew,2026-01-01T00:00:00,1.0,1.0,5.0\n")
+
+        measurements = CSVBackend(str(tmp_path / "results.csv")).load_measurements()
+        assert sorted(float(m["temp"]) for m in measurements) == [5.0, 18.0, 22.9]
+
+    def test_sqlite_bootstraps_and_links_visits(self, tmp_path):
+        self._legacy_db(str(tmp_path / "results.db"))
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+
+        measurements = db.load_measurements()
+        assert len(measurements) == 2
+        visits = db.load()
+        assert visits[0]["measurement_id"] == visits[1]["measurement_id"] == measurements[0]["id"]
+        assert len(SQLiteBackend(str(tmp_path / "results.db")).load_measurements()) == 2
+
+    def test_sqlite_first_write_before_first_read(self, tmp_path):
+        self._legacy_db(str(tmp_path / "results.db"))
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        db.append_measurements([{"id": "new", "timestamp": "2026-01-02T00:00:00",
+                                 "lat": 1.0, "lng": 1.0, "temp": 5.0}])
+        db.append([dict(_row(1.0, 1.0, 5.0), measurement_id="new")])
+
+        assert [m["temp"] for m in db.load_measurements()] == [22.9, 18.0, 5.0]
+        assert db.lookup(25.0, 15.0) == 22.9
+
+    def test_data_manager_first_write_before_first_read(self, tmp_path, monkeypatch):
+        write_csv(str(tmp_path / "results.csv"), [_row(25.0, 15.0, 22.9, ts=datetime.now().isoformat())])
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+        monkeypatch.setattr("src.data.data_manager._INTERNAL_CACHE", None)
+
+        data_manager.save_result(1.0, 1.0, 5.0, "test")
+        assert data_manager.get_cached_result(25.0, 15.0) == 22.9
+        assert len(data_manager.load_measurements()) == 2
+
+    def test_import_validates_and_deduplicates(self, tmp_path):
+        src_csv = str(tmp_path / "in.csv")
+        rows = self._legacy_rows() + [_row("bad", 1.0, 2.0), dict(_row(45.0, 0.0, 45.0), source="snapshot")]
+        write_csv(src_csv, rows, fields=VISIT_FIELDS)
+        for backend in (CSVBackend(str(tmp_path / "results.csv")), SQLiteBackend(str(tmp_path / "results.db"))):
+            assert backend.import_csv(src_csv) == 4
+            assert backend.import_csv(src_csv) == 4    # re-import
+            measurements = backend.load_measurements()
+            assert sorted(float(m["temp"]) for m in measurements) == [18.0, 22.9]
+            visits = backend.load()
+            assert len(visits) == 8
+            assert visits[3]["measurement_id"] is None
+            assert visits[4]["measurement_id"] == visits[0]["measurement_id"]
+
+    def test_save_results_separates_visits(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        data_manager.set_storage(db)
+        try:
+            data_manager.save_result(25.0, 15.0, 22.9, "test")
+            entry = data_manager.get_cached_entry(25.0, 15.0)
+            data_manager.record_visit(25.0, 15.0, entry.temp, "test", entry.measurement_id)
+
+            assert len(db.load_measurements()) == 1
+            visits = db.load()
+            assert len(visits) == 2
+            assert visits[1]["measurement_id"] == entry.measurement_id
+        finally:
+            data_manager.set_storage(None)
+
+
+def _append_many(path, worker):
+    backend = CSVBackend(path)
+    for i in range(50):
+        backend.append_measurements([{"id": f"{worker}-{i}", "timestamp": "2026-01-01T00:00:00",
+                                      "lat": worker, "lng": i, "temp": 20.0}])
+
+
+class TestCrossProcess:
+    def test_concurrent_appends_do_not_interleave(self, tmp_path):
+        path = str(tmp_path / "results.csv")
+        procs = [multiprocessing.Process(target=_append_many, args=(path, w)) for w in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+
+        rows = CSVBackend(path).load_measurements()
+        assert len(rows) == 200
+        assert len({r["id"] for r in rows}) == 200
+
+    def test_read_since_offset_returns_only_new_rows(self, tmp_path):
+        backend = CSVBackend(str(tmp_path / "results.csv"))
+        m = {"timestamp": "2026-01-01T00:00:00", "lat": 1.0, "lng": 2.0, "temp": 3.0}
+        backend.append_measurements([dict(m, id="a")])
+
+        rows, offset = backend.read_measurements_since(0)
+        assert [r["id"] for r in rows] == ["a"]
+        assert backend.read_measurements_since(offset) == ([], offset)
+
+        backend.append_measurements([dict(m, id="b"), dict(m, id="c")])
+        rows, _ = backend.read_measurements_since(offset)
+        assert [r["id"] for r in rows] == ["b", "c"]
+
+    def test_sqlite_read_since(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        m = {"timestamp": "2026-01-01T00:00:00", "lat": 1.0, "lng": 2.0, "temp": 3.0}
+        db.append_measurements([dict(m, id="a")])
+        rows, offset = db.read_measurements_since(0)
+        db.append_measurements([dict(m, id="b")])
+        rows, _ = db.read_measurements_since(offset)
+        assert [r["id"] for r in rows] == ["b"]
+
+    def test_cache_sees_other_process_writes(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "results.csv")
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", path)
+        monkeypatch.setattr("src.data.data_manager._INTERNAL_CACHE", None)
+
+        data_manager.save_result(1.0, 1.0, 10.0, "test")
+        assert data_manager.get_cached_result(5.0, 5.0) is None
+
+        # Simulates another process appending to the shared files
+        other = CSVBackend(path)
+        other_id = new_measurement_id()
+        other.append_measurements([{"id": other_id, "timestamp": datetime.now().isoformat(),
+                                    "lat": 5.0, "lng": 5.0, "temp": 30.0}])
+
+        assert data_manager.get_cached_result(5.0, 5.0) == 30.0
+        assert data_manager.get_cached_entry(5.0, 5.0).measurement_id == other_id
+
+
+class TestTailReading:
+    def test_csv_results_since(self, tmp_path):
+        backend = CSVBackend(str(tmp_path / "results.csv"))
+        assert backend.read_results_since(0) == ([], 0)
+
+        backend.append([_row(1.0, 1.0, 1.0)])
+        rows, offset = backend.read_results_since(0)
+        assert [r["temp"] for r in rows] == ["1.0"]
+
+        backend.append([_row(2.0, 2.0, 2.0), _row(3.0, 3.0, 3.0)])
+        rows, offset = backend.read_results_since(offset)
+        assert [r["temp"] for r in rows] == ["2.0", "3.0"]
+        assert backend.read_results_since(offset) == ([], offset)
+
+    def test_sqlite_results_since(self, tmp_path):
+        db = SQLiteBackend(str(tmp_path / "results.db"))
+        db.append([_row(1.0, 1.0, 1.0, run_id="a")])
+        rows, offset = db.read_results_since(0)
+        assert rows[0]["run_id"] == "a"
+
+        db.append([_row(2.0, 2.0, 2.0)])
+        rows, offset = db.read_results_since(offset)
+        assert [r["temp"] for r in rows] == [2.0]
+        assert db.read_results_since(offset) == ([], offset)
+
+    def test_data_manager_flushes_before_reading(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.data.data_manager.RESULTS_FILE", str(tmp_path / "results.csv"))
+
+        with data_manager.buffered_results(max_delay=None):
+            data_manager.save_result(1.0, 1.0, 10.0, "test")
+            rows, offset = data_manager.read_results_since()
+            assert len(rows) == 1
+            data_manager.save_result(2.0, 2.0, 20.0, "test")
+            rows, _ = data_manager.read_results_since(offset)
+            assert [float(r["temp"]) for r in rows] == [20.0]
@@ -0,0 +1,82 @@
+"""Tests for src/data/stub_server.py"""
+
+import asyncio
+
+import pytest
+import requests
+
+from src.data.async_weather_api import afetch_temperatures
+from src.data.stub_server import StubServer
+from src.data.weather_api import OPEN_METEO_URL, fetch_temperature, fetch_temperatures, forecast_url
+
+
+def _field(lat, lng):
+    return round(lat + lng, 2)
+
+
+pytestmark = pytest.mark.usefixtures("isolated_results")
+
+
+@pytest.fixture
+def server():
+    with StubServer(_field) as stub:
+        yield stub
+
+
+class TestBaseUrl:
+    def test_default_is_open_meteo(self):
+        assert forecast_url() == OPEN_METEO_URL
+        assert forecast_url("http://localhost:8080/") == "http://localhost:8080/v1/forecast"
+
+
+class TestStubServer:
+    def test_single_location(self, server):
+        assert fetch_temperature(10.0, 20.5, use_cache=False, base_url=server.base_url) == 30.5
+
+    def test_multi_location(self, server):
+        temps = fetch_temperatures([(1.0, 2.0), (3.0, 4.0), (5.0, 6.0)], use_cache=False, base_url=server.base_url)
+        assert temps == [3.0, 7.0, 11.0]
+        assert server.stats["requests"] == 1
+        assert server.stats["locations"] == 3
+
+    def test_concurrent_async_clients(self, server):
+        points = [(float(i), float(i)) for i in range(40)]
+        temps = asyncio.run(afetch_temperatures(points, use_cache=False, chunk_size=1, concurrency=8,
+                                                base_url=server.base_url))
+        assert temps == [2.0 * i for i in range(40)]
+        assert server.stats["requests"] == 40
+
+    def test_response_shape(self, server):
+        data = requests.get(forecast_url(server.base_url),
+                            params={"latitude": 1.0, "longitude": 2.0, "current": "temperature_2m"}).json()
+        assert data["current"]["temperature_2m"] == 3.0
+        assert data["current"]["interval"] == 900
+
+    def test_bad_requests(self, server):
+        url = forecast_url(server.base_url)
+        assert requests.get(url, params={"latitude": 1.0}).status_code == 400
+        assert requests.get(url, params={"latitude": 95.0, "longitude": 0.0,
+                                         "current": "temperature_2m"}).status_code == 400
+        assert requests.get(server.base_url + "/v1/other").status_code == 404
+
+
+class TestFaultInjection:
+    def test_errors_exercise_client_retries(self):
+        with StubServer(_field, error_rate=1.0) as stub:
+            assert fetch_temperature(1.0, 2.0, use_cache=False, retries=3, backoff_factor=0,
+                                     base_url=stub.base_url) is None
+        assert stub.stats["errors"] == 3
+
+    def test_throttling(self):
+        with StubServer(_field, rate_limit=5) as stub:
+            url = forecast_url(stub.base_url)
+            params = {"latitude": 1.0, "longitude": 2.0, "current": "temperature_2m"}
+            statuses = [requests.get(url, params=params).status_code for _ in range(10)]
+        assert statuses.count(429) >= 4
+        assert stub.stats["throttled"] == statuses.count(429)
+
+    def test_latency(self):
+        with StubServer(_field, latency=0.05) as stub:
+            response = requests.get(forecast_url(stub.base_url),
+                                    params={"latitude": 1.0, "longitude": 2.0, "current": "temperature_2m"})
+        assert response.elapsed.total_seconds() >= 0.05
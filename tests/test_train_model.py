@@ -0,0 +1,227 @@
+"""Tests for the Gaussian process internals of src/models/train_model.py"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.models.train_model import BayesianOptimizationSearch
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.yaml")
+
+
+def _dense_predict(bo, X_new):
+    """Reference posterior computed from scratch with np.linalg.solve."""
+    X_obs = np.array(bo.X_observed)
+    y = np.array([bo._normalize_temperature(t) for t in bo.y_observed])
+    K = bo._kernel(X_obs, X_obs) + bo.noise * np.eye(len(X_obs))
+    K_star = bo._kernel(X_obs, X_new)
+    mean = K_star.T @ np.linalg.solve(K, y)
+    variance = bo.kernel_variance - np.sum(K_star * np.linalg.solve(K, K_star), axis=0)
+    return mean, np.sqrt(np.maximum(variance, 1e-10))
+
+
+def _observe(bo, rng, n):
+    for _ in range(n):
+        bo.X_observed.append((rng.uniform(-90, 90), rng.uniform(-180, 180)))
+        bo.y_observed.append(rng.uniform(-30, 40))
+    bo._update_normalization()
+
+
+@pytest.fixture
+def bo():
+    return BayesianOptimizationSearch(config_path=CONFIG_PATH)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+class TestIncrementalPosterior:
+    def test_prior_without_observations(self, bo):
+        mean, std = bo._predict(np.zeros((3, 2)))
+        assert np.all(mean == 0)
+        assert np.allclose(std, np.sqrt(bo.kernel_variance))
+
+    def test_matches_dense_solve_as_observations_arrive(self, bo, rng):
+        X_new = bo._create_grid()[::37]
+        for batch in (1, 1, 5, 20):
+            _observe(bo, rng, batch)
+            mean, std = bo._predict(X_new)
+            ref_mean, ref_std = _dense_predict(bo, X_new)
+            np.testing.assert_allclose(mean, ref_mean, atol=1e-8)
+            np.testing.assert_allclose(std, ref_std, atol=1e-8)
+        assert bo._n_factored == 27
+
+    def test_factor_is_extended_not_rebuilt(self, bo, rng):
+        _observe(bo, rng, 10)
+        bo._predict(np.zeros((1, 2)))
+        first_rows = bo._L[:10, :10].copy()
+        _observe(bo, rng, 1)
+        bo._predict(np.zeros((1, 2)))
+        assert bo._n_factored == 11
+        np.testing.assert_array_equal(bo._L[:10, :10], first_rows)
+
+    def test_rebuilds_after_hyperparameter_change(self, bo, rng):
+        _observe(bo, rng, 8)
+        bo._predict(np.zeros((1, 2)))
+        bo.lengthscale = 20.0
+        X_new = bo._create_grid()[::101]
+        np.testing.assert_allclose(bo._predict(X_new)[0], _dense_predict(bo, X_new)[0], atol=1e-8)
+
+    def test_rebuilds_after_observations_replaced(self, bo, rng):
+        _observe(bo, rng, 8)
+        bo._predict(np.zeros((1, 2)))
+        bo.X_observed = [(10.0, 10.0), (20.0, 20.0)]
+        bo.y_observed = [1.0, 2.0]
+        bo._update_normalization()
+        X_new = bo._create_grid()[::101]
+        np.testing.assert_allclose(bo._predict(X_new)[0], _dense_predict(bo, X_new)[0], atol=1e-8)
+
+    def test_repeated_point_stays_finite(self, bo):
+        bo.noise = 0.0
+        bo.X_observed = [(10.0, 10.0)] * 3
+        bo.y_observed = [1.0, 2.0, 3.0]
+        bo._update_normalization()
+        mean, std = bo._predict(np.array([[10.0, 10.0], [50.0, 50.0]]))
+        assert np.all(np.isfinite(mean)) and np.all(np.isfinite(std))
+
+    def test_factor_reproduces_kernel_matrix(self, bo, rng):
+        _observe(bo, rng, 12)
+        bo._predict(np.zeros((1, 2)))
+        X_obs = np.array(bo.X_observed)
+        L = bo._L[:12, :12]
+        np.testing.assert_array_equal(L, np.tril(L))
+        np.testing.assert_allclose(L @ L.T, bo._kernel(X_obs, X_obs) + bo.noise * np.eye(12), atol=1e-10)
+
+    def test_jitter_when_kernel_not_positive_definite(self, bo):
+        bo.noise = 0.0
+        bo.X_observed = [(10.0, 10.0), (10.0, 10.0)]
+        bo.y_observed = [1.0, 1.0]
+        bo._update_normalization()
+        bo._predict(np.zeros((1, 2)))
+        assert bo._L[1, 1] == pytest.approx(np.sqrt(bo.CHOLESKY_JITTER))
+
+
+class TestGridState:
+    @pytest.fixture
+    def small_bo(self, bo):
+        bo.grid_resolution = 30
+        return bo
+
+    def test_grid_created_once(self, small_bo, rng):
+        grid = small_bo._get_grid()
+        _observe(small_bo, rng, 3)
+        small_bo._select_next_point()
+        assert small_bo._get_grid() is grid
+        small_bo.grid_resolution = 20
+        assert len(small_bo._get_grid()) == 400
+
+    def test_grid_posterior_matches_dense_solve(self, small_bo, rng):
+        grid = small_bo._get_grid()
+        for batch in (1, 4, 10):
+            _observe(small_bo, rng, batch)
+            mean, std = small_bo._predict_grid()
+            ref_mean, ref_std = _dense_predict(small_bo, grid)
+            np.testing.assert_allclose(mean, ref_mean, atol=1e-8)
+            np.testing.assert_allclose(std, ref_std, atol=1e-8)
+
+    def test_rows_appended_per_observation(self, small_bo, rng):
+        _observe(small_bo, rng, 5)
+        small_bo._predict_grid()
+        first_rows = small_bo._V_grid[:5].copy()
+        _observe(small_bo, rng, 1)
+        small_bo._predict_grid()
+        np.testing.assert_array_equal(small_bo._V_grid[:5], first_rows)
+
+    def test_state_rebuilt_after_hyperparameter_change(self, small_bo, rng):
+        _observe(small_bo, rng, 6)
+        small_bo._predict_grid()
+        small_bo.lengthscale = 15.0
+        np.testing.assert_allclose(small_bo._predict_grid()[1], _dense_predict(small_bo, small_bo._get_grid())[1],
+                                   atol=1e-8)
+
+    def test_equal_temperatures(self, small_bo):
+        small_bo.X_observed = [(0.0, 0.0), (30.0, 60.0)]
+        small_bo.y_observed = [20.0, 20.0]
+        small_bo._update_normalization()
+        mean, _ = small_bo._predict_grid()
+        np.testing.assert_allclose(mean, _dense_predict(small_bo, small_bo._get_grid())[0], atol=1e-10)
+
+    def test_in_place_updates_stay_accurate(self, small_bo, rng):
+        small_bo._get_grid()
+        _observe(small_bo, rng, 1)
+        small_bo._predict_grid()
+        # One in-place update per observation, as in a long search
+        for _ in range(150):
+            _observe(small_bo, rng, 1)
+            small_bo._predict_grid()
+        mean, std = small_bo._predict_grid()
+        ref_mean, ref_std = _dense_predict(small_bo, small_bo._get_grid())
+        np.testing.assert_allclose(mean, ref_mean, atol=1e-6)
+        np.testing.assert_allclose(std, ref_std, atol=1e-6)
+
+
+def _brute_force_mask(bo, grid):
+    mask = np.zeros(len(grid), dtype=bool)
+    for lat, lng in bo.X_observed:
+        dlat = grid[:, 0] - lat
+        dlng = np.abs(grid[:, 1] - lng)
+        dlng = np.minimum(dlng, 360.0 - dlng)
+        mask |= np.sqrt(dlat ** 2 + dlng ** 2) < bo.EXCLUSION_RADIUS_DEG
+    return mask
+
+
+class TestExclusionMask:
+    def test_matches_brute_force(self, bo, rng):
+        grid = bo._get_grid()
+        _observe(bo, rng, 30)
+        # Points on the antimeridian and at the poles
+        bo.X_observed += [(0.0, 179.5), (10.0, -180.0), (89.9, 0.0), (-90.0, 45.0)]
+        bo.y_observed += [1.0, 2.0, 3.0, 4.0]
+        bo._update_normalization()
+        bo._select_next_point()
+        np.testing.assert_array_equal(bo._excluded, _brute_force_mask(bo, grid))
+
+    def test_updated_incrementally(self, bo, rng):
+        grid = bo._get_grid()
+        _observe(bo, rng, 5)
+        bo._select_next_point()
+        assert bo._n_excluded == 5
+        _observe(bo, rng, 2)
+        next_point = bo._select_next_point()
+        assert bo._n_excluded == 7
+        np.testing.assert_array_equal(bo._excluded, _brute_force_mask(bo, grid))
+        assert not _brute_force_mask(bo, np.array([next_point]))[0]
+
+    def test_rebuilt_when_observations_replaced(self, bo, rng):
+        grid = bo._get_grid()
+        _observe(bo, rng, 5)
+        bo._select_next_point()
+        bo.X_observed = [(0.0, 0.0)]
+        bo.y_observed = [1.0]
+        bo._update_normalization()
+        bo._select_next_point()
+        np.testing.assert_array_equal(bo._excluded, _brute_force_mask(bo, grid))
+
+
+class TestKernelChoice:
+    @pytest.mark.parametrize("kernel, metric", [("matern32", "chordal"), ("matern12", "great_circle")])
+    def test_posterior_with_other_kernels(self, bo, rng, kernel, metric):
+        bo.kernel, bo.kernel_metric = kernel, metric
+        bo.grid_resolution = 30
+        _observe(bo, rng, 12)
+        grid = bo._get_grid()
+        np.testing.assert_allclose(bo._predict_grid()[0], _dense_predict(bo, grid)[0], atol=1e-8)
+
+    def test_kernel_change_rebuilds_factor(self, bo, rng):
+        _observe(bo, rng, 6)
+        X_new = bo._create_grid()[::101]
+        bo._predict(X_new)
+        bo.kernel = "matern52"
+        np.testing.assert_allclose(bo._predict(X_new)[1], _dense_predict(bo, X_new)[1], atol=1e-8)
+
+    def test_distance_shrinks_towards_poles(self, bo):
+        K = bo._kernel(np.array([[80.0, 0.0], [0.0, 0.0]]), np.array([[80.0, 20.0], [0.0, 20.0]]))
+        assert K[0, 0] > K[1, 1]
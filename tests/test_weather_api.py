@@ -0,0 +1,122 @@
+"""Tests for src/data/weather_api.py"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.data.data_manager import load_measurements, load_results
+from src.data.google_maps_api import get_elevation_client, set_elevation_client
+from src.data.http_client import configure_session, create_session, get_session, set_session
+from src.data.weather_api import fetch_temperature, fetch_temperatures
+
+from tests.conftest import location, mock_response
+
+
+pytestmark = pytest.mark.usefixtures("isolated_results")
+
+
+class TestFetchTemperature:
+    def test_fetches_and_saves(self, mock_get):
+        mock_get.return_value = mock_response(location(21.5))
+
+        assert fetch_temperature(25.0, 15.0, search_method="test") == 21.5
+        assert len(load_results()) == 1
+
+    def test_cache_hit_logs_visit_only(self, mock_get):
+        mock_get.return_value = mock_response(location(21.5))
+        fetch_temperature(25.0, 15.0, search_method="test")
+        fetch_temperature(25.0, 15.0, search_method="test")
+
+        assert mock_get.call_count == 1
+        assert len(load_results()) == 2
+        measurements = load_measurements()
+        assert len(measurements) == 1
+
+    def test_invalid_coordinate(self, mock_get):
+        assert fetch_temperature(100.0, 15.0) is None
+        mock_get.assert_not_called()
+
+
+class TestFetchTemperatures:
+    def test_multi_location_request(self, mock_get):
+        mock_get.return_value = mock_response([location(10.0), location(20.0), location(30.0)])
+
+        temps = fetch_temperatures([(1, 2), (3, 4), (5, 6)], search_method="test")
+
+        assert temps == [10.0, 20.0, 30.0]
+        assert mock_get.call_count == 1
+        params = mock_get.call_args.kwargs["params"]
+        assert params["latitude"] == "1.0,3.0,5.0"
+        assert params["longitude"] == "2.0,4.0,6.0"
+
+    def test_chunks_requests(self, mock_get):
+        mock_get.side_effect = [
+            mock_response([location(1.0), location(2.0)]),
+            mock_response(location(3.0)),
+        ]
+
+        temps = fetch_temperatures([(1, 1), (2, 2), (3, 3)], chunk_size=2)
+
+        assert temps == [1.0, 2.0, 3.0]
+        assert mock_get.call_count == 2
+
+    def test_cache_hits_skip_network(self, mock_get):
+        mock_get.return_value = mock_response(location(5.0))
+        fetch_temperatures([(10, 10)])
+        mock_get.reset_mock()
+
+        mock_get.return_value = mock_response(location(7.0))
+        temps = fetch_temperatures([(10, 10), (20, 20)])
+
+        assert temps == [5.0, 7.0]
+        assert mock_get.call_args.kwargs["params"]["latitude"] == "20.0"
+
+    def test_single_bulk_save(self, mock_get):
+        mock_get.return_value = mock_response([location(10.0), location(20.0)])
+
+        with patch("src.data.weather_api.save_results") as mock_save:
+            fetch_temperatures([(1, 2), (3, 4)], search_method="test")
+
+        mock_save.assert_called_once_with([(1.0, 2.0, 10.0, "test"), (3.0, 4.0, 20.0, "test")])
+
+    def test_invalid_points_are_none(self, mock_get):
+        mock_get.return_value = mock_response(location(10.0))
+
+        temps = fetch_temperatures([(100, 0), (1, 2)])
+
+        assert temps == [None, 10.0]
+
+
+class TestSharedSession:
+    def test_session_is_reused(self):
+        set_session(None)
+        assert get_session() is get_session()
+        set_session(None)
+
+    def test_pool_limits(self):
+        session = create_session(pool_connections=3, pool_maxsize=7)
+        adapter = session.get_adapter("https://api.open-meteo.com")
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+        session.close()
+
+    def test_elevation_client_follows_session(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "AIza-test-key")
+        set_elevation_client(None)
+        try:
+            client = get_elevation_client()
+            assert client.session is get_session()
+            assert get_elevation_client() is client
+
+            session = configure_session(pool_maxsize=20)
+            rebuilt = get_elevation_client()
+            assert rebuilt is not client
+            assert rebuilt.session is session
+
+            mock = MagicMock()
+            set_elevation_client(mock)
+            set_session(None)
+            assert get_elevation_client() is mock
+        finally:
+            set_elevation_client(None)
+            set_session(None)